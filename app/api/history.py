@@ -21,11 +21,14 @@
 #   Contact: DLmaster_361@163.com
 
 
+import asyncio
 from datetime import datetime
 from pathlib import Path
 from fastapi import APIRouter, Body
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.core import Config
+from app.models.history import HistoryLog, read_history_log, stream_export
 from app.models.schema import *
 
 router = APIRouter(prefix="/api/history", tags=["历史记录"])
@@ -41,14 +44,13 @@ router = APIRouter(prefix="/api/history", tags=["历史记录"])
 async def search_history(history: HistorySearchIn) -> HistorySearchOut:
 
     try:
-        data = await Config.search_history(
+        data = await Config.search_statistics(
             history.mode,
             datetime.strptime(history.start_date, "%Y-%m-%d").date(),
             datetime.strptime(history.end_date, "%Y-%m-%d").date(),
         )
         for date, users in data.items():
-            for user, records in users.items():
-                record = await Config.merge_statistic_info(records)
+            for user, record in users.items():
                 # 安全检查：确保 index 字段存在
                 if "index" not in record:
                     record["index"] = []
@@ -78,7 +80,9 @@ async def get_history_data(history: HistoryDataGetIn = Body(...)) -> HistoryData
         path = Path(history.jsonPath)
         data = await Config.merge_statistic_info([path])
         data.pop("index", None)
-        data["log_content"] = path.with_suffix(".log").read_text(encoding="utf-8")
+        data["log_content"] = await asyncio.to_thread(
+            read_history_log, path.with_suffix(".log")
+        )
         data = HistoryData(**data)
     except Exception as e:
         return HistoryDataGetOut(
@@ -88,3 +92,147 @@ async def get_history_data(history: HistoryDataGetIn = Body(...)) -> HistoryData
             data=HistoryData(**{}),
         )
     return HistoryDataGetOut(data=data)
+
+
+@router.post(
+    "/log",
+    tags=["Get"],
+    summary="分页获取历史记录日志",
+    response_model=HistoryLogGetOut,
+    status_code=200,
+)
+async def get_history_log(history: HistoryLogGetIn = Body(...)) -> HistoryLogGetOut:
+
+    def read_page() -> HistoryLogPage:
+        log = HistoryLog(
+            Path(history.jsonPath).with_suffix(".log"), Config.history_path
+        )
+        start = (
+            max(0, log.total - history.limit)
+            if history.mode == "TAIL"
+            else history.start
+        )
+        if history.keyword:
+            if history.mode == "TAIL":
+                lines = log.grep_tail(history.keyword, history.limit)
+                next_line = None
+            else:
+                lines, next_line = log.grep(history.keyword, start, history.limit)
+        else:
+            lines = log.read(start, history.limit)
+            next_line = (
+                start + history.limit if start + history.limit < log.total else None
+            )
+        return HistoryLogPage(
+            total=log.total,
+            lines=[HistoryLogLine(line=n, content=c) for n, c in lines],
+            next=next_line,
+        )
+
+    try:
+        data = await asyncio.to_thread(read_page)
+    except Exception as e:
+        return HistoryLogGetOut(
+            code=500,
+            status="error",
+            message=f"{type(e).__name__}: {str(e)}",
+            data=HistoryLogPage(total=0, lines=[]),
+        )
+    return HistoryLogGetOut(data=data)
+
+
+@router.post(
+    "/log/search",
+    tags=["Get"],
+    summary="全文搜索历史记录日志",
+    response_model=HistoryLogSearchOut,
+    status_code=200,
+)
+async def search_history_log(
+    history: HistoryLogSearchIn = Body(...),
+) -> HistoryLogSearchOut:
+
+    try:
+        result = await Config.search_history_logs(
+            history.keyword,
+            datetime.strptime(history.start_date, "%Y-%m-%d").date(),
+            datetime.strptime(history.end_date, "%Y-%m-%d").date(),
+            history.users,
+            history.limit,
+            history.line_limit,
+        )
+        data = [
+            HistoryLogSearchItem(
+                date=_["date"],
+                user=_["user"],
+                jsonFile=_["jsonFile"],
+                lines=[HistoryLogLine(line=n, content=c) for n, c in _["lines"]],
+            )
+            for _ in result
+        ]
+    except Exception as e:
+        return HistoryLogSearchOut(
+            code=500,
+            status="error",
+            message=f"{type(e).__name__}: {str(e)}",
+            data=[],
+        )
+    return HistoryLogSearchOut(data=data)
+
+
+@router.post(
+    "/retention",
+    tags=["Get"],
+    summary="获取最近一次历史记录清理报告",
+    response_model=HistoryRetentionOut,
+    status_code=200,
+)
+async def get_history_retention() -> HistoryRetentionOut:
+
+    try:
+        data = HistoryRetentionReport(**(Config.history_retention or {}))
+    except Exception as e:
+        return HistoryRetentionOut(
+            code=500,
+            status="error",
+            message=f"{type(e).__name__}: {str(e)}",
+            data=HistoryRetentionReport(),
+        )
+    return HistoryRetentionOut(data=data)
+
+
+@router.post(
+    "/export",
+    tags=["Get"],
+    summary="流式导出历史记录统计数据",
+    response_class=StreamingResponse,
+    status_code=200,
+)
+async def export_history(history: HistoryExportIn = Body(...)):
+
+    try:
+        runs = Config.history_database.iter_runs(
+            datetime.strptime(history.start_date, "%Y-%m-%d").date(),
+            datetime.strptime(history.end_date, "%Y-%m-%d").date(),
+            history.users,
+        )
+    except Exception as e:
+        return JSONResponse(
+            OutBase(
+                code=500, status="error", message=f"{type(e).__name__}: {str(e)}"
+            ).model_dump()
+        )
+    suffix, media_type = (
+        ("ndjson", "application/x-ndjson")
+        if history.format == "NDJSON"
+        else ("csv", "text/csv; charset=utf-8")
+    )
+    # 同步生成器由 StreamingResponse 在线程池中迭代, 读取索引不会阻塞事件循环
+    return StreamingResponse(
+        stream_export(runs, history.format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=history_"
+            f"{history.start_date}_{history.end_date}.{suffix}"
+        },
+    )
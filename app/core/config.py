@@ -21,7 +21,6 @@
 #   Contact: DLmaster_361@163.com
 
 import os
-import re
 import sys
 import httpx
 import shutil
@@ -31,7 +30,6 @@ import sqlite3
 import truststore
 from pathlib import Path
 from fastapi import WebSocket
-from collections import defaultdict
 from jinja2 import Environment, FileSystemLoader
 from datetime import datetime, timedelta, date
 from typing import Literal, Optional, Union, Dict, Any, List
@@ -56,6 +54,24 @@ from app.models.config import (
     TimeSet,
     EmulatorConfig,
 )
+from app.models.ConfigBase import ConfigDatabase, ConfigSaver
+from app.models.history import (
+    HistoryDatabase,
+    bucket_name,
+    empty_statistics,
+    run_statistics,
+    merge_statistics,
+    export_statistics,
+    write_history_log,
+    compress_history_logs,
+    HistoryLog,
+    run_size,
+    remove_run_files,
+    remove_history_folder,
+    plan_eviction,
+    HISTORY_CLEAN_BATCH,
+    HISTORY_CLEAN_INTERVAL,
+)
 from app.models.schema import WebSocketMessage
 from app.utils.constants import (
     UTC4,
@@ -65,7 +81,7 @@ from app.utils.constants import (
     TYPE_BOOK,
     RESOURCE_STAGE_DATE_TEXT,
 )
-from app.utils import get_logger
+from app.utils import get_logger, MaaLogParser
 
 logger = get_logger("配置管理")
 
@@ -129,6 +145,8 @@ class AppConfig(GlobalConfig):
             "KillSelf",
         ] = "NoAction"
         self.temp_task: List[asyncio.Task] = []
+        self.history_retention: Optional[Dict[str, Any]] = None
+        self.overview_cache: Optional[Dict[str, Any]] = None
 
         truststore.inject_into_ssl()
 
@@ -140,10 +158,17 @@ class AppConfig(GlobalConfig):
         await self.connect(self.config_path / "Config.json")
         await self.EmulatorConfig.connect(self.config_path / "EmulatorConfig.json")
         await self.PlanConfig.connect(self.config_path / "PlanConfig.json")
-        await self.ScriptConfig.connect(self.config_path / "ScriptConfig.json")
+        await self.connect_script_config()
         await self.QueueConfig.connect(self.config_path / "QueueConfig.json")
         await self.ToolsConfig.connect(self.config_path / "ToolsConfig.json")
 
+        self.history_database = HistoryDatabase(
+            self.database_path.with_name("history.db"), self.history_path
+        )
+        count = await asyncio.to_thread(self.history_database.backfill)
+        if count:
+            logger.success(f"历史记录索引同步完成, 新增 {count} 条记录")
+
         from app.services import System
 
         self.bind("Start", "IfSelfStart", System.set_SelfStart)
@@ -155,6 +180,56 @@ class AppConfig(GlobalConfig):
 
         logger.info("程序初始化完成")
 
+    async def connect_script_config(self) -> None:
+        """
+        按存储方式连接脚本配置, 切换存储方式后首次启动时自动迁移配置数据
+
+        分片文件存储时每个子配置单独存储为一个文件, 首次启动时自动从旧版单文件配置迁移;
+        数据库存储时每个配置项单独存储为一行, 修改配置仅写入对应行。
+        """
+
+        folder = self.config_path / "ScriptConfig"
+        legacy_file = self.config_path / "ScriptConfig.json"
+        self.config_database = ConfigDatabase(self.database_path)
+
+        if self.get("Function", "ConfigStorage") == "Database":
+            await self.ScriptConfig.connect_database(
+                self.config_database, "ScriptConfig", folder, legacy_file
+            )
+            return
+
+        if not (folder / "index.json").exists() and self.config_database.has_instances(
+            "ScriptConfig"
+        ):
+            logger.info("开始迁移脚本配置至分片文件存储")
+            await self.ScriptConfig.connect_database(
+                self.config_database, "ScriptConfig"
+            )
+            await self.ScriptConfig.detach()
+            await self.ScriptConfig.attach_folder(folder)
+            await ConfigSaver.flush()
+            await ConfigSaver.run(
+                lambda: self.config_database.delete_tree("ScriptConfig")
+            )
+            logger.success("脚本配置迁移完成")
+            return
+
+        await self.ScriptConfig.connect_folder(folder, legacy_file)
+
+    async def revalidate_paths(self) -> None:
+        """重新验证依赖文件系统的配置项, 已失效的脚本路径、模拟器路径等在读取时修正"""
+
+        for config in (
+            self,
+            self.EmulatorConfig,
+            self.PlanConfig,
+            self.ScriptConfig,
+            self.QueueConfig,
+            self.ToolsConfig,
+        ):
+            if await config.revalidate():
+                logger.info(f"路径配置的有效性发生变化: {type(config).__name__}")
+
     async def check_data(self) -> None:
         """检查用户数据文件并处理数据文件版本更新"""
 
@@ -410,6 +485,9 @@ class AppConfig(GlobalConfig):
                 if (Path.cwd() / "data/key").exists():
                     shutil.rmtree(Path.cwd() / "data/key")
 
+                # 后续步骤直接读写配置文件, 需先写入上述修改
+                await ConfigSaver.flush()
+
                 cur.execute("DELETE FROM version WHERE v = ?", ("v1.8",))
                 cur.execute("INSERT INTO version VALUES(?)", ("v1.9",))
                 db.commit()
@@ -463,6 +541,7 @@ class AppConfig(GlobalConfig):
 
             cur.close()
             db.close()
+            await ConfigSaver.flush()
             logger.success("数据文件版本更新完成")
 
     async def send_json(self, data: dict) -> None:
@@ -591,9 +670,7 @@ class AppConfig(GlobalConfig):
         if self.ScriptConfig[uid].is_locked:
             raise RuntimeError(f"脚本 {script_id} 正在运行, 无法更新配置项")
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await self.ScriptConfig[uid].set(group, name, value)
+        await self.ScriptConfig[uid].update_many(data)
 
     async def del_script(self, script_id: str) -> None:
         """删除脚本配置"""
@@ -839,13 +916,7 @@ class AppConfig(GlobalConfig):
         script_uid = uuid.UUID(script_id)
         user_uid = uuid.UUID(user_id)
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await (
-                    self.ScriptConfig[script_uid]
-                    .UserData[user_uid]
-                    .set(group, name, value)
-                )
+        await self.ScriptConfig[script_uid].UserData[user_uid].update_many(data)
 
     async def del_user(self, script_id: str, user_id: str) -> None:
         """删除用户配置"""
@@ -955,9 +1026,7 @@ class AppConfig(GlobalConfig):
 
         plan_uid = uuid.UUID(plan_id)
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await self.PlanConfig[plan_uid].set(group, name, value)
+        await self.PlanConfig[plan_uid].update_many(data)
 
     async def del_plan(self, plan_id: str) -> None:
         """删除计划表配置"""
@@ -1018,9 +1087,7 @@ class AppConfig(GlobalConfig):
 
         logger.info(f"更新模拟器配置: {emulator_id}")
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await self.EmulatorConfig[emulator_uid].set(group, name, value)
+        await self.EmulatorConfig[emulator_uid].update_many(data)
 
     async def del_emulator(self, emulator_id: str) -> None:
         """删除模拟器配置"""
@@ -1093,9 +1160,7 @@ class AppConfig(GlobalConfig):
 
         queue_uid = uuid.UUID(queue_id)
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await self.QueueConfig[queue_uid].set(group, name, value)
+        await self.QueueConfig[queue_uid].update_many(data)
 
     async def del_queue(self, queue_id: str) -> None:
         """删除调度队列配置"""
@@ -1148,13 +1213,7 @@ class AppConfig(GlobalConfig):
         queue_uid = uuid.UUID(queue_id)
         time_set_uid = uuid.UUID(time_set_id)
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await (
-                    self.QueueConfig[queue_uid]
-                    .TimeSet[time_set_uid]
-                    .set(group, name, value)
-                )
+        await self.QueueConfig[queue_uid].TimeSet[time_set_uid].update_many(data)
 
     async def del_time_set(self, queue_id: str, time_set_id: str) -> None:
         """删除时间设置配置"""
@@ -1217,13 +1276,7 @@ class AppConfig(GlobalConfig):
         queue_uid = uuid.UUID(queue_id)
         queue_item_uid = uuid.UUID(queue_item_id)
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await (
-                    self.QueueConfig[queue_uid]
-                    .QueueItem[queue_item_uid]
-                    .set(group, name, value)
-                )
+        await self.QueueConfig[queue_uid].QueueItem[queue_item_uid].update_many(data)
 
     async def del_queue_item(self, queue_id: str, queue_item_id: str) -> None:
         """删除队列项配置"""
@@ -1258,9 +1311,7 @@ class AppConfig(GlobalConfig):
 
         logger.info("更新工具设置")
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await self.ToolsConfig.set(group, name, value)
+        await self.ToolsConfig.update_many(data)
 
         logger.success("工具设置更新成功")
 
@@ -1276,9 +1327,7 @@ class AppConfig(GlobalConfig):
 
         logger.info("更新全局设置")
 
-        for group, items in data.items():
-            for name, value in items.items():
-                await self.set(group, name, value)
+        await self.update_many(data)
 
         logger.success("全局设置更新成功")
 
@@ -1358,11 +1407,7 @@ class AppConfig(GlobalConfig):
         if script_id is None and user_id is None:
             logger.info(f"更新 webhook 全局配置: {webhook_id}")
 
-            for group, items in data.items():
-                for name, value in items.items():
-                    await self.Notify_CustomWebhooks[webhook_uid].set(
-                        group, name, value
-                    )
+            await self.Notify_CustomWebhooks[webhook_uid].update_many(data)
 
         else:
             logger.info(f"更新 webhook 配置: {script_id} - {user_id} - {webhook_id}")
@@ -1370,14 +1415,12 @@ class AppConfig(GlobalConfig):
             script_uid = uuid.UUID(script_id)
             user_uid = uuid.UUID(user_id)
 
-            for group, items in data.items():
-                for name, value in items.items():
-                    await (
-                        self.ScriptConfig[script_uid]
-                        .UserData[user_uid]
-                        .Notify_CustomWebhooks[webhook_uid]
-                        .set(group, name, value)
-                    )
+            await (
+                self.ScriptConfig[script_uid]
+                .UserData[user_uid]
+                .Notify_CustomWebhooks[webhook_uid]
+                .update_many(data)
+            )
 
     async def del_webhook(
         self, script_id: Optional[str], user_id: Optional[str], webhook_id: str
@@ -1496,41 +1539,81 @@ class AppConfig(GlobalConfig):
             return json.loads(self.get("Data", "Stage")).get(type, [])
 
     async def get_proxy_overview(self) -> Dict[str, Any]:
-        """获取代理情况概览信息"""
+        """获取代理情况概览信息, 优先读取当日概览缓存"""
 
         logger.info("获取代理情况概览信息")
 
-        history_index = await self.search_history(
-            "DAILY", datetime.now(tz=UTC4).date(), datetime.now(tz=UTC4).date()
-        )
-        if datetime.now(tz=UTC4).strftime("%Y-%m-%d") not in history_index:
-            return {}
-        history_data = {
-            k: await self.merge_statistic_info(v)
-            for k, v in history_index[
-                datetime.now(tz=UTC4).strftime("%Y-%m-%d")
-            ].items()
-        }
-        overview = {}
-        for user, data in history_data.items():
-            index_data = data.get("index", [])
-            if index_data:
-                last_proxy_date = max(
-                    datetime.strptime(_["date"], "%Y-%m-%d %H:%M:%S")
-                    for _ in index_data
-                ).strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                last_proxy_date = "暂无代理数据"
-            proxy_times = len(data.get("index", []))
-            error_info = data.get("error_info", {})
-            error_times = len(error_info)
-            overview[user] = {
-                "LastProxyDate": last_proxy_date,
-                "ProxyTimes": proxy_times,
-                "ErrorTimes": error_times,
-                "ErrorInfo": error_info,
+        today = datetime.now(tz=UTC4).date()
+        if (
+            self.overview_cache is None
+            or self.overview_cache["date"] != today.isoformat()
+        ):
+            # 跨越日期边界或缓存失效时, 由当日汇总数据重建缓存
+            self.overview_cache = {
+                "date": today.isoformat(),
+                "keys": set(),
+                "users": {},
             }
-        return overview
+            rollups = self.history_database.get_statistics("DAILY", today, today)
+            for user, total in rollups.get(today.isoformat(), {}).items():
+                self.merge_overview(user, total)
+
+        return {
+            user: {**overview, "ErrorInfo": dict(overview["ErrorInfo"])}
+            for user, overview in sorted(self.overview_cache["users"].items())
+        }
+
+    def merge_overview(self, user: str, statistics: Dict[str, Any]) -> None:
+        """
+        将汇总统计数据合并至当日概览缓存
+
+        Args:
+            user (str): 用户名
+            statistics (Dict[str, Any]): 由 `run_statistics` 生成或读取自汇总数据的统计数据
+        """
+
+        overview = self.overview_cache["users"].setdefault(
+            user,
+            {
+                "LastProxyDate": "暂无代理数据",
+                "ProxyTimes": 0,
+                "ErrorTimes": 0,
+                "ErrorInfo": {},
+            },
+        )
+        for key, item in statistics["index"].items():
+            if key not in self.overview_cache["keys"]:
+                self.overview_cache["keys"].add(key)
+                overview["ProxyTimes"] += 1
+            if (
+                overview["LastProxyDate"] == "暂无代理数据"
+                or item["date"] > overview["LastProxyDate"]
+            ):
+                overview["LastProxyDate"] = item["date"]
+        overview["ErrorInfo"].update(statistics["error_info"])
+        overview["ErrorTimes"] = len(overview["ErrorInfo"])
+
+    def update_overview(self, json_file: Path, data: Dict[str, Any]) -> None:
+        """
+        将新保存的运行记录计入当日概览缓存
+
+        Args:
+            json_file (Path): 统计数据文件路径
+            data (Dict[str, Any]): 统计数据
+        """
+
+        key = self.history_database.relative_key(json_file)
+        if (
+            key is None
+            or self.overview_cache is None
+            or not key.startswith(f"{self.overview_cache['date']}/")
+        ):
+            return
+        if key in self.overview_cache["keys"]:
+            # 覆盖已有记录时无法扣除旧数据, 下次读取时重建缓存
+            self.overview_cache = None
+            return
+        self.merge_overview(key.split("/")[1], run_statistics(key, data))
 
     async def get_stage(self) -> Optional[Dict[str, List[Dict[str, str]]]]:
         """更新活动关卡信息"""
@@ -1773,7 +1856,42 @@ class AppConfig(GlobalConfig):
 
         return remote_web_config
 
-    async def save_maa_log(self, log_path: Path, logs: list, maa_result: str) -> bool:
+    async def save_history(
+        self, log_path: Path, logs: list, data: Dict[str, Any]
+    ) -> None:
+        """
+        保存单次代理的日志与统计数据, 并写入历史记录索引
+
+        Args:
+            log_path (Path): 日志文件保存路径
+            logs (list): 日志内容列表
+            data (Dict[str, Any]): 统计数据
+        """
+
+        if_compress = self.get("Function", "HistoryCompression") == "Gzip"
+
+        # 日志压缩、文件写入与数据库写入均为阻塞操作, 在线程中执行以免阻塞事件循环
+        def write():
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            write_history_log(log_path.with_suffix(".log"), "".join(logs), if_compress)
+            log_path.with_suffix(".json").write_text(
+                json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8"
+            )
+            self.history_database.add(log_path.with_suffix(".json"), data)
+
+        await asyncio.to_thread(write)
+        self.update_overview(log_path.with_suffix(".json"), data)
+        await asyncio.to_thread(
+            self.history_database.index_log, log_path.with_suffix(".json"), logs
+        )
+
+    async def save_maa_log(
+        self,
+        log_path: Path,
+        logs: list,
+        maa_result: str,
+        parser: Optional[MaaLogParser] = None,
+    ) -> bool:
         """
         保存MAA日志并生成对应统计数据
 
@@ -1781,155 +1899,23 @@ class AppConfig(GlobalConfig):
             log_path (Path): 日志文件保存路径
             logs (list): 日志列表
             maa_result (str): MAA任务结果
+            parser (Optional[MaaLogParser]): 已解析完全部日志的统计解析器, 未提供时重新解析日志
         Returns:
             bool: 是否存在高资
         """
 
         logger.info(f"开始处理 MAA 日志, 日志长度: {len(logs)}, 日志标记: {maa_result}")
 
-        data = {
-            "recruit_statistics": defaultdict(int),
-            "drop_statistics": defaultdict(dict),
-            "sanity": 0,
-            "sanity_full_at": "",
-            "maa_result": maa_result,
-        }
-
-        if_six_star = False
+        if parser is None:
+            parser = MaaLogParser()
+            parser.feed(logs)
+        data = {**parser.statistics, "maa_result": maa_result}
 
-        # 提取理智相关信息
-        for log_line in logs:
-            # 提取当前理智值：理智: 5/180
-            sanity_match = re.search(r"理智:\s*(\d+)/\d+", log_line)
-            if sanity_match:
-                data["sanity"] = int(sanity_match.group(1))
-
-            # 提取理智回满时间：理智将在 2025-09-26 18:57 回满。(17h 29m 后)
-            sanity_full_match = re.search(
-                r"(理智将在\s*\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}\s*回满。\(\d+h\s+\d+m\s+后\))",
-                log_line,
-            )
-            if sanity_full_match:
-                data["sanity_full_at"] = sanity_full_match.group(1)
-
-        # 公招统计（仅统计招募到的）
-        confirmed_recruit = False
-        current_star_level = None
-        i = 0
-        while i < len(logs):
-            if "公招识别结果:" in logs[i]:
-                current_star_level = None  # 每次识别公招时清空之前的星级
-                i += 1
-                while i < len(logs) and "Tags" not in logs[i]:  # 读取所有公招标签
-                    i += 1
-
-                if i < len(logs) and "Tags" in logs[i]:  # 识别星级
-                    star_match = re.search(r"(\d+)\s*★ Tags", logs[i])
-                    if star_match:
-                        current_star_level = f"{star_match.group(1)}★"
-                        if current_star_level == "6★":
-                            if_six_star = True
-
-            if "已确认招募" in logs[i]:  # 只有确认招募后才统计
-                confirmed_recruit = True
-
-            if confirmed_recruit and current_star_level:
-                data["recruit_statistics"][current_star_level] += 1
-                confirmed_recruit = False  # 重置, 等待下一次公招
-                current_star_level = None  # 清空已处理的星级
-
-            i += 1
-
-        # 掉落统计
-        # 存储所有关卡的掉落统计
-        all_stage_drops = {}
-
-        # 查找所有Fight任务的开始和结束位置
-        fight_tasks = []
-        for i, line in enumerate(logs):
-            if "开始任务: Fight" in line or "开始任务: 理智作战" in line:
-                # 查找对应的任务结束位置
-                end_index = -1
-                for j in range(i + 1, len(logs)):
-                    if "完成任务: Fight" in logs[j] or "完成任务: 理智作战" in logs[j]:
-                        end_index = j
-                        break
-                    # 如果遇到新的Fight任务开始, 则当前任务没有正常结束
-                    if j < len(logs) and (
-                        "开始任务: Fight" in logs[j] or "开始任务: 理智作战" in logs[j]
-                    ):
-                        break
-
-                # 如果找到了结束位置, 记录这个任务的范围
-                if end_index != -1:
-                    fight_tasks.append((i, end_index))
-
-        # 处理每个Fight任务
-        for start_idx, end_idx in fight_tasks:
-            # 提取当前任务的日志
-            task_logs = logs[start_idx : end_idx + 1]
-
-            # 查找任务中的最后一次掉落统计
-            last_drop_stats = {}
-            current_stage = None
-
-            for line in task_logs:
-                # 匹配掉落统计行, 如"1-7 掉落统计:"
-                drop_match = re.search(r"([\u4e00-\u9fffA-Za-z0-9\-]+) 掉落统计:", line)
-                if drop_match:
-                    # 发现新的掉落统计, 重置当前关卡的掉落数据
-                    current_stage = drop_match.group(1)
-                    last_drop_stats = {}
-                    continue
-
-                # 如果已经找到了关卡, 处理掉落物
-                if current_stage:
-                    item_match: List[str] = re.findall(
-                        r"^(?!\[)(\S+?)\s*:\s*([\d,]+[kK]?)(?:\s*\(\+[\d,]+[kK]?\))?",
-                        line,
-                        re.M,
-                    )
-                    for item, total in item_match:
-                        total = total.replace(",", "")
-                        if total.lower().endswith("k"):
-                            total = int(total[:-1]) * 1000
-                        else:
-                            total = int(total)
-
-                        # 黑名单
-                        if item not in [
-                            "当前次数",
-                            "理智",
-                            "最快截图耗时",
-                            "专精等级",
-                            "剩余时间",
-                        ]:
-                            last_drop_stats[item] = total
-
-            # 如果任务中有掉落统计, 更新总统计
-            if current_stage and last_drop_stats:
-                if current_stage not in all_stage_drops:
-                    all_stage_drops[current_stage] = {}
-
-                # 累加掉落数据
-                for item, count in last_drop_stats.items():
-                    all_stage_drops[current_stage].setdefault(item, 0)
-                    all_stage_drops[current_stage][item] += count
-
-        # 将累加后的掉落数据保存到结果中
-        data["drop_statistics"] = all_stage_drops
-
-        # 保存日志
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        log_path.write_text("".join(logs), encoding="utf-8")
-        # 保存统计数据
-        log_path.with_suffix(".json").write_text(
-            json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8"
-        )
+        await self.save_history(log_path, logs, data)
 
         logger.success(f"MAA 日志统计完成, 日志路径: {log_path}")
 
-        return if_six_star
+        return parser.if_six_star
 
     async def save_maaend_log(
         self, log_path: Path, logs: list[str], maaend_result: str
@@ -1949,12 +1935,7 @@ class AppConfig(GlobalConfig):
 
         data: Dict[str, str] = {"maaend_result": maaend_result}
 
-        # 保存日志
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        log_path.with_suffix(".log").write_text("".join(logs), encoding="utf-8")
-        log_path.with_suffix(".json").write_text(
-            json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8"
-        )
+        await self.save_history(log_path, logs, data)
 
         logger.success(f"MaaEnd日志统计完成, 日志路径: {log_path.with_suffix('.log')}")
 
@@ -1972,12 +1953,7 @@ class AppConfig(GlobalConfig):
 
         data: Dict[str, str] = {"src_result": src_result}
 
-        # 保存日志
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        log_path.with_suffix(".log").write_text("".join(logs), encoding="utf-8")
-        log_path.with_suffix(".json").write_text(
-            json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8"
-        )
+        await self.save_history(log_path, logs, data)
 
         logger.success(f"SRC日志统计完成, 日志路径: {log_path.with_suffix('.log')}")
 
@@ -1998,12 +1974,7 @@ class AppConfig(GlobalConfig):
 
         data: Dict[str, str] = {"general_result": general_result}
 
-        # 保存日志
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        log_path.with_suffix(".log").write_text("".join(logs), encoding="utf-8")
-        log_path.with_suffix(".json").write_text(
-            json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8"
-        )
+        await self.save_history(log_path, logs, data)
 
         logger.success(f"通用日志统计完成, 日志路径: {log_path.with_suffix('.log')}")
 
@@ -2018,82 +1989,38 @@ class AppConfig(GlobalConfig):
             dict: 合并后的数据统计信息
         """
 
-        data: Dict[str, Any] = {"index": {}}
+        total = empty_statistics()
+
+        # 优先从历史记录索引读取统计数据, 仅读取未被索引的文件
+        keys = {
+            json_file: self.history_database.relative_key(json_file)
+            for json_file in statistic_path_list
+        }
+        indexed_data = self.history_database.get_data(
+            [_ for _ in keys.values() if _ is not None]
+        )
 
         for json_file in statistic_path_list:
-            try:
-                single_data = json.loads(json_file.read_text(encoding="utf-8"))
-            except Exception as e:
-                logger.warning(
-                    f"无法解析文件 {json_file}, 错误信息: {type(e).__name__}: {str(e)}"
-                )
-                continue
-
-            for key in single_data.keys():
-                if key not in data:
-                    data[key] = {}
-
-                # 合并公招统计
-                if key == "recruit_statistics":
-                    for star_level, count in single_data[key].items():
-                        if star_level not in data[key]:
-                            data[key][star_level] = 0
-                        data[key][star_level] += count
-
-                # 合并掉落统计
-                elif key == "drop_statistics":
-                    for stage, drops in single_data[key].items():
-                        if stage not in data[key]:
-                            data[key][stage] = {}  # 初始化关卡
-
-                        for item, count in drops.items():
-                            if item not in data[key][stage]:
-                                data[key][stage][item] = 0
-                            data[key][stage][item] += count
-
-                # 处理理智相关字段 - 使用最后一个文件的值
-                elif key in ["sanity", "sanity_full_at"]:
-                    data[key] = single_data[key]
-
-                # 录入运行结果
-                elif key in [
-                    "maa_result",
-                    "maaend_result",
-                    "src_result",
-                    "general_result",
-                ]:
-                    actual_date = (
-                        datetime.strptime(
-                            f"{json_file.parent.parent.name} {json_file.stem}",
-                            "%Y-%m-%d %H-%M-%S",
-                        )
-                        .replace(tzinfo=UTC4)
-                        .astimezone()
+            if keys[json_file] in indexed_data:
+                single_data = indexed_data[keys[json_file]]
+            else:
+                try:
+                    single_data = json.loads(json_file.read_text(encoding="utf-8"))
+                except Exception as e:
+                    logger.warning(
+                        f"无法解析文件 {json_file}, 错误信息: {type(e).__name__}: {str(e)}"
                     )
+                    continue
 
-                    if single_data[key] != "Success!":
-                        if "error_info" not in data:
-                            data["error_info"] = {}
-                        data["error_info"][
-                            actual_date.strftime("%Y-%m-%d %H:%M:%S")
-                        ] = single_data[key]
-
-                    data["index"][actual_date] = {
-                        "date": actual_date.strftime("%Y-%m-%d %H:%M:%S"),
-                        "status": (
-                            "DONE" if single_data[key] == "Success!" else "ERROR"
-                        ),
-                        "jsonFile": str(json_file),
-                    }
-
-        data["index"] = [data["index"][_] for _ in sorted(data["index"])]
-
-        # 确保返回的字典始终包含 index 字段，即使为空
-        result = {k: v for k, v in data.items() if v}
-        if "index" not in result:
-            result["index"] = []
+            merge_statistics(
+                total,
+                run_statistics(
+                    f"{json_file.parent.parent.name}/{json_file.parent.name}/{json_file.name}",
+                    single_data,
+                ),
+            )
 
-        return result
+        return export_statistics(total, self.history_path)
 
     async def search_history(
         self,
@@ -2116,79 +2043,218 @@ class AppConfig(GlobalConfig):
 
         history_dict = {}
 
-        for date_folder in self.history_path.iterdir():
-            if not date_folder.is_dir():
-                continue  # 只处理日期文件夹
-
-            try:
-                date = datetime.strptime(date_folder.name, "%Y-%m-%d").date()
+        for date_text, user, key in self.history_database.search(start_date, end_date):
+            date_name = bucket_name(mode, date.fromisoformat(date_text))
+            history_dict.setdefault(date_name, {}).setdefault(user, []).append(
+                self.history_path / key
+            )
 
-                if not (start_date <= date <= end_date):
-                    continue  # 只统计在范围内的日期
+        logger.success(f"历史记录搜索完成, 共计 {len(history_dict)} 条记录")
 
-                if mode == "DAILY":
-                    date_name = date.strftime("%Y-%m-%d")
-                elif mode == "WEEKLY":
-                    date_name = date.strftime("%G-W%V")
-                elif mode == "MONTHLY":
-                    date_name = date.strftime("%Y-%m")
-                else:
-                    raise ValueError("无效的合并模式")
+        return {
+            k: v
+            for k, v in sorted(history_dict.items(), key=lambda x: x[0], reverse=True)
+        }
 
-                if date_name not in history_dict:
-                    history_dict[date_name] = {}
+    async def search_statistics(
+        self,
+        mode: Literal["DAILY", "WEEKLY", "MONTHLY"],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        获取指定时间范围内各用户按周期合并后的数据统计信息, 直接读取预先汇总的数据
 
-                for user_folder in date_folder.iterdir():
-                    if not user_folder.is_dir():
-                        continue  # 只处理用户文件夹
+        Args:
+            mode (Literal["DAILY", "WEEKLY", "MONTHLY"]): 合并模式
+            start_date (date): 开始日期
+            end_date (date): 结束日期
 
-                    if user_folder.stem not in history_dict[date_name]:
-                        history_dict[date_name][user_folder.stem] = list(
-                            user_folder.with_suffix("").glob("*.json")
-                        )
-                    else:
-                        history_dict[date_name][user_folder.stem] += list(
-                            user_folder.with_suffix("").glob("*.json")
-                        )
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: 格式为 { '日期': { '用户名': 合并后的数据统计信息 } }
+        """
 
-            except ValueError:
-                logger.exception(f"非日期格式的目录: {date_folder}")
+        logger.info(
+            f"开始获取统计数据, 合并模式: {mode}, 日期范围: {start_date} 至 {end_date}"
+        )
 
-        logger.success(f"历史记录搜索完成, 共计 {len(history_dict)} 条记录")
+        rollups = self.history_database.get_statistics(mode, start_date, end_date)
 
         return {
-            k: v
-            for k, v in sorted(history_dict.items(), key=lambda x: x[0], reverse=True)
+            k: {
+                user: export_statistics(total, self.history_path)
+                for user, total in sorted(v.items())
+            }
+            for k, v in sorted(rollups.items(), key=lambda x: x[0], reverse=True)
         }
 
-    async def clean_old_history(self):
-        """删除超过用户设定天数的历史记录文件（基于目录日期）"""
+    async def search_history_logs(
+        self,
+        keyword: str,
+        start_date: date,
+        end_date: date,
+        users: Optional[List[str]] = None,
+        limit: int = 50,
+        line_limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        全文搜索指定时间范围内的历史日志
 
-        if self.get("Function", "HistoryRetentionTime") == 0:
-            logger.info("历史记录永久保留, 跳过历史记录清理")
+        Args:
+            keyword (str): 关键词
+            start_date (date): 开始日期
+            end_date (date): 结束日期
+            users (Optional[List[str]]): 仅搜索指定用户
+            limit (int): 最多返回的运行记录数
+            line_limit (int): 每条运行记录最多返回的匹配行数
+
+        Returns:
+            List[Dict[str, Any]]: 按时间倒序排列的匹配记录, 包含日期、用户名、统计文件路径与匹配行
+        """
+
+        logger.info(
+            f"开始全文搜索历史日志, 关键词: {keyword}, 日期范围: {start_date} 至 {end_date}"
+        )
+
+        def search() -> List[Dict[str, Any]]:
+            result = []
+            for date_text, user, key in self.history_database.search_logs(
+                keyword, start_date, end_date, users, limit
+            ):
+                json_file = self.history_path / key
+                try:
+                    lines, _ = HistoryLog(
+                        json_file.with_suffix(".log"), self.history_path
+                    ).grep(keyword, 0, line_limit)
+                except OSError:
+                    continue
+                # 索引不区分大小写且不含时间戳, 以日志原文确认是否匹配
+                if lines:
+                    result.append(
+                        {
+                            "date": date_text,
+                            "user": user,
+                            "jsonFile": str(json_file),
+                            "lines": lines,
+                        }
+                    )
+            return result
+
+        result = await asyncio.to_thread(search)
+
+        logger.success(f"历史日志搜索完成, 共计 {len(result)} 条记录")
+
+        return result
+
+    async def index_history_logs(self) -> None:
+        """于后台线程为尚未建立全文索引的历史日志补建索引"""
+
+        count = await asyncio.to_thread(self.history_database.index_pending_logs)
+        if count:
+            logger.success(f"历史日志全文索引构建完成, 共计 {count} 条记录")
+
+    async def compress_history(self) -> None:
+        """在启用日志压缩时, 于后台线程压缩既有的未压缩历史日志"""
+
+        if self.get("Function", "HistoryCompression") != "Gzip":
             return
 
-        logger.info("开始清理超过设定天数的历史记录")
+        saved = await asyncio.to_thread(
+            compress_history_logs,
+            self.history_path,
+            [datetime.now(tz=UTC4).strftime("%Y-%m-%d")],
+        )
+        if saved:
+            logger.success(f"历史日志压缩完成, 节省空间 {saved / 1048576:.2f} MB")
 
-        deleted_count = 0
+    async def clean_old_history(self) -> None:
+        """
+        按保留时间与容量配额清理历史记录, 于每小时定期任务中在后台执行
 
-        for date_folder in self.history_path.iterdir():
-            if not date_folder.is_dir():
-                continue  # 只处理日期文件夹
+        删除操作分批在后台线程中进行, 批次之间让出磁盘 I/O; 当天的记录不会因容量配额被删除。
+        """
 
-            try:
-                # 只检查 `YYYY-MM-DD` 格式的文件夹
-                folder_date = datetime.strptime(date_folder.name, "%Y-%m-%d").date()
-                if datetime.now(tz=UTC4).date() - folder_date > timedelta(
-                    days=self.get("Function", "HistoryRetentionTime")
-                ):
-                    shutil.rmtree(date_folder, ignore_errors=True)
-                    deleted_count += 1
+        today = datetime.now(tz=UTC4).date()
+        retention_time = self.get("Function", "HistoryRetentionTime")
+        total_quota = self.get("Function", "HistoryQuota") * 1048576
+        user_quota = self.get("Function", "HistoryUserQuota") * 1048576
+        report: Dict[str, Any] = {
+            "reclaimed": 0,
+            "removed_dates": 0,
+            "removed_runs": 0,
+            "total_size": None,
+        }
+
+        if retention_time != 0:
+            logger.info("开始清理超过设定天数的历史记录")
+
+            def remove_date(date_folder: Path) -> int:
+                reclaimed = remove_history_folder(date_folder)
+                self.history_database.remove_dates(date_folder.name)
+                return reclaimed
+
+            # 只处理日期文件夹
+            for date_folder in await asyncio.to_thread(
+                lambda: [_ for _ in self.history_path.iterdir() if _.is_dir()]
+            ):
+                try:
+                    # 只检查 `YYYY-MM-DD` 格式的文件夹
+                    folder_date = datetime.strptime(date_folder.name, "%Y-%m-%d").date()
+                except ValueError:
+                    logger.warning(f"非日期格式的目录: {date_folder}")
+                    continue
+
+                if today - folder_date > timedelta(days=retention_time):
+                    report["reclaimed"] += await asyncio.to_thread(
+                        remove_date, date_folder
+                    )
+                    report["removed_dates"] += 1
                     logger.debug(f"已删除超期日志目录: {date_folder}")
-            except ValueError:
-                logger.warning(f"非日期格式的目录: {date_folder}")
+                    await asyncio.sleep(HISTORY_CLEAN_INTERVAL)
+
+        if total_quota or user_quota:
+            logger.info("开始按容量配额清理历史记录")
+
+            def measure() -> List[tuple[str, str, int]]:
+                runs = [
+                    (key, user, run_size(self.history_path / key))
+                    for _, user, key in self.history_database.search(date.min, date.max)
+                ]
+                # 按日期与时间排序, 同一天内不同用户的记录按实际运行先后淘汰
+                runs.sort(key=lambda _: (_[0].split("/")[0], _[0].split("/")[2]))
+                return runs
+
+            runs = await asyncio.to_thread(measure)
+            evicted = plan_eviction(
+                runs, total_quota, user_quota, [today.strftime("%Y-%m-%d")]
+            )
+
+            def evict(keys: List[str]) -> int:
+                reclaimed = sum(
+                    remove_run_files(self.history_path / key) for key in keys
+                )
+                self.history_database.remove_runs(keys)
+                return reclaimed
 
-        logger.success(f"清理完成: {deleted_count} 个日期目录")
+            reclaimed = 0
+            for i in range(0, len(evicted), HISTORY_CLEAN_BATCH):
+                reclaimed += await asyncio.to_thread(
+                    evict, evicted[i : i + HISTORY_CLEAN_BATCH]
+                )
+                await asyncio.sleep(HISTORY_CLEAN_INTERVAL)
+
+            report["reclaimed"] += reclaimed
+            report["removed_runs"] = len(evicted)
+            report["total_size"] = sum(_[2] for _ in runs) - reclaimed
+
+        report["time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.history_retention = report
+
+        logger.success(
+            f"历史记录清理完成: {report['removed_dates']} 个日期目录, "
+            f"{report['removed_runs']} 条超出配额的记录, "
+            f"释放空间 {report['reclaimed'] / 1048576:.2f} MB"
+        )
 
 
 Config = AppConfig()
@@ -47,8 +47,7 @@ class _EmulatorManager:
 
         emulator_uid = uuid.UUID(emulator_id)
 
-        config = EmulatorConfig()
-        await config.load(await Config.EmulatorConfig[emulator_uid].toDict())
+        config: EmulatorConfig = Config.EmulatorConfig[emulator_uid].snapshot()
 
         if config.get("Info", "Type") in EMULATOR_TYPE_BOOK:
 
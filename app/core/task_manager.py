@@ -20,6 +20,7 @@
 #   Contact: DLmaster_361@163.com
 
 
+import time
 import uuid
 import asyncio
 from typing import Dict, Literal
@@ -29,7 +30,7 @@ from app.services import System
 from app.models.task import TaskItem, ScriptItem, UserItem, TaskExecuteBase
 from app.utils import get_logger
 from app.task import MaaManager, SrcManager, GeneralManager, MaaEndManager
-from app.utils.constants import POWER_SIGN_MAP
+from app.utils.constants import POWER_SIGN_MAP, TASK_LOG_SYNC_INTERVAL
 
 
 logger = get_logger("业务调度")
@@ -37,6 +38,8 @@ logger = get_logger("业务调度")
 
 class TaskInfo(TaskItem):
 
+    log_synced_at: float = 0.0  # 上次推送完整日志的时间
+
     async def on_change(self):
         await Config.send_websocket_message(
             id=self.task_id,
@@ -44,11 +47,40 @@ class TaskInfo(TaskItem):
             data={"task_info": self.asdict},
         )
         if self.current_index != -1:
-            await Config.send_websocket_message(
-                id=self.task_id,
-                type="Update",
-                data={"log": self.script_list[self.current_index].log},
-            )
+            await self.send_log(self.script_list[self.current_index])
+
+    async def on_log_append(self, script_item: ScriptItem, text: str, offset: int):
+        if (
+            self.current_index == -1
+            or self.script_list[self.current_index] is not script_item
+        ):
+            return
+
+        # 定期推送完整日志, 供错过增量推送的前端重新同步
+        if time.monotonic() - self.log_synced_at > TASK_LOG_SYNC_INTERVAL:
+            await self.send_log(script_item)
+            return
+
+        await Config.send_websocket_message(
+            id=self.task_id,
+            type="Update",
+            data={
+                "log_append": text,
+                "log_offset": offset,
+                "log_length": offset + len(text),
+            },
+        )
+
+    async def send_log(self, script_item: ScriptItem):
+        """推送完整的脚本执行日志"""
+
+        log = script_item.log
+        self.log_synced_at = time.monotonic()
+        await Config.send_websocket_message(
+            id=self.task_id,
+            type="Update",
+            data={"log": log, "log_length": len(log)},
+        )
 
 
 class Task(TaskExecuteBase):
@@ -211,6 +243,9 @@ class _TaskManager:
 
         uid = uuid.UUID(id)
 
+        # 配置读取不再实时访问文件系统, 启动任务前修正已失效的路径
+        await Config.revalidate_paths()
+
         if mode == "ScriptConfig":
             if uid in Config.ScriptConfig:
                 task_uid = uuid.uuid4()
@@ -98,6 +98,18 @@ class _MainTimer:
                     datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 )
 
+            # 各维护步骤独立处理异常, 避免单个步骤失败导致定时任务终止
+            for name, maintenance in (
+                ("路径配置校验", Config.revalidate_paths),
+                ("历史记录清理", Config.clean_old_history),
+                ("历史日志压缩", Config.compress_history),
+                ("历史日志索引", Config.index_history_logs),
+            ):
+                try:
+                    await maintenance()
+                except Exception as e:
+                    logger.exception(f"{name}失败: {e}")
+
             await asyncio.sleep(3600)
 
     @logger.catch()
@@ -26,19 +26,25 @@ import os
 import json
 import uuid
 import shlex
+import shutil
+import sqlite3
 import inspect
 import asyncio
+import weakref
+import threading
 import pyautogui
 import win32com.client
 from copy import deepcopy
+from functools import partial
 from urllib.parse import urlparse
 from datetime import datetime
 from contextlib import suppress
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Type, TypeVar, Generic, Callable, Coroutine
+from typing import Any, Self, Type, TypeVar, Generic, Callable, Coroutine
 
-from app.utils import get_logger, dpapi_encrypt, dpapi_decrypt
+from app.utils import get_logger, encrypt_secret, decrypt_secret
+from app.utils.tools import atomic_write_text
 from app.utils.constants import (
     RESERVED_NAMES,
     ILLEGAL_CHARS,
@@ -48,10 +54,39 @@ from app.utils.constants import (
 
 logger = get_logger("配置基类")
 
+# 正在计算的虚拟配置项所读取的配置项集合栈, 用于记录虚拟配置项的依赖
+_dependency_stack: list[set[ConfigItem]] = []
+
+
+class _WeakMethodCallback:
+    """以弱引用持有绑定方法的修改回调, 所属对象被回收后不再调用"""
+
+    __slots__ = ("method",)
+
+    def __init__(self, method: Callable[[], None]):
+        self.method = weakref.WeakMethod(method)
+
+    @property
+    def is_alive(self) -> bool:
+        return self.method() is not None
+
+    def __call__(self) -> None:
+        method = self.method()
+        if method is not None:
+            method()
+
 
 class ValidatorBase(ABC):
     """基础配置验证器"""
 
+    # 验证结果是否依赖配置项以外的状态 (其他配置等), 为真时每次读取都重新验证
+    is_volatile: bool = False
+    # 验证结果是否依赖文件系统, 为真时仅在写入和调用 `revalidate` 时验证
+    is_filesystem_dependent: bool = False
+    # 验证器类别标记, 构造配置项时据此判断而非逐个 isinstance, 以加快大量配置的构造
+    is_encrypted: bool = False
+    is_virtual: bool = False
+
     @abstractmethod
     def validate(self, value: Any) -> bool:
         """验证值是否合法"""
@@ -147,6 +182,8 @@ class UUIDValidator(ValidatorBase):
 class MultipleUIDValidator(ValidatorBase):
     """多配置管理类UID验证器"""
 
+    is_volatile = True
+
     def __init__(
         self, default: Any, related_config: dict[str, MultipleConfig], config_name: str
     ):
@@ -225,25 +262,52 @@ class JSONValidator(ValidatorBase):
 class EncryptValidator(ValidatorBase):
     """加密数据验证器"""
 
+    is_encrypted = True
+
     def validate(self, value):
         if not isinstance(value, str):
             return False
         try:
-            dpapi_decrypt(value)
+            decrypt_secret(value)
             return True
         except:
             return False
 
     def correct(self, value: Any) -> Any:
-        return value if self.validate(value) else dpapi_encrypt("数据损坏, 请重新设置")
+        return value if self.validate(value) else encrypt_secret("数据损坏, 请重新设置")
 
 
 class VirtualConfigValidator(ValidatorBase):
-    """虚拟配置验证器"""
+    """
+    虚拟配置验证器
+
+    提供 `cache_key` 时计算结果将被缓存, 计算过程中读取的配置项被记录为依赖,
+    任一依赖修改或 `cache_key` 返回值变化 (如跨日) 时缓存失效并重新计算。
+    """
+
+    is_volatile = True
+    is_virtual = True
+
+    def __init__(
+        self,
+        function: Callable[[], str],
+        cache_key: Callable[[], Any] | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        function: Callable[[], str]
+            虚拟配置项的取值函数
 
-    def __init__(self, function: Callable[[], str]):
+        cache_key: Callable[[], Any] | None
+            缓存键函数, 返回值变化时缓存失效, 默认为 None, 表示不缓存
+        """
         self.function = function
+        self.cache_key = cache_key
         self.if_init = False
+        self.item: ConfigItem | None = None
+        self._cache: tuple[Any, str] | None = None
+        self._dependencies: set[ConfigItem] = set()
 
     def validate(self, value):
         if not self.if_init:
@@ -252,10 +316,50 @@ class VirtualConfigValidator(ValidatorBase):
         return False
 
     def correct(self, value):
+        if self.cache_key is None:
+            try:
+                return self.function()
+            except Exception as e:
+                return str(e)
+
+        key = self.cache_key()
+        if self._cache is not None and self._cache[0] == key:
+            return self._cache[1]
+
+        dependencies: set[ConfigItem] = set()
+        _dependency_stack.append(dependencies)
         try:
-            return self.function()
+            result = self.function()
         except Exception as e:
             return str(e)
+        finally:
+            _dependency_stack.pop()
+
+        # 依赖可能属于其他配置 (如计划表), 以弱引用注册回调, 避免已删除的配置与快照被长期持有
+        dependencies.discard(self.item)
+        for item in dependencies - self._dependencies:
+            item._change_callbacks = [
+                callback
+                for callback in item._change_callbacks
+                if not isinstance(callback, _WeakMethodCallback) or callback.is_alive
+            ]
+            item._change_callbacks.append(_WeakMethodCallback(self.invalidate))
+        self._dependencies |= dependencies
+
+        self._cache = (key, result)
+        return result
+
+    def invalidate(self) -> None:
+        """清除缓存的计算结果, 并通知依赖本虚拟配置项的对象"""
+
+        if self._cache is None:
+            return
+
+        self._cache = None
+
+        if self.item is not None:
+            for callback in self.item._change_callbacks:
+                callback()
 
 
 class BoolValidator(ValidatorBase):
@@ -308,6 +412,8 @@ class FileValidator(ValidatorBase):
 class FolderValidator(ValidatorBase):
     """文件夹路径验证器"""
 
+    is_filesystem_dependent = True
+
     def validate(self, value):
         if not isinstance(value, str):
             return False
@@ -330,6 +436,8 @@ class FolderValidator(ValidatorBase):
 class EmulatorPathValidator(FileValidator):
     """模拟器管理器路径验证器"""
 
+    is_filesystem_dependent = True
+
     def __init__(self, emulator_type: ConfigItem) -> None:
         super().__init__()
 
@@ -643,6 +751,22 @@ class ConfigItem:
         )
         self.is_locked = False
         self._slots: list[Callable[[Any], Any]] = []
+        self._change_callbacks: list[Callable[[], None]] = []
+        # 加密配置项的明文缓存, 以密文为键, 存储值变化后自然失效
+        self._plaintext: tuple[str, str] | None = None
+        # 依赖文件系统的配置项失效时读取使用的修正值, 以存储值为键, 存储值变化后自然失效
+        self._correction: tuple[Any, Any] | None = None
+
+        self.is_encrypted = self.validator.is_encrypted
+        self.is_virtual = self.validator.is_virtual
+
+        if self.is_virtual:
+            self.validator.item = self
+        elif self.validator.is_filesystem_dependent and isinstance(
+            self.validator, EmulatorPathValidator
+        ):
+            # 模拟器类型变化后路径的合法性随之变化
+            self.validator.emulator_type._change_callbacks.append(self.revalidate)
 
         if not self.validator.validate(self.value):
             raise ValueError(
@@ -659,30 +783,64 @@ class ConfigItem:
             要设置的值, 可以是任何合法类型
         """
 
-        if (
-            dpapi_decrypt(self.value)
-            if isinstance(self.validator, EncryptValidator)
-            else self.value
-        ) == value:
-            return
+        if_changed, new_value = self._prepare_value(value)
+
+        if if_changed:
+            self._apply_value(new_value)
+
+    def _prepare_value(self, value: Any) -> tuple[bool, Any]:
+        """
+        计算设置新值后实际存储的值, 将自动进行验证和修正, 但不修改配置项
+
+        Parameters
+        ----------
+        value: Any
+            要设置的值, 可以是任何合法类型
+
+        Returns
+        -------
+        tuple[bool, Any]
+            值是否发生变化, 以及验证修正后的存储值
+        """
+
+        if (self._decrypt(self.value) if self.is_encrypted else self.value) == value:
+            return False, self.value
 
         if self.is_locked:
             raise ValueError(f"配置项 '{self.group}.{self.name}' 已锁定, 无法修改")
 
         # deepcopy new value
         try:
-            self.value = deepcopy(value)
+            new_value = deepcopy(value)
         except:
-            self.value = value
+            new_value = value
 
-        if isinstance(self.validator, EncryptValidator):
-            if self.validator.validate(self.value):
-                self.value = self.value
-            else:
-                self.value = dpapi_encrypt(self.value)
+        if self.is_encrypted:
+            if not self.validator.validate(new_value):
+                plaintext = new_value
+                new_value = encrypt_secret(new_value)
+                if isinstance(plaintext, str):
+                    self._plaintext = (new_value, plaintext)
 
-        if not self.validator.validate(self.value):
-            self.value = self.validator.correct(self.value)
+        if not self.validator.validate(new_value):
+            new_value = self.validator.correct(new_value)
+
+        return True, new_value
+
+    def _apply_value(self, value: Any):
+        """
+        写入已验证修正的值并发出修改信号
+
+        Parameters
+        ----------
+        value: Any
+            由 `_prepare_value` 计算得到的存储值
+        """
+
+        self.value = value
+
+        for callback in self._change_callbacks:
+            callback()
 
         if len(self._slots) > 0:
             asyncio.create_task(self._emit_signal(self.value))
@@ -692,16 +850,67 @@ class ConfigItem:
         获取配置项值
         """
 
-        v = (
-            self.value
-            if self.validator.validate(self.value)
-            else self.validator.correct(self.value)
-        )
+        if _dependency_stack:
+            _dependency_stack[-1].add(self)
 
-        if isinstance(self.validator, EncryptValidator) and if_decrypt:
-            return dpapi_decrypt(v)
+        # 存储值在写入时已完成验证, 仅依赖外部状态的配置项需要在读取时重新验证
+        if self.validator.is_volatile and not self.validator.validate(self.value):
+            v = self.validator.correct(self.value)
+        elif self._correction is not None and self._correction[0] == self.value:
+            v = self._correction[1]
+        else:
+            v = self.value
+
+        if self.is_encrypted and if_decrypt:
+            return self._decrypt(v)
         return v
 
+    def _decrypt(self, value: str) -> str:
+        """解密加密配置项的存储值, 同一密文只解密一次"""
+
+        if self._plaintext is None or self._plaintext[0] != value:
+            self._plaintext = (value, decrypt_secret(value))
+        return self._plaintext[1]
+
+    def revalidate(self) -> bool:
+        """
+        重新验证存储值, 用于验证结果依赖文件系统等外部状态的配置项
+
+        存储值失效时仅记录读取时使用的修正值, 不修改用户设置的存储值,
+        外部状态恢复 (如驱动器重新挂载) 后读取值随之恢复。已锁定的配置项不做处理。
+
+        Returns
+        -------
+        bool
+            读取值是否发生变化
+        """
+
+        if self.is_locked:
+            return False
+
+        old_value = self.getValue(if_decrypt=False)
+
+        if self.validator.validate(self.value):
+            self._correction = None
+        else:
+            self._correction = (self.value, self.validator.correct(self.value))
+
+        if self.getValue(if_decrypt=False) == old_value:
+            return False
+
+        for callback in self._change_callbacks:
+            callback()
+        return True
+
+    def getStorageValue(self) -> Any:
+        """
+        获取写入文件或数据库的值, 依赖文件系统的配置项始终写入用户设置的存储值
+        """
+
+        if self.validator.is_filesystem_dependent:
+            return self.value
+        return self.getValue(if_decrypt=False)
+
     def bind(self, slot: Callable[[Any], Any]):
         """
         连接槽函数到配置项修改信号
@@ -763,6 +972,256 @@ class ConfigItem:
         self.is_locked = False
 
 
+class _ConfigSaver:
+    """
+    配置延迟写入器
+
+    `save` 仅将配置标记为待写入, 在合并窗口结束后统一序列化一次,
+    并在事件循环之外以临时文件 + 原子重命名的方式写入磁盘。
+    """
+
+    def __init__(
+        self, delay: float = 0.5, retry_delay: float = 5, max_retry_delay: float = 300
+    ):
+        """
+        Parameters
+        ----------
+        delay: float
+            合并窗口时长 (秒), 窗口内的多次保存请求只会触发一次写入
+        retry_delay: float
+            写入失败后首次重试的等待时长 (秒), 此后每次失败翻倍
+        max_retry_delay: float
+            重试等待时长的上限 (秒)
+        """
+        self.delay = delay
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._dirty: dict[int, ConfigBase | MultipleConfig] = {}
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def schedule(self, config: ConfigBase | MultipleConfig) -> None:
+        """
+        标记配置为待写入, 并在需要时启动延迟写入任务
+
+        Parameters
+        ----------
+        config: ConfigBase | MultipleConfig
+            已连接配置文件的配置对象
+        """
+
+        self._dirty[id(config)] = config
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        """等待合并窗口结束后写入所有待写入配置, 写入失败时按退避间隔重试直至成功"""
+
+        await asyncio.sleep(self.delay)
+
+        retry_delay = self.retry_delay
+        while await self._flush():
+            logger.warning(f"配置写入失败, 将于 {retry_delay} 秒后重试")
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, self.max_retry_delay)
+
+    async def flush(self) -> None:
+        """
+        立即写入所有待写入配置, 用于程序退出等场景
+
+        写入失败的配置保留待写入状态, 并抛出 `RuntimeError` 以便调用方得知配置未能落盘
+        """
+
+        failed = await self._flush()
+        if failed:
+            raise RuntimeError(f"{len(failed)} 个配置写入失败, 已保留待下次写入")
+
+    async def _flush(self) -> list[ConfigBase | MultipleConfig]:
+        """写入所有待写入配置, 返回写入失败并已重新标记为待写入的配置"""
+
+        failed: dict[int, ConfigBase | MultipleConfig] = {}
+
+        async with self._lock:
+            while self._dirty:
+                pending = list(self._dirty.values())
+                self._dirty.clear()
+
+                for config in pending:
+                    try:
+                        await config.write()
+                        failed.pop(id(config), None)
+                    except Exception as e:
+                        logger.exception(
+                            f"配置文件 {config.file} 写入失败: {type(e).__name__}: {e}"
+                        )
+                        failed[id(config)] = config
+
+            # 写入失败的配置重新标记为待写入, 下次写入时重试
+            self._dirty.update(failed)
+
+        return list(failed.values())
+
+    async def delete(self, *paths: Path) -> None:
+        """
+        删除配置文件或目录, 在写入锁内执行以避免与正在进行的写入冲突
+
+        Parameters
+        ----------
+        paths: Path
+            要删除的文件或目录
+        """
+
+        def _delete():
+            for path in paths:
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+
+        await self.run(_delete)
+
+    async def run(self, function: Callable[[], Any]) -> Any:
+        """
+        在写入锁内于后台线程执行存储操作, 避免与正在进行的写入冲突
+
+        Parameters
+        ----------
+        function: Callable[[], Any]
+            要执行的同步函数
+        """
+
+        async with self._lock:
+            return await asyncio.to_thread(function)
+
+
+ConfigSaver = _ConfigSaver()
+
+
+class ConfigDatabase:
+    """
+    SQLite 配置存储
+
+    每个配置项存储为 `config_item` 表中的一行, 以 (配置键, 分组, 字段) 为主键;
+    多配置项的子配置顺序与类型存储于 `config_instance` 表。
+    配置键为形如 `ScriptConfig/<uid>/UserData/<uid>` 的路径, 便于整体删除子树。
+    连接在事件循环与写入线程间共享, 所有访问均通过锁串行化。
+    """
+
+    def __init__(self, path: Path):
+        """
+        Parameters
+        ----------
+        path: Path
+            数据库文件路径, 如果不存在则会创建
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS config_instance("
+                "parent TEXT NOT NULL, uid TEXT NOT NULL, type TEXT NOT NULL, "
+                "position INTEGER NOT NULL, PRIMARY KEY(parent, uid))"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS config_item("
+                "owner TEXT NOT NULL, grp TEXT NOT NULL, name TEXT NOT NULL, "
+                "value TEXT NOT NULL, PRIMARY KEY(owner, grp, name))"
+            )
+
+    def has_instances(self, parent: str) -> bool:
+        """判断指定多配置项是否已存储于数据库中"""
+
+        with self._lock:
+            return (
+                self.connection.execute(
+                    "SELECT 1 FROM config_instance WHERE parent = ? LIMIT 1", (parent,)
+                ).fetchone()
+                is not None
+            )
+
+    def get_instances(self, parent: str) -> list[tuple[str, str]]:
+        """按顺序获取多配置项的子配置 UID 与类型"""
+
+        with self._lock:
+            return self.connection.execute(
+                "SELECT uid, type FROM config_instance WHERE parent = ? ORDER BY position",
+                (parent,),
+            ).fetchall()
+
+    def get_items(self, owner: str) -> dict[str, dict[str, Any]]:
+        """获取配置的所有配置项, 格式与 `ConfigBase.load` 的参数一致"""
+
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT grp, name, value FROM config_item WHERE owner = ?", (owner,)
+            ).fetchall()
+
+        data: dict[str, dict[str, Any]] = {}
+        for group, name, value in rows:
+            with suppress(json.JSONDecodeError):
+                data.setdefault(group, {})[name] = json.loads(value)
+        return data
+
+    def upsert_items(self, rows: list[tuple[str, str, str, Any]]) -> None:
+        """写入配置项, 每行为 (配置键, 分组, 字段, 值)"""
+
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO config_item(owner, grp, name, value) VALUES(?, ?, ?, ?) "
+                "ON CONFLICT(owner, grp, name) DO UPDATE SET value = excluded.value",
+                [
+                    (owner, group, name, json.dumps(value, ensure_ascii=False))
+                    for owner, group, name, value in rows
+                ],
+            )
+
+    def set_instances(self, parent: str, instances: list[tuple[str, str]]) -> None:
+        """覆盖多配置项的子配置顺序与类型"""
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM config_instance WHERE parent = ?", (parent,)
+            )
+            self.connection.executemany(
+                "INSERT INTO config_instance(parent, uid, type, position) "
+                "VALUES(?, ?, ?, ?)",
+                [
+                    (parent, uid, type_name, position)
+                    for position, (uid, type_name) in enumerate(instances)
+                ],
+            )
+
+    def delete_tree(self, *keys: str) -> None:
+        """删除指定配置键及其下属所有配置的数据"""
+
+        with self._lock, self.connection:
+            for key in keys:
+                # "/" 之后的下一个字符为 "0", 以范围查询匹配所有子路径
+                scope = (key, f"{key}/", f"{key}0")
+                self.connection.execute(
+                    "DELETE FROM config_item "
+                    "WHERE owner = ? OR (owner >= ? AND owner < ?)",
+                    scope,
+                )
+                self.connection.execute(
+                    "DELETE FROM config_instance "
+                    "WHERE parent = ? OR (parent >= ? AND parent < ?)",
+                    scope,
+                )
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+
+        with self._lock:
+            self.connection.close()
+
+
 class ConfigBase(ABC):
     """
     配置基类
@@ -776,24 +1235,89 @@ class ConfigBase(ABC):
     子配置项可以是 `MultipleConfig` 的实例。
     """
 
+    # 各配置类的配置项布局 (配置项属性名, 多配置项属性名), 首个实例构造时扫描生成, 后续实例直接复用
+    _layout_registry: dict[type, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+
     def __init__(self):
         self.file: Path | None = None
+        self.database: ConfigDatabase | None = None
+        self.database_key: str | None = None
         self.is_locked = False
         self._save_methods: list[Callable[[], Coroutine[Any, Any, None]]] = []
+        # 上次写入后发生修改的配置项, 数据库存储时仅写入这些配置项
+        self._dirty_items: set[ConfigItem] = set()
+        # 快照对应的原配置, 非快照时为 None
+        self._snapshot_source: Self | None = None
 
         # 配置项索引
         self._config_item_index: dict[str, dict[str, ConfigItem]] = {}
         self._multiple_config_index: dict[str, MultipleConfig] = {}
-        for name in dir(self):
-            item = getattr(self, name)
+        self._volatile_items: list[ConfigItem] = []
+        self._filesystem_items: list[ConfigItem] = []
+        item_names, multiple_config_names = self._get_layout()
+
+        for name in item_names:
+            item: ConfigItem = getattr(self, name)
+            if item.group not in self._config_item_index:
+                self._config_item_index[item.group] = {}
+            self._config_item_index[item.group][item.name] = item
+            item._change_callbacks.append(partial(self._on_item_changed, item))
+            if item.validator.is_volatile:
+                self._volatile_items.append(item)
+            elif item.validator.is_filesystem_dependent:
+                self._filesystem_items.append(item)
+
+        for name in multiple_config_names:
+            self._multiple_config_index[name] = getattr(self, name)
+
+        # 序列化缓存, 键为是否解密, 任一配置项修改后失效
+        self._dict_cache: dict[bool, dict[str, dict[str, Any]]] = {}
+
+    def _get_layout(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """获取本配置类的配置项布局, 仅在首次构造时扫描实例属性"""
 
-            if isinstance(item, ConfigItem):
-                if not self._config_item_index.get(item.group):
-                    self._config_item_index[item.group] = {}
-                self._config_item_index[item.group][item.name] = item
+        layout = ConfigBase._layout_registry.get(type(self))
 
-            elif isinstance(item, MultipleConfig):
-                self._multiple_config_index[name] = item
+        if layout is None:
+            item_names = []
+            multiple_config_names = []
+            for name in dir(self):
+                # 静态查找属性, 避免触发依赖配置项索引的 property
+                item = inspect.getattr_static(self, name)
+                if isinstance(item, ConfigItem):
+                    item_names.append(name)
+                elif isinstance(item, MultipleConfig):
+                    multiple_config_names.append(name)
+
+            layout = (tuple(item_names), tuple(multiple_config_names))
+            ConfigBase._layout_registry[type(self)] = layout
+
+        return layout
+
+    def mark_dirty(self) -> None:
+        """标记配置项已修改, 清除序列化缓存"""
+
+        self._dict_cache.clear()
+
+    def _on_item_changed(self, item: ConfigItem) -> None:
+        """配置项修改回调, 清除序列化缓存并记录待写入的配置项"""
+
+        self._dict_cache.clear()
+        self._dirty_items.add(item)
+
+    @property
+    def is_connected(self) -> bool:
+        """配置是否已绑定到配置文件或数据库"""
+
+        return self.file is not None or self.database_key is not None
+
+    def _notify_removed(self) -> None:
+        """配置被移除时通知依赖其配置项的虚拟配置项重新计算"""
+
+        for group in self._config_item_index.values():
+            for item in group.values():
+                for callback in item._change_callbacks:
+                    callback()
 
     async def connect(self, path: Path):
         """
@@ -811,6 +1335,9 @@ class ConfigBase(ABC):
         if self.is_locked:
             raise ValueError("配置已锁定, 无法修改")
 
+        # 写入尚未落盘的配置, 避免读取到过期的配置文件
+        await ConfigSaver.flush()
+
         self.file = path
 
         if not self.file.exists():
@@ -871,6 +1398,9 @@ class ConfigBase(ABC):
 
         for group, info in self._config_item_index.items():
             for name, item in info.items():
+                # 虚拟配置项由其他配置项计算得到, 无需加载
+                if item.is_virtual:
+                    continue
                 try:
                     item.setValue(data[group][name])
                 except:
@@ -882,27 +1412,68 @@ class ConfigBase(ABC):
                                 ]
                             )
 
-        if self.file:
+        if self.is_connected:
             await self.save()
 
         await asyncio.gather(*(_() for _ in self._save_methods))
 
     async def toDict(
-        self, if_decrypt: bool = True, regenerate_uuids: bool = False
+        self,
+        if_decrypt: bool = True,
+        regenerate_uuids: bool = False,
+        if_skip_sharded: bool = False,
+        if_skip_virtual: bool = False,
     ) -> dict[str, Any]:
-        """将配置项转换为字典"""
+        """
+        将配置项转换为字典
+
+        Parameters
+        ----------
+        if_decrypt: bool
+            是否解密数据, 默认为 True
+        regenerate_uuids: bool
+            是否重新生成 UUID, 默认为 False
+        if_skip_sharded: bool
+            是否跳过已分片存储的子配置项, 仅在写入分片文件时使用
+        if_skip_virtual: bool
+            是否跳过虚拟配置项, 写入文件时使用
+        """
 
-        data = {}
+        if if_decrypt not in self._dict_cache:
+            cache: dict[str, dict[str, Any]] = {}
+            for group, info in self._config_item_index.items():
+                for name, item in info.items():
+                    # 易变及依赖文件系统的配置项仅占位以保持字段顺序, 每次调用时重新取值
+                    cache.setdefault(group, {})[name] = (
+                        None
+                        if item.validator.is_volatile
+                        or item.validator.is_filesystem_dependent
+                        else item.getValue(if_decrypt)
+                    )
+            self._dict_cache[if_decrypt] = cache
 
-        for group, info in self._config_item_index.items():
-            for name, item in info.items():
-                data.setdefault(group, {})[name] = item.getValue(if_decrypt)
+        # 复制分组字典, 避免调用方修改结果时污染缓存
+        data: dict[str, Any] = {
+            group: dict(info) for group, info in self._dict_cache[if_decrypt].items()
+        }
+        for item in self._volatile_items:
+            if if_skip_virtual and item.is_virtual:
+                data[item.group].pop(item.name)
+            else:
+                data[item.group][item.name] = item.getValue(if_decrypt)
+        # 写入文件时保留用户设置的路径, 不写入因路径失效而修正的值
+        for item in self._filesystem_items:
+            data[item.group][item.name] = (
+                item.value if if_skip_virtual else item.getValue(if_decrypt)
+            )
 
         for name, item in self._multiple_config_index.items():
+            if if_skip_sharded and item.folder is not None:
+                continue
             if not data.get("SubConfigsInfo"):
                 data["SubConfigsInfo"] = {}
             data["SubConfigsInfo"][name] = await item.toDict(
-                if_decrypt, regenerate_uuids
+                if_decrypt, regenerate_uuids, if_skip_virtual
             )
 
         return data
@@ -937,7 +1508,49 @@ class ConfigBase(ABC):
 
         self._config_item_index[group][name].setValue(value)
 
-        if self.file:
+        if self.is_connected:
+            await self.save()
+
+        await asyncio.gather(*(_() for _ in self._save_methods))
+
+    async def update_many(self, data: dict[str, dict[str, Any]]):
+        """
+        批量设置配置项的值
+
+        所有配置项先完成验证与修正, 全部通过后才统一写入,
+        每个发生变化的配置项只发出一次修改信号, 整批修改只触发一次保存。
+
+        Parameters
+        ----------
+        data: dict[str, dict[str, Any]]
+            配置数据, 格式为 `{group: {name: value}}`
+        """
+
+        if self.is_locked:
+            raise ValueError("配置已锁定, 无法修改")
+
+        items: list[tuple[ConfigItem, Any]] = []
+        for group, info in data.items():
+            for name, value in info.items():
+                if not self._config_item_index.get(group, {}).get(name):
+                    raise AttributeError(f"配置项 '{group}.{name}' 不存在")
+                items.append((self._config_item_index[group][name], value))
+
+        prepared = [(item, *item._prepare_value(value)) for item, value in items]
+
+        if not any(if_changed for _, if_changed, _ in prepared):
+            return
+
+        for item, if_changed, value in prepared:
+            if if_changed:
+                item._apply_value(value)
+
+        # 同批修改的其他配置项可能影响路径的合法性, 如模拟器类型
+        for item, if_changed, _ in prepared:
+            if if_changed and item.validator.is_filesystem_dependent:
+                item.revalidate()
+
+        if self.is_connected:
             await self.save()
 
         await asyncio.gather(*(_() for _ in self._save_methods))
@@ -987,18 +1600,211 @@ class ConfigBase(ABC):
         self._config_item_index[group][name].unbind(slot)
 
     async def save(self) -> None:
-        """保存配置"""
+        """保存配置, 实际写入由 `ConfigSaver` 合并后延迟执行"""
 
-        if not self.file:
+        if not self.is_connected:
             raise ValueError("文件路径未设置, 请先调用 `connect` 方法连接配置文件")
 
-        self.file.parent.mkdir(parents=True, exist_ok=True)
-        self.file.write_text(
-            json.dumps(
-                await self.toDict(if_decrypt=False), ensure_ascii=False, indent=4
-            ),
-            encoding="utf-8",
+        ConfigSaver.schedule(self)
+
+    async def write(self) -> None:
+        """立即将配置写入文件或数据库, 配置已解除绑定时直接跳过"""
+
+        dirty_items = self._dirty_items
+        self._dirty_items = set()
+
+        if self.database is not None and self.database_key is not None:
+            database, key = self.database, self.database_key
+            rows = [
+                (key, item.group, item.name, item.getStorageValue())
+                for item in dirty_items
+                if not item.is_virtual
+            ]
+            if rows:
+                try:
+                    await asyncio.to_thread(database.upsert_items, rows)
+                except Exception:
+                    self._dirty_items |= dirty_items
+                    raise
+            return
+
+        if not self.file:
+            return
+
+        file = self.file
+        data = await self.toDict(
+            if_decrypt=False, if_skip_sharded=True, if_skip_virtual=True
         )
+        await asyncio.to_thread(
+            lambda: atomic_write_text(
+                file, json.dumps(data, ensure_ascii=False, indent=4)
+            )
+        )
+
+    async def connect_shard(self, path: Path, folder: Path):
+        """
+        将已加载的配置绑定到分片文件, 并从分片目录加载子配置项
+
+        Parameters
+        ----------
+        path: Path
+            本配置的分片文件路径
+        folder: Path
+            子配置项的分片目录
+        """
+
+        self.file = path
+
+        for name, sub_config in self._multiple_config_index.items():
+            await sub_config.connect_folder(folder / name)
+
+    async def attach_shard(self, path: Path, folder: Path):
+        """
+        将内存中的配置数据绑定到分片文件, 并写入本配置及所有子配置项
+
+        Parameters
+        ----------
+        path: Path
+            本配置的分片文件路径
+        folder: Path
+            子配置项的分片目录
+        """
+
+        self.file = path
+
+        for name, sub_config in self._multiple_config_index.items():
+            await sub_config.attach_folder(folder / name)
+
+        await self.save()
+
+    async def connect_database(self, database: ConfigDatabase, key: str):
+        """
+        将已加载的配置绑定到数据库, 并从数据库加载子配置项
+
+        Parameters
+        ----------
+        database: ConfigDatabase
+            配置数据库
+        key: str
+            本配置的配置键
+        """
+
+        self.database = database
+        self.database_key = key
+        self._dirty_items.clear()
+
+        for name, sub_config in self._multiple_config_index.items():
+            await sub_config.connect_database(database, f"{key}/{name}")
+
+    async def attach_database(self, database: ConfigDatabase, key: str):
+        """
+        将内存中的配置数据绑定到数据库, 并写入本配置及所有子配置项
+
+        Parameters
+        ----------
+        database: ConfigDatabase
+            配置数据库
+        key: str
+            本配置的配置键
+        """
+
+        self.database = database
+        self.database_key = key
+        self._dirty_items = {
+            item
+            for group in self._config_item_index.values()
+            for item in group.values()
+        }
+
+        for name, sub_config in self._multiple_config_index.items():
+            await sub_config.attach_database(database, f"{key}/{name}")
+
+        await self.save()
+
+    async def detach(self):
+        """解除本配置及所有子配置项与文件或数据库的绑定"""
+
+        self.file = None
+        self.database = None
+        self.database_key = None
+
+        for sub_config in self._multiple_config_index.values():
+            await sub_config.detach()
+
+    def snapshot(self) -> Self:
+        """
+        创建配置的写时复制快照
+
+        快照与原配置共享不可变的存储值, 不经过序列化与验证; 列表、字典等可变的存储值
+        在创建快照时深拷贝, 修改快照 (包括原地修改可变值) 不会影响原配置。
+        快照不绑定配置文件, 可通过 `commit` 将修改过的配置项写回原配置。
+        """
+
+        config = type(self)()
+
+        for group, info in self._config_item_index.items():
+            for name, item in info.items():
+                target = config._config_item_index[group][name]
+                target.value = (
+                    item.value
+                    if isinstance(item.value, (str, int, float, bool, type(None)))
+                    else deepcopy(item.value)
+                )
+                target._plaintext = item._plaintext
+                target._correction = item._correction
+
+        for name, sub_config in self._multiple_config_index.items():
+            config._multiple_config_index[name]._copy_from(sub_config)
+
+        config._dirty_items.clear()
+        config._dict_cache.clear()
+        config._snapshot_source = self
+        return config
+
+    async def commit(self):
+        """将快照中修改过的配置项写回原配置, 未修改的配置项不做任何处理"""
+
+        if self._snapshot_source is None:
+            raise ValueError("当前配置不是快照, 无法写回")
+
+        data: dict[str, dict[str, Any]] = {}
+        for item in self._dirty_items:
+            if not item.is_virtual:
+                data.setdefault(item.group, {})[item.name] = item.value
+        self._dirty_items = set()
+
+        if data:
+            await self._snapshot_source.update_many(data)
+
+        for sub_config in self._multiple_config_index.values():
+            await sub_config.commit()
+
+    async def revalidate(self) -> bool:
+        """
+        重新验证依赖文件系统的配置项, 失效的路径仅在读取时修正, 不覆盖存储值
+
+        已锁定 (正在被任务使用) 的配置不做处理。
+
+        Returns
+        -------
+        bool
+            本配置或子配置项是否有配置项的读取值发生变化
+        """
+
+        if self.is_locked:
+            return False
+
+        if_changed = False
+
+        for item in self._filesystem_items:
+            if item.revalidate():
+                if_changed = True
+
+        for config in self._multiple_config_index.values():
+            if await config.revalidate():
+                if_changed = True
+
+        return if_changed
 
     async def lock(self):
         """
@@ -1057,10 +1863,14 @@ class MultipleConfig(Generic[T]):
             _.__name__: _ for _ in sub_config_type
         }
         self.file: Path | None = None
+        self.folder: Path | None = None
+        self.database: ConfigDatabase | None = None
+        self.database_key: str | None = None
         self.order: list[uuid.UUID] = []
         self.data: dict[uuid.UUID, T] = {}
         self.is_locked = False
         self._save_methods: list[Callable[[], Coroutine[Any, Any, None]]] = []
+        self._snapshot_source: MultipleConfig[T] | None = None
 
     def __getitem__(self, key: uuid.UUID) -> T:
         """允许通过 config[uuid] 访问配置项"""
@@ -1084,6 +1894,22 @@ class MultipleConfig(Generic[T]):
         """用户友好的字符串表示"""
         return f"MultipleConfig with {len(self.data)} items"
 
+    @property
+    def is_connected(self) -> bool:
+        """配置是否已绑定到配置文件、分片目录或数据库"""
+
+        return (
+            self.file is not None
+            or self.folder is not None
+            or self.database_key is not None
+        )
+
+    @property
+    def is_sharded(self) -> bool:
+        """子配置项是否各自独立存储"""
+
+        return self.folder is not None or self.database_key is not None
+
     async def connect(self, path: Path):
         """
         将配置文件连接到指定配置文件
@@ -1100,6 +1926,9 @@ class MultipleConfig(Generic[T]):
         if self.is_locked:
             raise ValueError("配置已锁定, 无法修改")
 
+        # 写入尚未落盘的配置, 避免读取到过期的配置文件
+        await ConfigSaver.flush()
+
         self.file = path
 
         if not self.file.exists():
@@ -1115,6 +1944,206 @@ class MultipleConfig(Generic[T]):
 
         await self.add_save_method(self.save)
 
+    async def connect_folder(self, folder: Path, legacy_file: Path | None = None):
+        """
+        将配置数据以分片形式绑定到指定目录
+
+        目录下的 `index.json` 记录子配置项的顺序与类型, 每个子配置项单独存储为 `<uid>.json`,
+        子配置项内的多配置项则递归存储于 `<uid>/<名称>/` 目录下, 修改单个子配置项时仅重写对应文件。
+
+        Parameters
+        ----------
+        folder: Path
+            分片存储目录, 如果不存在则会创建
+        legacy_file: Path | None
+            旧版单文件配置路径, 若分片目录尚未初始化且该文件存在, 则从中迁移配置数据
+        """
+
+        if self.is_locked:
+            raise ValueError("配置已锁定, 无法修改")
+
+        # 写入尚未落盘的配置, 避免读取到过期的配置文件
+        await ConfigSaver.flush()
+
+        self.file = None
+        self.database = None
+        self.database_key = None
+        index_file = folder / "index.json"
+
+        if legacy_file is not None and legacy_file.exists() and not index_file.exists():
+            logger.info(f"开始迁移配置至分片存储: {legacy_file} -> {folder}")
+
+            try:
+                data = json.loads(legacy_file.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                data = {}
+
+            await self.load(data)
+            await self.attach_folder(folder)
+            await ConfigSaver.flush()
+
+            legacy_file.replace(legacy_file.with_suffix(".json.bak"))
+            logger.success(f"配置迁移完成, 旧版配置文件已备份: {legacy_file}.bak")
+            return
+
+        try:
+            index = json.loads(index_file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+
+        self.order = []
+        self.data = {}
+
+        for instance in index.get("instances", []):
+            if not isinstance(instance, dict):
+                continue
+
+            type_name = instance.get("type")
+            if type_name not in self.sub_config_type:
+                continue
+
+            try:
+                uid = uuid.UUID(instance.get("uid"))
+                data = json.loads((folder / f"{uid}.json").read_text(encoding="utf-8"))
+            except (TypeError, ValueError, FileNotFoundError):
+                continue
+
+            config = self.sub_config_type[type_name]()
+            await config.load(data)
+            await config.connect_shard(folder / f"{uid}.json", folder / str(uid))
+
+            self.order.append(uid)
+            self.data[uid] = config
+
+        self.folder = folder
+
+        if not index_file.exists():
+            await self.save()
+
+    async def attach_folder(self, folder: Path):
+        """
+        将内存中的配置数据以分片形式绑定到指定目录, 并写入索引与所有分片
+
+        Parameters
+        ----------
+        folder: Path
+            分片存储目录
+        """
+
+        self.file = None
+        self.folder = folder
+
+        for uid, config in self.items():
+            await config.attach_shard(folder / f"{uid}.json", folder / str(uid))
+
+        await self.save()
+
+    async def connect_database(
+        self,
+        database: ConfigDatabase,
+        key: str,
+        legacy_folder: Path | None = None,
+        legacy_file: Path | None = None,
+    ):
+        """
+        将配置数据绑定到数据库, 每个配置项对应一行数据, 修改单个配置项时仅写入对应行
+
+        Parameters
+        ----------
+        database: ConfigDatabase
+            配置数据库
+        key: str
+            本配置的配置键
+        legacy_folder: Path | None
+            旧版分片存储目录, 若数据库中尚无本配置数据, 则从中迁移配置数据
+        legacy_file: Path | None
+            旧版单文件配置路径, 迁移时传递给 `connect_folder`
+        """
+
+        if self.is_locked:
+            raise ValueError("配置已锁定, 无法修改")
+
+        # 写入尚未落盘的配置, 避免读取到过期的配置数据
+        await ConfigSaver.flush()
+
+        if (
+            legacy_folder is not None
+            and not database.has_instances(key)
+            and (
+                (legacy_folder / "index.json").exists()
+                or (legacy_file is not None and legacy_file.exists())
+            )
+        ):
+            await self.connect_folder(legacy_folder, legacy_file)
+            logger.info(f"开始迁移配置至数据库存储: {legacy_folder} -> {key}")
+
+            await self.detach()
+            await self.attach_database(database, key)
+            await ConfigSaver.flush()
+
+            backup = legacy_folder.with_name(f"{legacy_folder.name}.bak")
+            await ConfigSaver.delete(backup)
+            legacy_folder.replace(backup)
+            logger.success(f"配置迁移完成, 旧版分片配置已备份: {backup}")
+            return
+
+        self.file = None
+        self.folder = None
+        self.order = []
+        self.data = {}
+
+        for uid_str, type_name in database.get_instances(key):
+            if type_name not in self.sub_config_type:
+                continue
+
+            try:
+                uid = uuid.UUID(uid_str)
+            except ValueError:
+                continue
+
+            config = self.sub_config_type[type_name]()
+            await config.load(database.get_items(f"{key}/{uid}"))
+            await config.connect_database(database, f"{key}/{uid}")
+
+            self.order.append(uid)
+            self.data[uid] = config
+
+        self.database = database
+        self.database_key = key
+
+    async def attach_database(self, database: ConfigDatabase, key: str):
+        """
+        将内存中的配置数据绑定到数据库, 并写入顺序索引与所有子配置项
+
+        Parameters
+        ----------
+        database: ConfigDatabase
+            配置数据库
+        key: str
+            本配置的配置键
+        """
+
+        self.file = None
+        self.folder = None
+        self.database = database
+        self.database_key = key
+
+        for uid, config in self.items():
+            await config.attach_database(database, f"{key}/{uid}")
+
+        await self.save()
+
+    async def detach(self):
+        """解除本配置及所有子配置项与文件或数据库的绑定"""
+
+        self.file = None
+        self.folder = None
+        self.database = None
+        self.database_key = None
+
+        for config in self.values():
+            await config.detach()
+
     async def add_save_method(
         self, save_method: Callable[[], Coroutine[Any, Any, None]]
     ):
@@ -1150,10 +2179,19 @@ class MultipleConfig(Generic[T]):
         if self.is_locked:
             raise ValueError("配置已锁定, 无法修改")
 
+        old_data = self.data
+
         self.order = []
         self.data = {}
 
+        if self.is_sharded:
+            for config in old_data.values():
+                await config.detach()
+
         if not data.get("instances"):
+            if self.is_sharded:
+                await self._delete_shards(old_data.keys())
+                await self.save()
             return
 
         for instance in data["instances"]:
@@ -1169,11 +2207,20 @@ class MultipleConfig(Generic[T]):
 
         if self.file:
             await self.save()
+        elif self.folder is not None:
+            await self._delete_shards(set(old_data.keys()) - set(self.data.keys()))
+            await self.attach_folder(self.folder)
+        elif self.database is not None and self.database_key is not None:
+            await self._delete_shards(set(old_data.keys()) - set(self.data.keys()))
+            await self.attach_database(self.database, self.database_key)
 
         await asyncio.gather(*(_() for _ in self._save_methods))
 
     async def toDict(
-        self, if_decrypt: bool = True, regenerate_uuids: bool = False
+        self,
+        if_decrypt: bool = True,
+        regenerate_uuids: bool = False,
+        if_skip_virtual: bool = False,
     ) -> dict[str, list | dict]:
         """
         将配置项转换为字典
@@ -1184,6 +2231,8 @@ class MultipleConfig(Generic[T]):
             是否解密数据, 默认为 True
         regenerate_uuids: bool
             是否重新生成 UUID, 默认为 False
+        if_skip_virtual: bool
+            是否跳过虚拟配置项, 写入文件时使用
 
         Returns
         -------
@@ -1203,7 +2252,7 @@ class MultipleConfig(Generic[T]):
         }
         for uid, config in self.items():
             data[str(uuid_book[uid])] = await config.toDict(
-                if_decrypt, regenerate_uuids
+                if_decrypt, regenerate_uuids, if_skip_virtual=if_skip_virtual
             )
 
         return data
@@ -1237,19 +2286,64 @@ class MultipleConfig(Generic[T]):
         return data
 
     async def save(self):
-        """保存配置"""
+        """保存配置, 实际写入由 `ConfigSaver` 合并后延迟执行"""
 
-        if not self.file:
+        if not self.is_connected:
             raise ValueError("文件路径未设置, 请先调用 `connect` 方法连接配置文件")
 
-        self.file.parent.mkdir(parents=True, exist_ok=True)
-        self.file.write_text(
-            json.dumps(
-                await self.toDict(if_decrypt=False), ensure_ascii=False, indent=4
-            ),
-            encoding="utf-8",
+        ConfigSaver.schedule(self)
+
+    async def write(self):
+        """立即将配置写入文件, 分片存储时仅写入索引, 配置已解除绑定时直接跳过"""
+
+        if self.database is not None and self.database_key is not None:
+            await asyncio.to_thread(
+                self.database.set_instances,
+                self.database_key,
+                [(str(_), type(self.data[_]).__name__) for _ in self.order],
+            )
+            return
+
+        if self.file:
+            file = self.file
+            data = await self.toDict(if_decrypt=False, if_skip_virtual=True)
+        elif self.folder is not None:
+            file = self.folder / "index.json"
+            data = {
+                "instances": [
+                    {"uid": str(_), "type": type(self.data[_]).__name__}
+                    for _ in self.order
+                ]
+            }
+        else:
+            return
+
+        await asyncio.to_thread(
+            lambda: atomic_write_text(
+                file, json.dumps(data, ensure_ascii=False, indent=4)
+            )
         )
 
+    async def _delete_shards(self, uids):
+        """删除指定子配置项的分片文件与分片目录, 或数据库中的对应数据"""
+
+        if self.database is not None and self.database_key is not None:
+            keys = [f"{self.database_key}/{uid}" for uid in uids]
+            if keys:
+                await ConfigSaver.run(partial(self.database.delete_tree, *keys))
+            return
+
+        if self.folder is None:
+            return
+
+        paths = []
+        for uid in uids:
+            paths.append(self.folder / f"{uid}.json")
+            paths.append(self.folder / str(uid))
+
+        if paths:
+            await ConfigSaver.delete(*paths)
+
     async def add(self, config_type: Type[T]) -> tuple[uuid.UUID, T]:
         """
         添加一个新的配置项
@@ -1281,6 +2375,16 @@ class MultipleConfig(Generic[T]):
         if self.file:
             await self.data[uid].add_save_method(self.save)
             await self.save()
+        elif self.folder is not None:
+            await self.data[uid].attach_shard(
+                self.folder / f"{uid}.json", self.folder / str(uid)
+            )
+            await self.save()
+        elif self.database is not None and self.database_key is not None:
+            await self.data[uid].attach_database(
+                self.database, f"{self.database_key}/{uid}"
+            )
+            await self.save()
 
         await asyncio.gather(*(_() for _ in self._save_methods))
 
@@ -1305,11 +2409,16 @@ class MultipleConfig(Generic[T]):
         if self.data[uid].is_locked:
             raise ValueError(f"配置项 '{uid}' 已锁定, 无法移除")
 
-        self.data.pop(uid)
+        config = self.data.pop(uid)
         self.order.remove(uid)
+        config._notify_removed()
 
         if self.file:
             await self.save()
+        elif self.is_sharded:
+            await config.detach()
+            await self._delete_shards([uid])
+            await self.save()
 
         await asyncio.gather(*(_() for _ in self._save_methods))
 
@@ -1331,11 +2440,60 @@ class MultipleConfig(Generic[T]):
 
         self.order = order
 
-        if self.file:
+        if self.is_connected:
             await self.save()
 
         await asyncio.gather(*(_() for _ in self._save_methods))
 
+    def snapshot(self) -> MultipleConfig[T]:
+        """
+        创建配置的写时复制快照, 所有子配置项均为对应原配置的快照
+
+        快照不绑定配置文件, 可通过 `commit` 将修改过的配置项写回原配置。
+        """
+
+        config = MultipleConfig(list(self.sub_config_type.values()))
+        config._copy_from(self)
+        return config
+
+    def _copy_from(self, source: MultipleConfig[T]):
+        """以原配置的快照填充本配置"""
+
+        self.order = list(source.order)
+        self.data = {uid: source.data[uid].snapshot() for uid in source.order}
+        self._snapshot_source = source
+
+    async def commit(self):
+        """将快照中修改过的配置项写回原配置, 原配置中已移除的子配置项将被忽略"""
+
+        if self._snapshot_source is None:
+            raise ValueError("当前配置不是快照, 无法写回")
+
+        for uid, config in self.items():
+            if uid in self._snapshot_source:
+                await config.commit()
+
+    async def revalidate(self) -> bool:
+        """
+        重新验证所有子配置项中依赖文件系统的配置项
+
+        Returns
+        -------
+        bool
+            是否有配置项被修正
+        """
+
+        if self.is_locked:
+            return False
+
+        if_changed = False
+
+        for config in self.values():
+            if await config.revalidate():
+                if_changed = True
+
+        return if_changed
+
     async def lock(self):
         """
         锁定配置项, 锁定后无法修改配置项值
@@ -26,5 +26,6 @@ from .config import *
 from .schema import *
 from .emulator import *
 from .task import *
+from .history import *
 
-__all__ = ["ConfigBase", "config", "schema", "emulator", "task"]
+__all__ = ["ConfigBase", "config", "schema", "emulator", "task", "history"]
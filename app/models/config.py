@@ -62,6 +62,16 @@ from .ConfigBase import (
 from .schema import TagItem
 
 
+def daily_cache_key() -> tuple:
+    """虚拟配置项缓存键, 东4区或东8区跨日时缓存失效"""
+    return datetime.now(tz=UTC4).date(), datetime.now(tz=UTC8).date()
+
+
+def minutely_cache_key() -> str:
+    """虚拟配置项缓存键, 每分钟缓存失效"""
+    return datetime.now(tz=UTC8).strftime("%Y-%m-%d %H:%M")
+
+
 class EmulatorConfig(ConfigBase):
     """模拟器配置"""
 
@@ -282,11 +292,17 @@ class MaaUserConfig(ConfigBase):
         )
         ## 基建配置名称
         self.Info_InfrastName = ConfigItem(
-            "Info", "InfrastName", "-", VirtualConfigValidator(self.getInfrastName)
+            "Info",
+            "InfrastName",
+            "-",
+            VirtualConfigValidator(self.getInfrastName, lambda: None),
         )
         ## 基建配置索引
         self.Info_InfrastIndex = ConfigItem(
-            "Info", "InfrastIndex", "-", VirtualConfigValidator(self.getInfrastIndex)
+            "Info",
+            "InfrastIndex",
+            "-",
+            VirtualConfigValidator(self.getInfrastIndex, minutely_cache_key),
         )
         ## 备注
         self.Info_Notes = ConfigItem("Info", "Notes", "无")
@@ -319,7 +335,7 @@ class MaaUserConfig(ConfigBase):
         )
         ## 用户标签信息（虚拟字段，供前端显示）
         self.Info_Tag = ConfigItem(
-            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags)
+            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags, daily_cache_key)
         )
 
         ## Data ------------------------------------------------------------
@@ -504,7 +520,8 @@ class MaaUserConfig(ConfigBase):
             elif infrast_mode == "Rotation":
                 infrast_text = "基建：轮换"
             elif infrast_mode == "Custom":
-                infrast_text = f"基建：{self.getInfrastName() if len(self.getInfrastName()) < 10 else self.getInfrastName()[:10] + '...'}"
+                infrast_name = self.get("Info", "InfrastName")
+                infrast_text = f"基建：{infrast_name if len(infrast_name) < 10 else infrast_name[:10] + '...'}"
             else:
                 infrast_text = "基建：开启"
             tags.append({"text": infrast_text, "color": "purple"})
@@ -672,7 +689,7 @@ class MaaEndUserConfig(ConfigBase):
         )
         ## 用户标签信息
         self.Info_Tag = ConfigItem(
-            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags)
+            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags, daily_cache_key)
         )
 
         ## Task ------------------------------------------------------------
@@ -968,7 +985,7 @@ class SrcUserConfig(ConfigBase):
         self.Info_Notes = ConfigItem("Info", "Notes", "无")
         ## 用户标签信息
         self.Info_Tag = ConfigItem(
-            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags)
+            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags, daily_cache_key)
         )
 
         ## 关卡配置----------------------------------------------------------
@@ -1405,7 +1422,7 @@ class GeneralUserConfig(ConfigBase):
         self.Info_Notes = ConfigItem("Info", "Notes", "无")
         ## 用户标签信息
         self.Info_Tag = ConfigItem(
-            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags)
+            "Info", "Tag", "[ ]", VirtualConfigValidator(self.getTags, daily_cache_key)
         )
 
         ## Data ------------------------------------------------------------
@@ -1707,6 +1724,14 @@ class GlobalConfig(ConfigBase):
             0,
             OptionsValidator([7, 15, 30, 60, 90, 180, 365, 0]),
         )
+        ## 历史记录总容量上限（MB）, 0 表示不限制
+        self.Function_HistoryQuota = ConfigItem(
+            "Function", "HistoryQuota", 0, RangeValidator(0, 1048576)
+        )
+        ## 单个用户历史记录容量上限（MB）, 0 表示不限制
+        self.Function_HistoryUserQuota = ConfigItem(
+            "Function", "HistoryUserQuota", 0, RangeValidator(0, 1048576)
+        )
         ## 是否允许睡眠
         self.Function_IfAllowSleep = ConfigItem(
             "Function", "IfAllowSleep", False, BoolValidator()
@@ -1723,6 +1748,14 @@ class GlobalConfig(ConfigBase):
         self.Function_IfBlockAd = ConfigItem(
             "Function", "IfBlockAd", False, BoolValidator()
         )
+        ## 脚本配置存储方式, 重启后生效
+        self.Function_ConfigStorage = ConfigItem(
+            "Function", "ConfigStorage", "File", OptionsValidator(["File", "Database"])
+        )
+        ## 历史日志存储格式
+        self.Function_HistoryCompression = ConfigItem(
+            "Function", "HistoryCompression", "None", OptionsValidator(["None", "Gzip"])
+        )
 
         ## Voice ------------------------------------------------------------
         ## 是否启用语音
@@ -1852,7 +1885,10 @@ class GlobalConfig(ConfigBase):
         )
         ## 关卡信息
         self.Data_Stage = ConfigItem(
-            "Data", "Stage", "-", VirtualConfigValidator(self.getStage)
+            "Data",
+            "Stage",
+            "-",
+            VirtualConfigValidator(self.getStage, minutely_cache_key),
         )
         ## 上次公告更新时间
         self.Data_LastNoticeUpdated = ConfigItem(
@@ -0,0 +1,1225 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2024-2025 DLmaster361
+#   Copyright © 2025 MoeSnowyFox
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+
+import io
+import re
+import csv
+import gzip
+import json
+import shutil
+import sqlite3
+import threading
+from itertools import islice
+from collections import deque
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Literal
+
+from app.utils import get_logger
+from app.utils.constants import UTC4
+
+logger = get_logger("历史记录索引")
+
+RESULT_KEYS = ("maa_result", "maaend_result", "src_result", "general_result")
+PERIODS = ("DAILY", "WEEKLY", "MONTHLY")
+# 汇总数据格式版本, 格式变化时重建全部汇总数据
+ROLLUP_VERSION = "1"
+# 清理历史记录时每批删除的记录数与批次间隔（秒）, 避免长时间占满磁盘 I/O
+HISTORY_CLEAN_BATCH = 20
+HISTORY_CLEAN_INTERVAL = 0.2
+# 日志行首的时间戳, 如 `[2025-09-26 10:00:00.123]`、`10:00:00`, 不纳入全文索引
+LOG_TIMESTAMP_RE = re.compile(
+    r"^\[?(?:\d{4}[-/]\d{2}[-/]\d{2}[ T])?\d{2}:\d{2}:\d{2}(?:[.,:]\d+)?\]?\s*"
+)
+
+
+def bucket_name(mode: Literal["DAILY", "WEEKLY", "MONTHLY"], day: date) -> str:
+    """获取日期在指定合并模式下所属的统计周期名称"""
+
+    if mode == "DAILY":
+        return day.strftime("%Y-%m-%d")
+    elif mode == "WEEKLY":
+        return day.strftime("%G-W%V")
+    elif mode == "MONTHLY":
+        return day.strftime("%Y-%m")
+    else:
+        raise ValueError("无效的合并模式")
+
+
+def bucket_range(
+    mode: Literal["DAILY", "WEEKLY", "MONTHLY"], day: date
+) -> tuple[date, date]:
+    """获取日期在指定合并模式下所属统计周期的首尾日期"""
+
+    if mode == "DAILY":
+        return day, day
+    elif mode == "WEEKLY":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    elif mode == "MONTHLY":
+        start = day.replace(day=1)
+        return start, (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    else:
+        raise ValueError("无效的合并模式")
+
+
+def empty_statistics() -> Dict[str, Any]:
+    """创建空的汇总统计数据"""
+
+    return {
+        "index": {},
+        "recruit_statistics": {},
+        "drop_statistics": {},
+        "error_info": {},
+    }
+
+
+def run_statistics(key: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将单次代理运行的统计数据转换为汇总统计数据
+
+    Args:
+        key (str): 形如 `<日期>/<用户名>/<时间>.json` 的索引键
+        data (Dict[str, Any]): 统计文件内容
+
+    Returns:
+        Dict[str, Any]: 汇总统计数据, 可通过 `merge_statistics` 与其他汇总数据合并
+    """
+
+    date_name, _, file_name = key.split("/")
+    run_time = f"{date_name} {Path(file_name).stem}"
+    statistics = empty_statistics()
+
+    statistics["recruit_statistics"] = dict(data.get("recruit_statistics", {}))
+    statistics["drop_statistics"] = {
+        stage: dict(drops) for stage, drops in data.get("drop_statistics", {}).items()
+    }
+
+    # 理智相关字段使用最后一次运行的值
+    if "sanity" in data or "sanity_full_at" in data:
+        statistics["sanity_at"] = run_time
+        for field in ("sanity", "sanity_full_at"):
+            if field in data:
+                statistics[field] = data[field]
+
+    for field in RESULT_KEYS:
+        if field not in data:
+            continue
+
+        actual_date = (
+            datetime.strptime(run_time, "%Y-%m-%d %H-%M-%S")
+            .replace(tzinfo=UTC4)
+            .astimezone()
+            .strftime("%Y-%m-%d %H:%M:%S")
+        )
+        if data[field] != "Success!":
+            statistics["error_info"][actual_date] = data[field]
+        statistics["index"][key] = {
+            "date": actual_date,
+            "status": "DONE" if data[field] == "Success!" else "ERROR",
+        }
+
+    return statistics
+
+
+def merge_statistics(total: Dict[str, Any], part: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将汇总统计数据合并至另一份汇总统计数据中, 合并结果与顺序无关
+
+    Args:
+        total (Dict[str, Any]): 被合并的汇总统计数据, 会被直接修改
+        part (Dict[str, Any]): 待合并的汇总统计数据
+
+    Returns:
+        Dict[str, Any]: 合并后的汇总统计数据
+    """
+
+    total["index"].update(part["index"])
+    total["error_info"].update(part["error_info"])
+
+    for star_level, count in part["recruit_statistics"].items():
+        total["recruit_statistics"][star_level] = (
+            total["recruit_statistics"].get(star_level, 0) + count
+        )
+
+    for stage, drops in part["drop_statistics"].items():
+        stage_drops = total["drop_statistics"].setdefault(stage, {})
+        for item, count in drops.items():
+            stage_drops[item] = stage_drops.get(item, 0) + count
+
+    if "sanity_at" in part and part["sanity_at"] >= total.get("sanity_at", ""):
+        for field in ("sanity_at", "sanity", "sanity_full_at"):
+            if field in part:
+                total[field] = part[field]
+
+    return total
+
+
+def export_statistics(total: Dict[str, Any], history_path: Path) -> Dict[str, Any]:
+    """
+    将汇总统计数据转换为 `merge_statistic_info` 的返回格式
+
+    Args:
+        total (Dict[str, Any]): 汇总统计数据
+        history_path (Path): 历史记录根目录, 用于还原统计文件路径
+
+    Returns:
+        Dict[str, Any]: 合并后的数据统计信息
+    """
+
+    data = {k: v for k, v in total.items() if k != "sanity_at"}
+    data["index"] = [
+        {**v, "jsonFile": str(history_path / k)}
+        for k, v in sorted(total["index"].items(), key=lambda x: x[1]["date"])
+    ]
+
+    # 确保返回的字典始终包含 index 字段，即使为空
+    result = {k: v for k, v in data.items() if v}
+    if "index" not in result:
+        result["index"] = []
+
+    return result
+
+
+EXPORT_FIELDS = (
+    "date",
+    "user",
+    "time",
+    "status",
+    "result",
+    "category",
+    "stage",
+    "item",
+    "count",
+)
+
+
+def export_rows(key: str, data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    将单次代理运行的统计数据展开为导出行
+
+    每次运行生成一行 `run` 记录, 每种公招星级生成一行 `recruit` 记录, 每个关卡的每种掉落物生成一行 `drop` 记录。
+    `date` 为历史记录所在日期目录, `time` 为换算至本地时区的运行时间, 与历史记录索引中的时间一致。
+
+    Args:
+        key (str): 形如 `<日期>/<用户名>/<时间>.json` 的索引键
+        data (Dict[str, Any]): 统计文件内容
+    """
+
+    date_name, user, file_name = key.split("/")
+    result = next((data[_] for _ in RESULT_KEYS if _ in data), "Success!")
+    base = {
+        "date": date_name,
+        "user": user,
+        "time": datetime.strptime(
+            f"{date_name} {Path(file_name).stem}", "%Y-%m-%d %H-%M-%S"
+        )
+        .replace(tzinfo=UTC4)
+        .astimezone()
+        .strftime("%Y-%m-%d %H:%M:%S"),
+        "status": "DONE" if result == "Success!" else "ERROR",
+        "result": result,
+    }
+
+    yield {**base, "category": "run", "stage": "", "item": "", "count": None}
+    for star, count in data.get("recruit_statistics", {}).items():
+        yield {**base, "category": "recruit", "stage": "", "item": star, "count": count}
+    for stage, drops in data.get("drop_statistics", {}).items():
+        for item, count in drops.items():
+            yield {
+                **base,
+                "category": "drop",
+                "stage": stage,
+                "item": item,
+                "count": count,
+            }
+
+
+def stream_export(
+    runs: Iterable[tuple[str, Dict[str, Any]]], fmt: Literal["NDJSON", "CSV"]
+) -> Iterator[str]:
+    """
+    逐条生成统计数据导出内容, 内存占用与历史记录数量无关
+
+    Args:
+        runs (Iterable[tuple[str, Dict[str, Any]]]): (索引键, 统计数据) 迭代器
+        fmt (Literal["NDJSON", "CSV"]): 导出格式
+
+    Yields:
+        str: 每次运行对应的导出文本块
+    """
+
+    if fmt == "NDJSON":
+        for key, data in runs:
+            yield "".join(
+                f"{json.dumps(row, ensure_ascii=False)}\n"
+                for row in export_rows(key, data)
+            )
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    # 带 BOM 以便 Excel 正确识别 UTF-8 编码
+    buffer.write("\ufeff")
+    writer.writeheader()
+    for key, data in runs:
+        writer.writerows(export_rows(key, data))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def compressed_path(log_path: Path) -> Path:
+    """获取历史日志对应的压缩文件路径"""
+
+    return log_path.with_name(f"{log_path.name}.gz")
+
+
+def write_history_log(log_path: Path, text: str, compress: bool) -> None:
+    """
+    写入历史日志, 并移除另一种格式的同名日志
+
+    Args:
+        log_path (Path): 日志文件路径
+        text (str): 日志内容
+        compress (bool): 是否以 gzip 格式压缩存储
+    """
+
+    if compress:
+        with gzip.open(compressed_path(log_path), "wt", encoding="utf-8") as f:
+            f.write(text)
+        log_path.unlink(missing_ok=True)
+    else:
+        log_path.write_text(text, encoding="utf-8")
+        compressed_path(log_path).unlink(missing_ok=True)
+
+
+def read_history_log(log_path: Path) -> str:
+    """读取历史日志, 日志已被压缩时透明解压"""
+
+    if log_path.exists():
+        return log_path.read_text(encoding="utf-8")
+    with gzip.open(compressed_path(log_path), "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+class HistoryLog:
+    """
+    历史日志分页读取
+
+    首次读取时构建行偏移索引并缓存于日志旁的 `.log.idx` 文件, 每 `INDEX_STEP` 行记录一次字节偏移,
+    读取任意行窗口时只需定位至最近的索引点, 无需读取整个日志。日志被修改或压缩后索引自动重建。
+    仅位于 `index_root` 目录下的日志会缓存索引, 其余日志每次读取时在内存中构建索引。
+    """
+
+    INDEX_STEP = 256
+
+    def __init__(self, log_path: Path, index_root: Optional[Path] = None):
+        """
+        Args:
+            log_path (Path): 日志文件路径, 日志已被压缩时自动读取对应的压缩文件
+            index_root (Optional[Path]): 允许缓存索引文件的目录, 为 None 时不缓存
+        """
+
+        self.source = log_path if log_path.exists() else compressed_path(log_path)
+        self.is_compressed = self.source != log_path
+        self.index_path = (
+            log_path.with_name(f"{log_path.name}.idx")
+            if index_root is not None
+            and log_path.resolve().is_relative_to(index_root.resolve())
+            else None
+        )
+        self.offsets, self.total = self._load_index()
+
+    def read(self, start: int, limit: int) -> List[tuple[int, str]]:
+        """
+        读取指定行窗口
+
+        Args:
+            start (int): 起始行号, 从 0 开始
+            limit (int): 最多读取的行数
+
+        Returns:
+            List[tuple[int, str]]: (行号, 日志内容) 列表
+        """
+
+        return list(islice(self._iter_from(start), limit))
+
+    def tail(self, limit: int) -> List[tuple[int, str]]:
+        """读取末尾的若干行"""
+
+        return self.read(max(0, self.total - limit), limit)
+
+    def grep(
+        self, keyword: str, start: int, limit: int
+    ) -> tuple[List[tuple[int, str]], Optional[int]]:
+        """
+        自指定行开始查找包含关键词的日志行
+
+        Args:
+            keyword (str): 关键词
+            start (int): 起始行号
+            limit (int): 最多返回的匹配行数
+
+        Returns:
+            tuple[List[tuple[int, str]], Optional[int]]: 匹配行列表与下一次查找的起始行号, 已查找至末尾时为 None
+        """
+
+        matches = []
+        for number, line in self._iter_from(start):
+            if len(matches) >= limit:
+                return matches, number
+            if keyword in line:
+                matches.append((number, line))
+        return matches, None
+
+    def grep_tail(self, keyword: str, limit: int) -> List[tuple[int, str]]:
+        """查找最后若干条包含关键词的日志行"""
+
+        return list(
+            deque(
+                (_ for _ in self._iter_from(0) if keyword in _[1]),
+                maxlen=limit,
+            )
+        )
+
+    def _open(self):
+
+        if self.is_compressed:
+            return gzip.open(self.source, "rb")
+        return self.source.open("rb")
+
+    def _iter_from(self, start: int):
+        """自指定行开始逐行读取, 调用方停止迭代时关闭文件"""
+
+        start = min(max(start, 0), self.total)
+        block = start // self.INDEX_STEP
+        if block >= len(self.offsets):
+            return
+
+        with self._open() as f:
+            f.seek(self.offsets[block])
+            number = block * self.INDEX_STEP
+            for bline in f:
+                if number >= start:
+                    yield number, bline.decode("utf-8", errors="replace").rstrip("\r\n")
+                number += 1
+
+    def _load_index(self) -> tuple[List[int], int]:
+        """读取缓存的行偏移索引, 缓存失效时重新构建"""
+
+        stat = self.source.stat()
+        signature = [self.source.name, stat.st_size, stat.st_mtime_ns, self.INDEX_STEP]
+
+        if self.index_path is not None:
+            try:
+                index = json.loads(self.index_path.read_text(encoding="utf-8"))
+                if index["signature"] == signature:
+                    return index["offsets"], index["total"]
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        offsets = []
+        total = 0
+        position = 0
+        with self._open() as f:
+            for bline in f:
+                if total % self.INDEX_STEP == 0:
+                    offsets.append(position)
+                position += len(bline)
+                total += 1
+
+        if self.index_path is None:
+            return offsets, total
+
+        try:
+            self.index_path.write_text(
+                json.dumps(
+                    {"signature": signature, "total": total, "offsets": offsets}
+                ),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            logger.warning(f"无法缓存日志索引: {self.index_path}, 错误信息: {e}")
+
+        return offsets, total
+
+
+def log_document(lines: Iterable[str]) -> str:
+    """
+    生成日志的全文索引文档
+
+    去除行首时间戳后对日志行去重, 大量重复的识别、等待日志只保留一份, 索引体积远小于日志本身。
+    索引仅用于筛选候选记录, 匹配行号与内容以日志原文为准。
+    """
+
+    seen = dict.fromkeys(
+        LOG_TIMESTAMP_RE.sub("", line.rstrip("\r\n")) for line in lines
+    )
+    seen.pop("", None)
+    return "\n".join(seen)
+
+
+def compress_history_logs(history_path: Path, skip_dates: Iterable[str] = ()) -> int:
+    """
+    压缩历史记录目录中尚未压缩的日志
+
+    Args:
+        history_path (Path): 历史记录根目录
+        skip_dates (Iterable[str]): 跳过的日期目录, 避免处理可能仍在写入的日志
+
+    Returns:
+        int: 节省的磁盘空间字节数
+    """
+
+    skip_dates = set(skip_dates)
+    saved = 0
+
+    for log_path in history_path.glob("*/*/*.log"):
+        if log_path.parent.parent.name in skip_dates:
+            continue
+
+        target = compressed_path(log_path)
+        temp = target.with_name(f"{target.name}.tmp")
+        try:
+            with log_path.open("rb") as src, gzip.open(temp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            temp.replace(target)
+            saved += log_path.stat().st_size - target.stat().st_size
+            log_path.unlink()
+        except OSError as e:
+            logger.warning(f"压缩日志失败: {log_path}, 错误信息: {e}")
+            temp.unlink(missing_ok=True)
+
+    return saved
+
+
+def run_files(json_file: Path) -> List[Path]:
+    """获取单次代理运行产生的全部文件路径, 包括统计文件、日志、压缩日志与日志索引"""
+
+    log_path = json_file.with_suffix(".log")
+    return [
+        json_file,
+        log_path,
+        compressed_path(log_path),
+        log_path.with_name(f"{log_path.name}.idx"),
+    ]
+
+
+def run_size(json_file: Path) -> int:
+    """统计单次代理运行产生的文件占用的字节数"""
+
+    size = 0
+    for file in run_files(json_file):
+        try:
+            size += file.stat().st_size
+        except OSError:
+            pass
+    return size
+
+
+def remove_run_files(json_file: Path) -> int:
+    """
+    删除单次代理运行产生的全部文件, 所在目录为空时一并删除
+
+    Returns:
+        int: 释放的字节数
+    """
+
+    reclaimed = 0
+    for file in run_files(json_file):
+        try:
+            size = file.stat().st_size
+            file.unlink()
+            reclaimed += size
+        except OSError:
+            pass
+
+    for folder in (json_file.parent, json_file.parent.parent):
+        try:
+            folder.rmdir()
+        except OSError:
+            break
+    return reclaimed
+
+
+def remove_history_folder(folder: Path) -> int:
+    """
+    删除历史记录目录
+
+    Returns:
+        int: 释放的字节数
+    """
+
+    reclaimed = 0
+    for file in folder.rglob("*"):
+        try:
+            if file.is_file():
+                reclaimed += file.stat().st_size
+        except OSError:
+            pass
+    shutil.rmtree(folder, ignore_errors=True)
+    return reclaimed
+
+
+def plan_eviction(
+    runs: List[tuple[str, str, int]],
+    total_quota: int,
+    user_quota: int,
+    protected_dates: Iterable[str] = (),
+) -> List[str]:
+    """
+    按容量配额选出需要删除的运行记录, 先按单用户配额删除各用户最早的记录, 再按总配额删除全局最早的记录
+
+    Args:
+        runs (List[tuple[str, str, int]]): 按时间排序的 (索引键, 用户名, 占用字节数) 列表
+        total_quota (int): 总容量配额字节数, 为 0 时不限制
+        user_quota (int): 单用户容量配额字节数, 为 0 时不限制
+        protected_dates (Iterable[str]): 不可删除的日期, 其中记录的容量仍计入配额
+
+    Returns:
+        List[str]: 按时间排序的待删除索引键列表
+    """
+
+    protected_dates = set(protected_dates)
+    evicted = set()
+
+    if user_quota:
+        usage: Dict[str, int] = {}
+        for _, user, size in runs:
+            usage[user] = usage.get(user, 0) + size
+        for key, user, size in runs:
+            if usage[user] > user_quota and key.split("/")[0] not in protected_dates:
+                evicted.add(key)
+                usage[user] -= size
+
+    if total_quota:
+        total = sum(size for key, _, size in runs if key not in evicted)
+        for key, _, size in runs:
+            if total <= total_quota:
+                break
+            if key in evicted or key.split("/")[0] in protected_dates:
+                continue
+            evicted.add(key)
+            total -= size
+
+    return [key for key, _, _ in runs if key in evicted]
+
+
+class HistoryDatabase:
+    """
+    历史记录索引
+
+    每次代理运行的统计数据以 `<日期>/<用户名>/<时间>.json` 相对路径为主键存储于 `history_run` 表,
+    按日期、用户、状态的范围查询无需遍历 `history` 目录或读取 JSON 文件。
+    各用户按日、周、月合并的统计数据存储于 `history_rollup` 表, 在写入运行记录时同步更新。
+    日志的全文索引存储于 `history_log_fts` 表, 由 `history_log` 表记录其对应的运行记录。
+    """
+
+    def __init__(self, path: Path, history_path: Path):
+        """
+        Args:
+            path (Path): 索引数据库文件路径, 如果不存在则会创建
+            history_path (Path): 历史记录根目录
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.history_path = history_path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS history_run("
+                "path TEXT PRIMARY KEY, date TEXT NOT NULL, user TEXT NOT NULL, "
+                "time TEXT NOT NULL, status TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS history_run_date "
+                "ON history_run(date, user)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS history_rollup("
+                "period TEXT NOT NULL, bucket TEXT NOT NULL, user TEXT NOT NULL, "
+                "data TEXT NOT NULL, PRIMARY KEY(period, bucket, user))"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS history_meta("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS history_log("
+                "id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, "
+                "date TEXT NOT NULL, user TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS history_log_date "
+                "ON history_log(date, user)"
+            )
+            try:
+                # trigram 分词支持中文与任意子串匹配, 需要 SQLite 3.34 及以上版本
+                self.connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS history_log_fts "
+                    "USING fts5(content, tokenize='trigram')"
+                )
+                self.trigram = True
+            except sqlite3.OperationalError:
+                self.connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS history_log_fts "
+                    "USING fts5(content)"
+                )
+                self.trigram = False
+
+    def relative_key(self, json_file: Path) -> Optional[str]:
+        """获取统计文件相对于历史记录根目录的索引键, 不在根目录下时返回 None"""
+
+        user_folder = json_file.parent
+        date_folder = user_folder.parent
+        if date_folder.parent != self.history_path:
+            return None
+        return f"{date_folder.name}/{user_folder.name}/{json_file.name}"
+
+    def add(self, json_file: Path, data: Dict[str, Any]) -> None:
+        """
+        记录一次代理运行的统计数据并更新所属周期的汇总数据, 同一文件重复记录时覆盖
+
+        Args:
+            json_file (Path): 统计数据文件路径
+            data (Dict[str, Any]): 统计数据
+        """
+
+        key = self.relative_key(json_file)
+        if key is None:
+            return
+        row = self._row(key, data)
+        day = date.fromisoformat(row[1])
+
+        with self._lock, self.connection:
+            existed = self.connection.execute(
+                "SELECT 1 FROM history_run WHERE path = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO history_run(path, date, user, time, status, data) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                row,
+            )
+
+            # 覆盖已有记录时无法扣除旧数据, 重新汇总所属周期
+            if existed:
+                self._rebuild_rollups(row[2], day)
+                return
+
+            part = run_statistics(key, data)
+            for period in PERIODS:
+                bucket = bucket_name(period, day)
+                stored = self.connection.execute(
+                    "SELECT data FROM history_rollup "
+                    "WHERE period = ? AND bucket = ? AND user = ?",
+                    (period, bucket, row[2]),
+                ).fetchone()
+                total = json.loads(stored[0]) if stored else empty_statistics()
+                self._set_rollup(period, bucket, row[2], merge_statistics(total, part))
+
+    def index_log(self, json_file: Path, lines: Iterable[str]) -> None:
+        """
+        将一次代理运行的日志写入全文索引, 同一文件重复写入时覆盖
+
+        Args:
+            json_file (Path): 统计数据文件路径
+            lines (Iterable[str]): 日志内容
+        """
+
+        key = self.relative_key(json_file)
+        if key is None:
+            return
+        document = log_document(lines)
+        date_name, user, _ = key.split("/")
+
+        with self._lock, self.connection:
+            stored = self.connection.execute(
+                "SELECT id FROM history_log WHERE path = ?", (key,)
+            ).fetchone()
+            if stored:
+                log_id = stored[0]
+                self.connection.execute(
+                    "DELETE FROM history_log_fts WHERE rowid = ?", (log_id,)
+                )
+            else:
+                log_id = self.connection.execute(
+                    "INSERT INTO history_log(path, date, user) VALUES(?, ?, ?)",
+                    (key, date_name, user),
+                ).lastrowid
+            self.connection.execute(
+                "INSERT INTO history_log_fts(rowid, content) VALUES(?, ?)",
+                (log_id, document),
+            )
+
+    def index_pending_logs(self) -> int:
+        """
+        为尚未建立全文索引的运行记录补建索引, 每条记录单独加锁, 不会长时间阻塞新记录写入
+
+        Returns:
+            int: 新建索引的记录数量
+        """
+
+        with self._lock:
+            keys = [
+                _[0]
+                for _ in self.connection.execute(
+                    "SELECT r.path FROM history_run r "
+                    "LEFT JOIN history_log l ON l.path = r.path "
+                    "WHERE l.path IS NULL"
+                )
+            ]
+
+        for key in keys:
+            log_path = (self.history_path / key).with_suffix(".log")
+            try:
+                text = read_history_log(log_path)
+            except OSError:
+                # 日志缺失时写入空文档, 避免每次重复尝试
+                text = ""
+            except Exception as e:
+                logger.warning(
+                    f"无法读取日志 {log_path}, 错误信息: {type(e).__name__}: {str(e)}"
+                )
+                text = ""
+            self.index_log(self.history_path / key, text.splitlines())
+
+        return len(keys)
+
+    def search_logs(
+        self,
+        keyword: str,
+        start_date: date,
+        end_date: date,
+        users: Optional[Iterable[str]] = None,
+        limit: int = 50,
+    ) -> List[tuple[str, str, str]]:
+        """
+        在全文索引中查找日志包含关键词的运行记录
+
+        由于索引不含时间戳且不区分大小写, 结果为候选记录, 需以日志原文确认匹配行。
+        不少于 3 个字符的关键词通过 trigram 索引匹配, 更短的关键词只能逐条扫描索引内容。
+
+        Args:
+            keyword (str): 关键词
+            start_date (date): 开始日期
+            end_date (date): 结束日期
+            users (Optional[Iterable[str]]): 仅查询指定用户
+            limit (int): 最多返回的记录数
+
+        Returns:
+            List[tuple[str, str, str]]: 按时间倒序排列的 (日期, 用户名, 索引键) 列表
+        """
+
+        if self.trigram and len(keyword) >= 3:
+            condition = "history_log_fts MATCH ?"
+            term = '"' + keyword.replace('"', '""') + '"'
+        else:
+            condition = "content LIKE ? ESCAPE '\\'"
+            pattern = (
+                keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            )
+            term = f"%{pattern}%"
+        sql = (
+            "SELECT date, user, path FROM history_log "
+            f"WHERE id IN (SELECT rowid FROM history_log_fts WHERE {condition}) "
+            "AND date BETWEEN ? AND ?"
+        )
+        params: List[Any] = [term, start_date.isoformat(), end_date.isoformat()]
+        if users is not None:
+            users = list(users)
+            sql += f" AND user IN ({', '.join('?' * len(users))})"
+            params += users
+        sql += " ORDER BY path DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def search(
+        self,
+        start_date: date,
+        end_date: date,
+        users: Optional[Iterable[str]] = None,
+        status: Optional[Literal["DONE", "ERROR"]] = None,
+    ) -> List[tuple[str, str, str]]:
+        """
+        按日期范围查询代理运行记录
+
+        Args:
+            start_date (date): 开始日期
+            end_date (date): 结束日期
+            users (Optional[Iterable[str]]): 仅查询指定用户
+            status (Optional[Literal["DONE", "ERROR"]]): 仅查询指定状态
+
+        Returns:
+            List[tuple[str, str, str]]: 按时间排序的 (日期, 用户名, 索引键) 列表
+        """
+
+        sql = "SELECT date, user, path FROM history_run WHERE date BETWEEN ? AND ?"
+        params: List[Any] = [start_date.isoformat(), end_date.isoformat()]
+        if users is not None:
+            users = list(users)
+            sql += f" AND user IN ({', '.join('?' * len(users))})"
+            params += users
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY date, user, time"
+
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def iter_runs(
+        self,
+        start_date: date,
+        end_date: date,
+        users: Optional[Iterable[str]] = None,
+        batch: int = 500,
+    ) -> Iterator[tuple[str, Dict[str, Any]]]:
+        """
+        按时间顺序分批读取运行记录的统计数据, 每批单独加锁, 迭代期间不会阻塞新记录写入
+
+        Args:
+            start_date (date): 开始日期
+            end_date (date): 结束日期
+            users (Optional[Iterable[str]]): 仅读取指定用户
+            batch (int): 每批读取的记录数
+
+        Yields:
+            tuple[str, Dict[str, Any]]: (索引键, 统计数据)
+        """
+
+        # 索引键以日期开头, 按索引键排序即按日期、用户、时间排序, 可直接作为分页游标
+        sql = (
+            "SELECT path, data FROM history_run "
+            "WHERE date BETWEEN ? AND ? AND path > ?"
+        )
+        params: List[Any] = [start_date.isoformat(), end_date.isoformat()]
+        if users is not None:
+            users = list(users)
+            sql += f" AND user IN ({', '.join('?' * len(users))})"
+            params += users
+        sql += " ORDER BY path LIMIT ?"
+
+        cursor = ""
+        while True:
+            with self._lock:
+                rows = self.connection.execute(
+                    sql, [params[0], params[1], cursor, *params[2:], batch]
+                ).fetchall()
+            for key, data in rows:
+                yield key, json.loads(data)
+            if len(rows) < batch:
+                return
+            cursor = rows[-1][0]
+
+    def get_data(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取指定索引键对应的统计数据, 不存在的键不会出现在结果中"""
+
+        result: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            # 分批查询, 避免超出 SQLite 参数数量限制
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                for key, data in self.connection.execute(
+                    f"SELECT path, data FROM history_run "
+                    f"WHERE path IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ):
+                    result[key] = json.loads(data)
+        return result
+
+    def get_statistics(
+        self,
+        mode: Literal["DAILY", "WEEKLY", "MONTHLY"],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        获取指定时间范围内各周期各用户的汇总统计数据
+
+        完整落在范围内的周期直接读取汇总数据, 仅部分落在范围内的首尾周期由其中各日的汇总数据合并得到。
+
+        Args:
+            mode (Literal["DAILY", "WEEKLY", "MONTHLY"]): 合并模式
+            start_date (date): 开始日期
+            end_date (date): 结束日期
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: 格式为 { '周期': { '用户名': 汇总统计数据 } }
+        """
+
+        full_buckets = []
+        partial_ranges = []
+        day = start_date
+        while day <= end_date:
+            first, last = bucket_range(mode, day)
+            if first >= start_date and last <= end_date:
+                full_buckets.append(bucket_name(mode, day))
+            else:
+                partial_ranges.append((max(first, start_date), min(last, end_date)))
+            day = last + timedelta(days=1)
+
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for i in range(0, len(full_buckets), 500):
+                batch = full_buckets[i : i + 500]
+                for bucket, user, data in self.connection.execute(
+                    f"SELECT bucket, user, data FROM history_rollup "
+                    f"WHERE period = ? AND bucket IN ({', '.join('?' * len(batch))})",
+                    [mode, *batch],
+                ):
+                    result.setdefault(bucket, {})[user] = json.loads(data)
+
+            for first, last in partial_ranges:
+                bucket = bucket_name(mode, first)
+                for user, data in self.connection.execute(
+                    "SELECT user, data FROM history_rollup "
+                    "WHERE period = 'DAILY' AND bucket BETWEEN ? AND ?",
+                    (first.isoformat(), last.isoformat()),
+                ):
+                    users = result.setdefault(bucket, {})
+                    users[user] = merge_statistics(
+                        users.get(user, empty_statistics()), json.loads(data)
+                    )
+
+        return result
+
+    def remove_dates(self, *dates: str) -> None:
+        """删除指定日期的全部索引, 并更新所属周期的汇总数据"""
+
+        with self._lock, self.connection:
+            affected = set()
+            for date_name in dates:
+                affected.update(
+                    self.connection.execute(
+                        "SELECT DISTINCT user, date FROM history_run WHERE date = ?",
+                        (date_name,),
+                    ).fetchall()
+                )
+                self.connection.execute(
+                    "DELETE FROM history_run WHERE date = ?", (date_name,)
+                )
+                self.connection.execute(
+                    "DELETE FROM history_log_fts WHERE rowid IN "
+                    "(SELECT id FROM history_log WHERE date = ?)",
+                    (date_name,),
+                )
+                self.connection.execute(
+                    "DELETE FROM history_log WHERE date = ?", (date_name,)
+                )
+
+            for user, date_name in affected:
+                self._rebuild_rollups(user, date.fromisoformat(date_name))
+
+    def remove_runs(self, keys: Iterable[str]) -> None:
+        """删除指定运行记录的全部索引, 并更新所属周期的汇总数据"""
+
+        with self._lock, self.connection:
+            affected = set()
+            for key in keys:
+                date_name, user, _ = key.split("/")
+                affected.add((user, date_name))
+                self.connection.execute(
+                    "DELETE FROM history_run WHERE path = ?", (key,)
+                )
+                self.connection.execute(
+                    "DELETE FROM history_log_fts WHERE rowid IN "
+                    "(SELECT id FROM history_log WHERE path = ?)",
+                    (key,),
+                )
+                self.connection.execute(
+                    "DELETE FROM history_log WHERE path = ?", (key,)
+                )
+
+            for user, date_name in affected:
+                self._rebuild_rollups(user, date.fromisoformat(date_name))
+
+    def backfill(self) -> int:
+        """
+        将索引与历史记录目录同步, 于启动时调用
+
+        比对目录中的运行记录与已有索引, 为在程序之外新增或恢复的记录补建索引,
+        并移除已在程序之外删除的记录; 首次启动时即为完整构建。日志全文索引由 `index_pending_logs` 补建。
+
+        Returns:
+            int: 新建索引的记录数量
+        """
+
+        on_disk = self._list_runs()
+        with self._lock:
+            indexed = {
+                _[0] for _ in self.connection.execute("SELECT path FROM history_run")
+            }
+
+        removed = indexed - on_disk
+        if removed:
+            self.remove_runs(removed)
+        rows = self._read_rows(sorted(on_disk - indexed))
+
+        with self._lock, self.connection:
+            # 同步期间新写入的记录更新, 不应被旧文件内容覆盖
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO history_run"
+                "(path, date, user, time, status, data) VALUES(?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+            rollup_version = self.connection.execute(
+                "SELECT value FROM history_meta WHERE key = 'rollup_version'"
+            ).fetchone()
+            if rollup_version != (ROLLUP_VERSION,):
+                self._rebuild_all_rollups()
+            else:
+                for user, date_name in {(_[2], _[1]) for _ in rows}:
+                    self._rebuild_rollups(user, date.fromisoformat(date_name))
+
+        if removed:
+            logger.info(f"已移除 {len(removed)} 条文件已不存在的历史记录索引")
+        return len(rows)
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+
+        with self._lock:
+            self.connection.close()
+
+    def _list_runs(self) -> set[str]:
+        """列出历史记录目录中全部运行记录的索引键"""
+
+        keys = set()
+        for date_folder in self.history_path.iterdir():
+            if not date_folder.is_dir():
+                continue
+            try:
+                datetime.strptime(date_folder.name, "%Y-%m-%d")
+            except ValueError:
+                continue
+
+            for user_folder in date_folder.iterdir():
+                if not user_folder.is_dir():
+                    continue
+                for json_file in user_folder.glob("*.json"):
+                    try:
+                        datetime.strptime(json_file.stem, "%H-%M-%S")
+                    except ValueError:
+                        continue
+                    keys.add(f"{date_folder.name}/{user_folder.name}/{json_file.name}")
+        return keys
+
+    def _read_rows(
+        self, keys: Iterable[str]
+    ) -> List[tuple[str, str, str, str, str, str]]:
+        """读取指定运行记录的统计文件, 生成索引行"""
+
+        rows = []
+        for key in keys:
+            json_file = self.history_path / key
+            try:
+                data = json.loads(json_file.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning(
+                    f"无法解析文件 {json_file}, 错误信息: {type(e).__name__}: {str(e)}"
+                )
+                continue
+            rows.append(self._row(key, data))
+        return rows
+
+    def _set_rollup(
+        self, period: str, bucket: str, user: str, total: Dict[str, Any]
+    ) -> None:
+        """写入汇总数据, 需在持有锁的事务内调用"""
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO history_rollup(period, bucket, user, data) "
+            "VALUES(?, ?, ?, ?)",
+            (period, bucket, user, json.dumps(total, ensure_ascii=False)),
+        )
+
+    def _rebuild_rollups(self, user: str, day: date) -> None:
+        """由运行记录重新汇总指定用户在指定日期所属各周期的数据, 需在持有锁的事务内调用"""
+
+        for period in PERIODS:
+            first, last = bucket_range(period, day)
+            bucket = bucket_name(period, day)
+            total = empty_statistics()
+            for key, data in self.connection.execute(
+                "SELECT path, data FROM history_run "
+                "WHERE user = ? AND date BETWEEN ? AND ?",
+                (user, first.isoformat(), last.isoformat()),
+            ):
+                merge_statistics(total, run_statistics(key, json.loads(data)))
+
+            if any(total.values()):
+                self._set_rollup(period, bucket, user, total)
+            else:
+                self.connection.execute(
+                    "DELETE FROM history_rollup "
+                    "WHERE period = ? AND bucket = ? AND user = ?",
+                    (period, bucket, user),
+                )
+
+    def _rebuild_all_rollups(self) -> None:
+        """由全部运行记录重建汇总数据, 需在持有锁的事务内调用"""
+
+        rollups: Dict[tuple[str, str, str], Dict[str, Any]] = {}
+        for key, date_name, user, data in self.connection.execute(
+            "SELECT path, date, user, data FROM history_run"
+        ):
+            part = run_statistics(key, json.loads(data))
+            day = date.fromisoformat(date_name)
+            for period in PERIODS:
+                rollup_key = (period, bucket_name(period, day), user)
+                merge_statistics(
+                    rollups.setdefault(rollup_key, empty_statistics()), part
+                )
+
+        self.connection.execute("DELETE FROM history_rollup")
+        for (period, bucket, user), total in rollups.items():
+            self._set_rollup(period, bucket, user, total)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO history_meta(key, value) "
+            "VALUES('rollup_version', ?)",
+            (ROLLUP_VERSION,),
+        )
+
+    @staticmethod
+    def _row(key: str, data: Dict[str, Any]) -> tuple[str, str, str, str, str, str]:
+        """生成索引行, 状态由运行结果字段判断, 与 `merge_statistic_info` 一致"""
+
+        date_name, user, file_name = key.split("/")
+        result = next((data[_] for _ in RESULT_KEYS if _ in data), "Success!")
+        return (
+            key,
+            date_name,
+            user,
+            Path(file_name).stem,
+            "DONE" if result == "Success!" else "ERROR",
+            json.dumps(data, ensure_ascii=False),
+        )
@@ -162,12 +162,32 @@ class GlobalConfig_Function(BaseModel):
     HistoryRetentionTime: Optional[Literal[7, 15, 30, 60, 90, 180, 365, 0]] = Field(
         None, description="历史记录保留时间, 0表示永久保存"
     )
+    HistoryQuota: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=1048576,
+        description="历史记录总容量上限, 单位MB, 超出时删除最早的记录, 0表示不限制",
+    )
+    HistoryUserQuota: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=1048576,
+        description="单个用户历史记录容量上限, 单位MB, 超出时删除该用户最早的记录, 0表示不限制",
+    )
     IfAllowSleep: Optional[bool] = Field(default=None, description="允许休眠")
     IfSilence: Optional[bool] = Field(default=None, description="静默模式")
     IfAgreeBilibili: Optional[bool] = Field(
         default=None, description="同意哔哩哔哩用户协议"
     )
     IfBlockAd: Optional[bool] = Field(default=None, description="屏蔽模拟器广告")
+    ConfigStorage: Optional[Literal["File", "Database"]] = Field(
+        default=None,
+        description="脚本配置存储方式, File为分片文件, Database为数据库, 重启后生效",
+    )
+    HistoryCompression: Optional[Literal["None", "Gzip"]] = Field(
+        default=None,
+        description="历史日志存储格式, None为纯文本, Gzip为压缩存储并在后台压缩已有日志",
+    )
 
 
 class GlobalConfig_Voice(BaseModel):
@@ -1329,6 +1349,92 @@ class HistoryDataGetOut(OutBase):
     data: HistoryData = Field(..., description="历史记录数据")
 
 
+class HistoryLogGetIn(BaseModel):
+    jsonPath: str = Field(..., description="需要提取日志的历史记录JSON文件")
+    mode: Literal["RANGE", "TAIL"] = Field(
+        default="RANGE",
+        description="读取模式, RANGE为自起始行读取, TAIL为读取末尾若干行",
+    )
+    start: int = Field(
+        default=0, ge=0, description="起始行号, 从0开始, 仅RANGE模式有效"
+    )
+    limit: int = Field(default=500, ge=1, le=10000, description="最多返回的行数")
+    keyword: Optional[str] = Field(
+        default=None, description="仅返回包含该关键词的日志行, 为空时不过滤"
+    )
+
+
+class HistoryLogLine(BaseModel):
+    line: int = Field(..., description="行号, 从0开始")
+    content: str = Field(..., description="日志内容")
+
+
+class HistoryLogPage(BaseModel):
+    total: int = Field(..., description="日志总行数")
+    lines: List[HistoryLogLine] = Field(..., description="日志行列表")
+    next: Optional[int] = Field(
+        default=None, description="下一页的起始行号, 已读取至末尾时为空"
+    )
+
+
+class HistoryLogGetOut(OutBase):
+    data: HistoryLogPage = Field(..., description="历史日志分页数据")
+
+
+class HistoryExportIn(BaseModel):
+    start_date: str = Field(..., description="开始日期, 格式YYYY-MM-DD")
+    end_date: str = Field(..., description="结束日期, 格式YYYY-MM-DD")
+    users: Optional[List[str]] = Field(
+        default=None, description="仅导出指定用户, 为空时导出全部用户"
+    )
+    format: Literal["NDJSON", "CSV"] = Field(
+        default="NDJSON",
+        description="导出格式, NDJSON为每行一个JSON对象, CSV为逗号分隔表格",
+    )
+
+
+class HistoryRetentionReport(BaseModel):
+    time: Optional[str] = Field(
+        default=None, description="最近一次清理完成时间, 尚未清理时为空"
+    )
+    reclaimed: int = Field(default=0, description="最近一次清理释放的字节数")
+    removed_dates: int = Field(default=0, description="因超过保留时间删除的日期目录数")
+    removed_runs: int = Field(default=0, description="因超出容量配额删除的记录数")
+    total_size: Optional[int] = Field(
+        default=None, description="清理后历史记录占用的字节数, 未启用容量配额时为空"
+    )
+
+
+class HistoryRetentionOut(OutBase):
+    data: HistoryRetentionReport = Field(..., description="历史记录清理报告")
+
+
+class HistoryLogSearchIn(BaseModel):
+    keyword: str = Field(..., min_length=1, description="需要搜索的关键词")
+    start_date: str = Field(..., description="开始日期, 格式YYYY-MM-DD")
+    end_date: str = Field(..., description="结束日期, 格式YYYY-MM-DD")
+    users: Optional[List[str]] = Field(
+        default=None, description="仅搜索指定用户, 为空时搜索全部用户"
+    )
+    limit: int = Field(default=50, ge=1, le=500, description="最多返回的记录数")
+    line_limit: int = Field(
+        default=20, ge=1, le=1000, description="每条记录最多返回的匹配行数"
+    )
+
+
+class HistoryLogSearchItem(BaseModel):
+    date: str = Field(..., description="日期")
+    user: str = Field(..., description="用户名")
+    jsonFile: str = Field(..., description="对应JSON文件")
+    lines: List[HistoryLogLine] = Field(..., description="匹配的日志行列表")
+
+
+class HistoryLogSearchOut(OutBase):
+    data: List[HistoryLogSearchItem] = Field(
+        ..., description="日志包含关键词的历史记录, 按时间倒序排列"
+    )
+
+
 class ToolsGetOut(OutBase):
     data: ToolsConfig = Field(..., description="工具配置数据")
 
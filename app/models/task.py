@@ -27,12 +27,62 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import List, Optional, Literal
 
+from app.utils import LogMatcher, LogUpdate, MaaLogParser
+
 
 @dataclass
 class LogRecord:
 
     content: list[str] = field(default_factory=list)
     status: str = "未开始监看日志"
+    parser: Optional[MaaLogParser] = None  # 日志统计解析器, 随日志更新增量解析
+    _parsed_count: int = 0  # 已送入解析器的日志行数
+    _parsed_tail: Optional[str] = None  # 已送入解析器的最后一行日志
+    matcher: Optional[LogMatcher] = None  # 日志特征匹配器, 随日志更新增量匹配
+
+    def update(self, log_update: LogUpdate) -> bool:
+        """
+        应用日志监控器的增量更新, 日志内容直接引用监控器的累计日志, 不做复制
+
+        Returns:
+            bool: 日志内容是否发生变化
+        """
+
+        self.content = log_update.contents
+        if log_update.reset:
+            if self.matcher is not None:
+                self.matcher.reset()
+        elif not log_update.lines:
+            return False
+
+        if self.matcher is not None:
+            self.matcher.feed(log_update.lines)
+        return True
+
+    def parse(self) -> Optional[MaaLogParser]:
+        """
+        将尚未解析的日志送入统计解析器, 日志内容被整体替换时重新解析
+
+        Returns:
+            Optional[MaaLogParser]: 已解析至最新日志的统计解析器, 未设置解析器时返回 None
+        """
+
+        if self.parser is None:
+            return None
+
+        if self._parsed_count > len(self.content) or (
+            self._parsed_count > 0
+            and self.content[self._parsed_count - 1] is not self._parsed_tail
+        ):
+            self.parser = type(self.parser)()
+            self._parsed_count = 0
+
+        if self._parsed_count < len(self.content):
+            self.parser.feed(self.content[self._parsed_count :])
+            self._parsed_count = len(self.content)
+            self._parsed_tail = self.content[-1]
+
+        return self.parser
 
 
 @dataclass
@@ -75,7 +125,8 @@ class ScriptItem:
     status: str  # 脚本执行状态
     user_list: List[UserItem] = field(default_factory=list)  # 用户信息列表
     current_index: int = -1  # 当前执行的用户索引，-1 表示未开始
-    log: str = ""  # 脚本执行日志
+    _log_chunks: list[str] = field(default_factory=list)  # 脚本执行日志片段
+    _log_length: int = 0  # 脚本执行日志的总字符数
     _task_item_ref: Optional[weakref.ReferenceType[TaskItem]] = None
 
     def __setattr__(self, name, value):
@@ -86,9 +137,45 @@ class ScriptItem:
             for user in self.user_list:
                 object.__setattr__(user, "_task_item_ref", self._task_item_ref)
 
-        if name not in ("_task_item_ref",) and self.task_info is not None:
+        if (
+            name not in ("_task_item_ref", "_log_chunks", "_log_length")
+            and self.task_info is not None
+        ):
             asyncio.create_task(self.task_info.on_change())
 
+    @property
+    def log(self) -> str:
+        """脚本执行日志, 追加的片段在读取时才合并"""
+
+        if len(self._log_chunks) > 1:
+            object.__setattr__(self, "_log_chunks", ["".join(self._log_chunks)])
+        return self._log_chunks[0] if self._log_chunks else ""
+
+    @log.setter
+    def log(self, value: str) -> None:
+        object.__setattr__(self, "_log_chunks", [value])
+        object.__setattr__(self, "_log_length", len(value))
+
+    def append_log(self, text: str) -> None:
+        """追加脚本执行日志, 仅通知新增的部分"""
+
+        if not text:
+            return
+
+        offset = self._log_length
+        self._log_chunks.append(text)
+        object.__setattr__(self, "_log_length", offset + len(text))
+        if self.task_info is not None:
+            asyncio.create_task(self.task_info.on_log_append(self, text, offset))
+
+    def update_log(self, log_update: LogUpdate) -> None:
+        """根据日志监控器的增量更新同步脚本执行日志"""
+
+        if log_update.reset:
+            self.log = "".join(log_update.contents)
+        else:
+            self.append_log("".join(log_update.lines))
+
     @property
     def task_info(self) -> Optional[TaskItem]:
         """返回绑定到此 ScriptItem 的父 TaskItem"""
@@ -138,6 +225,10 @@ class TaskItem(ABC):
         """统一回调入口"""
         raise NotImplementedError("子类必须实现 on_change")
 
+    async def on_log_append(self, script_item: ScriptItem, text: str, offset: int):
+        """脚本日志追加回调, 默认按整体变化处理"""
+        await self.on_change()
+
     @property
     def asdict(self) -> list:
         """将 TaskItem 转换为字典形式"""
@@ -33,6 +33,7 @@ from pathlib import Path
 from typing import Literal, Optional
 
 from app.core import Config
+from app.models import ConfigSaver
 from app.utils import ProcessRunner, get_logger
 
 logger = get_logger("系统服务")
@@ -203,6 +204,13 @@ class _SystemHandler:
         :param mode: 电源操作
         """
 
+        # 执行电源操作前写入尚未落盘的配置
+        if mode != "NoAction":
+            try:
+                await ConfigSaver.flush()
+            except RuntimeError as e:
+                logger.error(f"执行电源操作前写入配置失败, 未写入的修改可能丢失: {e}")
+
         if sys.platform.startswith("win"):
 
             if mode == "NoAction":
@@ -34,12 +34,20 @@ from app.models.config import MaaConfig, MaaUserConfig
 from app.models.emulator import DeviceInfo, DeviceBase
 from app.services import Notify, System
 from app.tools import skland_sign_in
-from app.utils import get_logger, LogMonitor, ProcessManager
+from app.utils import (
+    get_logger,
+    LogMatcher,
+    LogMonitor,
+    LogUpdate,
+    MaaLogParser,
+    ProcessManager,
+)
 from app.utils.constants import (
     UTC4,
     UTC8,
     MAA_TASKS,
     MAA_TASKS_ZH,
+    MAA_LOG_SIGNS,
     MAA_STAGE_KEY,
     MAA_ANNIHILATION_FIGHT_BASE,
     MAA_REMAIN_FIGHT_BASE,
@@ -108,8 +116,10 @@ class AutoProxyTask(TaskExecuteBase):
             "%Y-%m-%d %H:%M:%S",
             self.check_log,
             except_logs=["如果长时间无进一步日志更新，可能需要手动干预。"],
+            delta=True,
         )
         self.wait_event = asyncio.Event()
+        self.live_statistics: dict = {}
         self.user_start_time = datetime.now()
         self.log_start_time = datetime.now()
 
@@ -231,7 +241,7 @@ class AutoProxyTask(TaskExecuteBase):
                 self.log_start_time = datetime.now()
                 self.cur_user_item.log_record[self.log_start_time] = (
                     self.cur_user_log
-                ) = LogRecord()
+                ) = LogRecord(parser=MaaLogParser(), matcher=LogMatcher(MAA_LOG_SIGNS))
 
                 try:
                     self.script_info.log = "正在启动模拟器"
@@ -577,26 +587,37 @@ class AutoProxyTask(TaskExecuteBase):
 
         logger.success(f"MAA运行参数配置完成: {self.mode}")
 
-    async def check_log(self, log_content: list[str], latest_time: datetime) -> None:
+    async def check_log(self, log_update: LogUpdate) -> None:
         """日志回调"""
 
-        log = "".join(log_content)
-        self.cur_user_log.content = log_content
-        self.script_info.log = log
+        latest_time = log_update.latest_time
+        if self.cur_user_log.update(log_update):
+            self.script_info.update_log(log_update)
+        matcher = self.cur_user_log.matcher
+
+        # 增量解析新日志, 统计数据变化时推送实时统计
+        parser = self.cur_user_log.parse()
+        if parser is not None and parser.statistics != self.live_statistics:
+            self.live_statistics = parser.statistics
+            await Config.send_websocket_message(
+                id=self.task_info.task_id,
+                type="Update",
+                data={"statistics": self.live_statistics},
+            )
 
-        if "未选择任务" in log:
+        if "未选择任务" in matcher:
             self.cur_user_log.status = "MAA 未选择任何任务"
-        elif "任务出错: 开始唤醒" in log:
+        elif "任务出错: 开始唤醒" in matcher:
             self.cur_user_log.status = "MAA 未能正确登录 PRTS"
-        elif "任务已全部完成！" in log:
+        elif "任务已全部完成！" in matcher:
 
             for en_task, zh_task in zip(MAA_TASKS, MAA_TASKS_ZH):
-                if f"完成任务: {zh_task}" in log:
+                if f"完成任务: {zh_task}" in matcher:
                     self.task_dict[en_task] = False
 
-            if self.mode == "Annihilation" and "完成任务: 剿灭作战" in log:
+            if self.mode == "Annihilation" and "完成任务: 剿灭作战" in matcher:
                 self.task_dict["Fight"] = False
-            elif self.mode == "Routine" and "任务出错: 剩余理智" in log:
+            elif self.mode == "Routine" and "任务出错: 剩余理智" in matcher:
                 self.task_dict["Fight"] = True
 
             if any(self.task_dict.values()):
@@ -604,14 +625,14 @@ class AutoProxyTask(TaskExecuteBase):
             else:
                 self.cur_user_log.status = "Success!"
 
-        elif "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣" in log:
+        elif "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣" in matcher:
             self.cur_user_log.status = "MAA 的 ADB 连接异常"
-        elif "未检测到任何模拟器" in log:
+        elif "未检测到任何模拟器" in matcher:
             self.cur_user_log.status = "MAA 未检测到任何模拟器"
-        elif "已停止" in log:
+        elif "已停止" in matcher:
             self.cur_user_log.status = "MAA 在完成任务前中止"
         elif (
-            "MaaAssistantArknights GUI exited" in log
+            "MaaAssistantArknights GUI exited" in matcher
             or not await self.maa_process_manager.is_running()
         ):
             self.cur_user_log.status = "MAA 在完成任务前退出"
@@ -659,7 +680,9 @@ class AutoProxyTask(TaskExecuteBase):
             )
             user_logs_list.append(log_path.with_suffix(".json"))
 
-            if await Config.save_maa_log(log_path, log_item.content, log_item.status):
+            if await Config.save_maa_log(
+                log_path, log_item.content, log_item.status, log_item.parse()
+            ):
                 if_six_star = True
 
         statistics = await Config.merge_statistic_info(user_logs_list)
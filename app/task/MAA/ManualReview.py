@@ -33,8 +33,13 @@ from app.models.ConfigBase import MultipleConfig
 from app.models.config import MaaConfig, MaaUserConfig
 from app.models.emulator import DeviceInfo, DeviceBase
 from app.services import System
-from app.utils import get_logger, LogMonitor, ProcessManager
-from app.utils.constants import UTC4, MAA_STARTUP_BASE, ARKNIGHTS_PACKAGE_NAME
+from app.utils import get_logger, LogMatcher, LogMonitor, LogUpdate, ProcessManager
+from app.utils.constants import (
+    UTC4,
+    MAA_STARTUP_BASE,
+    MAA_REVIEW_LOG_SIGNS,
+    ARKNIGHTS_PACKAGE_NAME,
+)
 from .tools import agree_bilibili
 
 logger = get_logger("MAA 人工排查")
@@ -81,7 +86,9 @@ class ManualReviewTask(TaskExecuteBase):
     async def prepare(self):
 
         self.maa_process_manager = ProcessManager()
-        self.maa_log_monitor = LogMonitor((1, 20), "%Y-%m-%d %H:%M:%S", self.check_log)
+        self.maa_log_monitor = LogMonitor(
+            (1, 20), "%Y-%m-%d %H:%M:%S", self.check_log, delta=True
+        )
         self.message_queue = asyncio.Queue()
         await Broadcast.subscribe(self.message_queue)
         self.wait_event = asyncio.Event()
@@ -167,7 +174,7 @@ class ManualReviewTask(TaskExecuteBase):
             self.log_start_time = datetime.now()
 
             self.cur_user_item.log_record[self.log_start_time] = self.cur_user_log = (
-                LogRecord()
+                LogRecord(matcher=LogMatcher(MAA_REVIEW_LOG_SIGNS))
             )
             self.wait_event.clear()
             await self.maa_process_manager.open_process(self.maa_exe_path)
@@ -347,25 +354,26 @@ class ManualReviewTask(TaskExecuteBase):
         )
         logger.success("MAA运行参数配置完成: 人工排查")
 
-    async def check_log(self, log_content: list[str], latest_time: datetime) -> None:
+    async def check_log(self, log_update: LogUpdate) -> None:
         """日志回调"""
 
-        log = "".join(log_content)
-        self.cur_user_log.content = log_content
-        self.script_info.log = log
+        latest_time = log_update.latest_time
+        if self.cur_user_log.update(log_update):
+            self.script_info.update_log(log_update)
+        matcher = self.cur_user_log.matcher
 
-        if "未选择任务" in log:
+        if "未选择任务" in matcher:
             self.cur_user_log.status = "MAA 未选择任何任务"
-        elif "完成任务: StartUp" in log or "完成任务: 开始唤醒" in log:
+        elif "完成任务: StartUp" in matcher or "完成任务: 开始唤醒" in matcher:
             self.cur_user_log.status = "Success!"
-        elif "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣" in log:
+        elif "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣" in matcher:
             self.cur_user_log.status = "MAA 的 ADB 连接异常"
-        elif "未检测到任何模拟器" in log:
+        elif "未检测到任何模拟器" in matcher:
             self.cur_user_log.status = "MAA 未检测到任何模拟器"
-        elif "已停止" in log:
+        elif "已停止" in matcher:
             self.cur_user_log.status = "MAA 在完成任务前中止"
         elif (
-            "MaaAssistantArknights GUI exited" in log
+            "MaaAssistantArknights GUI exited" in matcher
             or not await self.maa_process_manager.is_running()
         ):
             self.cur_user_log.status = "MAA 在完成任务前退出"
@@ -37,7 +37,6 @@ from .AutoProxy import AutoProxyTask
 from .ManualReview import ManualReviewTask
 from .ScriptConfig import ScriptConfigTask
 
-
 logger = get_logger("MAA 调度器")
 
 METHOD_BOOK: dict[str, type[AutoProxyTask | ManualReviewTask | ScriptConfigTask]] = {
@@ -120,8 +119,9 @@ class MaaManager(TaskExecuteBase):
         # 锁定脚本配置并加载用户配置
         await Config.ScriptConfig[uuid.UUID(self.script_info.script_id)].lock()
         self.script_config = Config.ScriptConfig[uuid.UUID(self.script_info.script_id)]
-        self.user_config = MultipleConfig([MaaUserConfig])
-        await self.user_config.load(await self.script_config.UserData.toDict())
+        self.user_config: MultipleConfig[MaaUserConfig] = (
+            self.script_config.UserData.snapshot()
+        )
         logger.success(f"{self.script_info.script_id}已锁定, MAA配置提取完成")
 
         self.maa_set_path = Path(self.script_config.get("Info", "Path")) / "config"
@@ -200,9 +200,7 @@ class MaaManager(TaskExecuteBase):
             await self.emulator_manager.close(
                 self.script_config.get("Emulator", "Index")
             )
-            await Config.ScriptConfig[
-                uuid.UUID(self.script_info.script_id)
-            ].UserData.load(await self.user_config.toDict())
+            await self.user_config.commit()
 
             error_user = [
                 u.name for u in self.script_info.user_list if u.status == "异常"
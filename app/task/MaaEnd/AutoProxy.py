@@ -34,9 +34,9 @@ from app.models.ConfigBase import MultipleConfig
 from app.models.config import MaaEndConfig, MaaEndUserConfig
 from app.models.emulator import DeviceBase, DeviceInfo
 from app.services import Notify, System
-from app.utils import get_logger, LogMonitor, ProcessManager
+from app.utils import get_logger, LogMatcher, LogMonitor, LogUpdate, ProcessManager
 from app.tools import skland_sign_in
-from app.utils.constants import UTC4, UTC8, MAAEND_KILLPROC_TASK
+from app.utils.constants import UTC4, UTC8, MAAEND_KILLPROC_TASK, MAAEND_LOG_SIGNS
 from .tools import login, push_notification
 
 logger = get_logger("MaaEnd 自动代理")
@@ -108,7 +108,7 @@ class AutoProxyTask(TaskExecuteBase):
         self.maaend_log_path = self.maaend_root_path / "debug/maa.log"
 
         self.maaend_log_monitor = LogMonitor(
-            (1, 23), "%Y-%m-%d %H:%M:%S.%f", self.check_log
+            (1, 23), "%Y-%m-%d %H:%M:%S.%f", self.check_log, delta=True
         )
 
         self.run_book = False
@@ -201,7 +201,7 @@ class AutoProxyTask(TaskExecuteBase):
             )
             self.log_start_time = datetime.now()
             self.cur_user_item.log_record[self.log_start_time] = self.cur_user_log = (
-                LogRecord()
+                LogRecord(matcher=LogMatcher(MAAEND_LOG_SIGNS))
             )
 
             self.script_info.log = "正在启动游戏..."
@@ -492,21 +492,22 @@ class AutoProxyTask(TaskExecuteBase):
         )
         logger.success("MaaEnd 运行参数配置完成: 自动代理")
 
-    async def check_log(self, log_content: list[str], latest_time: datetime) -> None:
+    async def check_log(self, log_update: LogUpdate) -> None:
         """日志回调"""
 
-        log = "".join(log_content)
-        self.cur_user_log.content = log_content
-        self.script_info.log = log
-        if "资源加载失败" in log:
+        latest_time = log_update.latest_time
+        if self.cur_user_log.update(log_update):
+            self.script_info.update_log(log_update)
+        matcher = self.cur_user_log.matcher
+        if "资源加载失败" in matcher:
             self.cur_user_log.status = "MaaEnd 资源加载失败"
-        elif "快捷键开始任务：失败" in log:
+        elif "快捷键开始任务：失败" in matcher:
             self.cur_user_log.status = "MaaEnd 任务启动失败"
         elif (
-            "任务完成: 停止任务" in log
-            or "任务完成: ⛔ 结束进程" in log
-            or "任务完成: __MXU_KILLPROC__" in log
-            or "任务完成: StopTask" in log
+            "任务完成: 停止任务" in matcher
+            or "任务完成: ⛔ 结束进程" in matcher
+            or "任务完成: __MXU_KILLPROC__" in matcher
+            or "任务完成: StopTask" in matcher
             or not await self.maaend_process_manager.is_running()
         ):
             if self.task_dict is None:
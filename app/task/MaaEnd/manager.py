@@ -105,8 +105,9 @@ class MaaEndManager(TaskExecuteBase):
         # 锁定脚本配置并加载用户配置
         await Config.ScriptConfig[uuid.UUID(self.script_info.script_id)].lock()
         self.script_config = Config.ScriptConfig[uuid.UUID(self.script_info.script_id)]
-        self.user_config = MultipleConfig([MaaEndUserConfig])
-        await self.user_config.load(await self.script_config.UserData.toDict())
+        self.user_config: MultipleConfig[MaaEndUserConfig] = (
+            self.script_config.UserData.snapshot()
+        )
         logger.success(f"{self.script_info.script_id}已锁定, MAAEnd配置提取完成")
 
         self.maaend_config_dir = Path(self.script_config.get("Info", "Path")) / "config"
@@ -189,9 +190,7 @@ class MaaEndManager(TaskExecuteBase):
                 await self.emulator_manager.close(
                     self.script_config.get("Game", "EmulatorIndex")
                 )
-            await Config.ScriptConfig[
-                uuid.UUID(self.script_info.script_id)
-            ].UserData.load(await self.user_config.toDict())
+            await self.user_config.commit()
 
             error_user = [
                 u.name for u in self.script_info.user_list if u.status == "异常"
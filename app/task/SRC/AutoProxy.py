@@ -34,8 +34,15 @@ from app.models.ConfigBase import MultipleConfig
 from app.models.config import SrcConfig, SrcUserConfig
 from app.models.emulator import DeviceBase, DeviceInfo
 from app.services import Notify, System
-from app.utils import get_logger, LogMonitor, ProcessManager, strptime
-from app.utils.constants import STARRAIL_PACKAGE_NAME, UTC4
+from app.utils import (
+    get_logger,
+    LogMatcher,
+    LogMonitor,
+    LogUpdate,
+    ProcessManager,
+    strptime,
+)
+from app.utils.constants import STARRAIL_PACKAGE_NAME, SRC_LOG_SIGNS, UTC4
 from .tools import login, push_notification, poor_yaml_read, poor_yaml_write
 
 logger = get_logger("SRC脚本自动代理")
@@ -93,7 +100,7 @@ class AutoProxyTask(TaskExecuteBase):
 
         self.src_process_manager = ProcessManager()
         self.src_log_monitor = LogMonitor(
-            (0, 23), "%Y-%m-%d %H:%M:%S.%f", self.check_log
+            (0, 23), "%Y-%m-%d %H:%M:%S.%f", self.check_log, delta=True
         )
         self.wait_event = asyncio.Event()
         self.user_start_time = datetime.now()
@@ -140,7 +147,7 @@ class AutoProxyTask(TaskExecuteBase):
             )
             self.log_start_time = datetime.now()
             self.cur_user_item.log_record[self.log_start_time] = self.cur_user_log = (
-                LogRecord()
+                LogRecord(matcher=LogMatcher(SRC_LOG_SIGNS))
             )
 
             self.script_info.log = "正在启动模拟器..."
@@ -432,22 +439,25 @@ class AutoProxyTask(TaskExecuteBase):
         )
         logger.info(f"脚本运行参数配置完成: 自动代理")
 
-    async def check_log(self, log_content: list[str], latest_time: datetime) -> None:
+    async def check_log(self, log_update: LogUpdate) -> None:
         """日志回调"""
 
-        log = "".join(log_content)
-        self.cur_user_log.content = log_content
-        self.script_info.log = log
+        latest_time = log_update.latest_time
+        if self.cur_user_log.update(log_update):
+            self.script_info.update_log(log_update)
+        matcher = self.cur_user_log.matcher
 
-        if "Request human takeover" in log:
+        if "Request human takeover" in matcher:
             self.cur_user_log.status = "SRC 无法继续执行任务, 需要用户接管"
-        elif "Close game during wait" in log:
+        elif "Close game during wait" in matcher:
             self.cur_user_log.status = "Success!"
-        elif "[src] exited" in log or not await self.src_process_manager.is_running():
+        elif (
+            "[src] exited" in matcher or not await self.src_process_manager.is_running()
+        ):
             self.cur_user_log.status = "SRC 在完成任务前中止"
-        elif "Please switch to a supported page before starting SRC" in log:
+        elif "Please switch to a supported page before starting SRC" in matcher:
             self.cur_user_log.status = "SRC 启动时游戏停留在不支持的页面"
-        elif "CRITICAL" in log:
+        elif "CRITICAL" in matcher:
             self.cur_user_log.status = "SRC 发生严重错误"
         elif datetime.now() - latest_time > timedelta(
             minutes=self.script_config.get("Run", "RunTimeLimit")
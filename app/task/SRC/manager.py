@@ -37,7 +37,6 @@ from .AutoProxy import AutoProxyTask
 from .ManualReview import ManualReviewTask
 from .ScriptConfig import ScriptConfigTask
 
-
 logger = get_logger("SRC 调度器")
 
 METHOD_BOOK: dict[str, type[AutoProxyTask | ManualReviewTask | ScriptConfigTask]] = {
@@ -122,8 +121,9 @@ class SrcManager(TaskExecuteBase):
         # 锁定脚本配置并加载用户配置
         await Config.ScriptConfig[uuid.UUID(self.script_info.script_id)].lock()
         self.script_config = Config.ScriptConfig[uuid.UUID(self.script_info.script_id)]
-        self.user_config = MultipleConfig([SrcUserConfig])
-        await self.user_config.load(await self.script_config.UserData.toDict())
+        self.user_config: MultipleConfig[SrcUserConfig] = (
+            self.script_config.UserData.snapshot()
+        )
         logger.success(f"{self.script_info.script_id}已锁定, SRC配置提取完成")
 
         self.src_set_path = Path(self.script_config.get("Info", "Path")) / "config"
@@ -203,9 +203,7 @@ class SrcManager(TaskExecuteBase):
             await self.emulator_manager.close(
                 self.script_config.get("Emulator", "Index")
             )
-            await Config.ScriptConfig[
-                uuid.UUID(self.script_info.script_id)
-            ].UserData.load(await self.user_config.toDict())
+            await self.user_config.commit()
 
             error_user = [
                 u.name for u in self.script_info.user_list if u.status == "异常"
@@ -34,7 +34,15 @@ from app.models.ConfigBase import MultipleConfig
 from app.models.config import GeneralConfig, GeneralUserConfig
 from app.models.emulator import DeviceBase
 from app.services import Notify, System
-from app.utils import get_logger, LogMonitor, ProcessManager, ProcessInfo, strptime
+from app.utils import (
+    get_logger,
+    LogMatcher,
+    LogMonitor,
+    LogUpdate,
+    ProcessManager,
+    ProcessInfo,
+    strptime,
+)
 from app.utils.constants import UTC4
 from .tools import execute_script_task, push_notification
 
@@ -169,6 +177,7 @@ class AutoProxyTask(TaskExecuteBase):
             self.log_time_range,
             self.script_config.get("Script", "LogTimeFormat"),
             self.check_log,
+            delta=True,
         )
 
         self.run_book = False
@@ -207,7 +216,7 @@ class AutoProxyTask(TaskExecuteBase):
             )
             self.log_start_time = datetime.now()
             self.cur_user_item.log_record[self.log_start_time] = self.cur_user_log = (
-                LogRecord()
+                LogRecord(matcher=LogMatcher(self.success_log + self.error_log))
             )
 
             # 执行任务前脚本
@@ -446,15 +455,16 @@ class AutoProxyTask(TaskExecuteBase):
 
         logger.info(f"脚本运行参数配置完成: 自动代理")
 
-    async def check_log(self, log_content: list[str], latest_time: datetime) -> None:
+    async def check_log(self, log_update: LogUpdate) -> None:
         """日志回调"""
 
-        log = "".join(log_content)
-        self.cur_user_log.content = log_content
-        self.script_info.log = log
+        latest_time = log_update.latest_time
+        if self.cur_user_log.update(log_update):
+            self.script_info.update_log(log_update)
+        matcher = self.cur_user_log.matcher
 
         for success_sign in self.success_log:
-            if success_sign in log:
+            if success_sign in matcher:
                 self.cur_user_log.status = "Success!"
                 break
         else:
@@ -464,7 +474,7 @@ class AutoProxyTask(TaskExecuteBase):
                 self.cur_user_log.status = "脚本进程超时"
             else:
                 for error_sign in self.error_log:
-                    if error_sign in log:
+                    if error_sign in matcher:
                         self.cur_user_log.status = f"异常日志: {error_sign}"
                         break
                 else:
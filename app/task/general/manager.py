@@ -36,7 +36,6 @@ from .tools import push_notification
 from .AutoProxy import AutoProxyTask
 from .ScriptConfig import ScriptConfigTask
 
-
 logger = get_logger("通用调度器")
 
 METHOD_BOOK: dict[str, type[AutoProxyTask | ScriptConfigTask]] = {
@@ -134,8 +133,9 @@ class GeneralManager(TaskExecuteBase):
         # 锁定脚本配置并加载用户配置
         await Config.ScriptConfig[uuid.UUID(self.script_info.script_id)].lock()
         self.script_config = Config.ScriptConfig[uuid.UUID(self.script_info.script_id)]
-        self.user_config = MultipleConfig([GeneralUserConfig])
-        await self.user_config.load(await self.script_config.UserData.toDict())
+        self.user_config: MultipleConfig[GeneralUserConfig] = (
+            self.script_config.UserData.snapshot()
+        )
         logger.success(f"{self.script_info.script_id}已锁定, 通用脚本配置提取完成")
 
         self.script_config_path = Path(self.script_config.get("Script", "ConfigPath"))
@@ -239,9 +239,7 @@ class GeneralManager(TaskExecuteBase):
 
         if self.task_info.mode == "AutoProxy":
 
-            await Config.ScriptConfig[
-                uuid.UUID(self.script_info.script_id)
-            ].UserData.load(await self.user_config.toDict())
+            await self.user_config.commit()
 
             error_user = [
                 u.name for u in self.script_info.user_list if u.status == "异常"
@@ -0,0 +1,201 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2024-2025 DLmaster361
+#   Copyright © 2025 MoeSnowyFox
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+
+import os
+import sys
+import ctypes
+import ctypes.util
+import asyncio
+import threading
+from pathlib import Path
+from typing import BinaryIO
+
+from .logger import get_logger
+
+logger = get_logger("文件监视器")
+
+
+class FileWatcher:
+    """
+    文件变化等待后端, 默认实现为定时轮询
+
+    `wait` 在监视目录发生变化或超时后返回, 调用方在返回后自行检查文件。
+    系统通知可能合并或遗漏事件, 因此调用方始终应以超时作为兜底轮询。
+    """
+
+    # 系统通知可靠时允许的最长兜底轮询间隔（秒）
+    max_interval = 1.0
+
+    async def wait(self, timeout: float) -> None:
+        """等待文件变化, 至多等待 timeout 秒"""
+
+        await asyncio.sleep(timeout)
+
+    def close(self) -> None:
+        """释放系统资源"""
+
+
+class InotifyWatcher(FileWatcher):
+    """基于 Linux inotify 的目录变化通知"""
+
+    max_interval = 5.0
+
+    # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    MASK = 0x002 | 0x004 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+
+    def __init__(self, folder: Path):
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), self.MASK) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"无法监视目录: {folder}")
+
+    async def wait(self, timeout: float) -> None:
+
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        loop.add_reader(self.fd, event.set)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(self.fd)
+
+        # 清空已到达的事件, 调用方只关心是否发生变化
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+
+        os.close(self.fd)
+
+
+class WindowsWatcher(FileWatcher):
+    """
+    基于 Windows 目录变化通知 (FindFirstChangeNotification) 的目录变化通知
+
+    等待在后台线程中进行且无法随协程取消而中断, 因此同时等待一个停止事件,
+    `close` 先触发停止事件并等待后台线程退出, 再释放通知句柄。
+    """
+
+    # 写入方持有文件句柄时, 大小与修改时间的变化通知可能延迟, 兜底轮询间隔与原轮询一致
+    max_interval = 1.0
+
+    def __init__(self, folder: Path):
+
+        import win32con
+        import win32event
+        import win32file
+
+        self.handle = win32file.FindFirstChangeNotification(
+            str(folder),
+            False,
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+            | win32con.FILE_NOTIFY_CHANGE_SIZE
+            | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE,
+        )
+        self.stop_event = win32event.CreateEvent(None, True, False, None)
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def _wait(self, timeout: float) -> None:
+        """在后台线程中等待目录变化或停止事件, 持有锁期间句柄不会被释放"""
+
+        import win32event
+        import win32file
+
+        with self.lock:
+            if self.closed:
+                return
+            result = win32event.WaitForMultipleObjects(
+                [self.handle, self.stop_event], False, int(timeout * 1000)
+            )
+            if result == win32event.WAIT_OBJECT_0:
+                win32file.FindNextChangeNotification(self.handle)
+
+    async def wait(self, timeout: float) -> None:
+
+        await asyncio.to_thread(self._wait, timeout)
+
+    def close(self) -> None:
+
+        import win32event
+        import win32file
+
+        win32event.SetEvent(self.stop_event)
+        with self.lock:
+            self.closed = True
+            win32file.FindCloseChangeNotification(self.handle)
+            self.stop_event.Close()
+
+
+def create_file_watcher(file_path: Path) -> FileWatcher:
+    """
+    为指定文件创建变化等待后端, 监视其所在目录以同时感知写入、替换与轮转
+
+    优先使用系统通知, 不可用时退回定时轮询
+    """
+
+    try:
+        if sys.platform == "win32":
+            return WindowsWatcher(file_path.parent)
+        if sys.platform.startswith("linux"):
+            return InotifyWatcher(file_path.parent)
+    except Exception as e:
+        logger.warning(f"无法创建文件变化通知, 使用定时轮询: {type(e).__name__}: {e}")
+    return FileWatcher()
+
+
+def open_shared(file_path: Path) -> BinaryIO:
+    """
+    以二进制只读方式打开文件, 持续持有句柄时不阻止写入方重命名、删除或轮转该文件
+
+    Windows 下默认打开方式不包含 FILE_SHARE_DELETE 共享标志, 需通过 CreateFile 打开
+    """
+
+    if sys.platform != "win32":
+        return file_path.open("rb")
+
+    import msvcrt
+    import win32con
+    import win32file
+
+    handle = win32file.CreateFile(
+        str(file_path),
+        win32con.GENERIC_READ,
+        win32con.FILE_SHARE_READ
+        | win32con.FILE_SHARE_WRITE
+        | win32con.FILE_SHARE_DELETE,
+        None,
+        win32con.OPEN_EXISTING,
+        0,
+        None,
+    )
+    return os.fdopen(msvcrt.open_osfhandle(handle.Detach(), os.O_RDONLY), "rb")
@@ -0,0 +1,110 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2024-2025 DLmaster361
+#   Copyright © 2025 MoeSnowyFox
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+
+import re
+from typing import Dict, Iterable, Optional
+
+
+class LogMatcher:
+    """
+    日志特征增量匹配器
+
+    将全部特征字符串编译为一个多选正则, 仅对新增日志进行一次预筛选, 命中后再逐行确认具体特征,
+    并记录每个特征首次出现的行号。查询特征是否出现为 O(1), 无需在每次回调时重新扫描全部日志。
+
+    特征按行匹配, 未以换行结尾的行会与后续内容拼接后匹配, 与在完整日志文本中查找一致。
+    """
+
+    def __init__(self, signatures: Iterable[str]):
+        """
+        Args:
+            signatures (Iterable[str]): 需要匹配的特征字符串, 空字符串与 `in` 运算一致, 视为始终命中
+        """
+
+        self.signatures = list(dict.fromkeys(signatures))
+        self.reset()
+
+    def reset(self) -> None:
+        """清空匹配状态, 日志被整体替换时调用"""
+
+        self.first_hit: Dict[str, int] = {"": 0} if "" in self.signatures else {}
+        self.line_count = 0
+        self._partial = ""
+        self._compile()
+
+    def feed(self, lines: Iterable[str]) -> None:
+        """
+        匹配新产生的日志
+
+        Args:
+            lines (Iterable[str]): 按顺序排列的日志行
+        """
+
+        lines = list(lines)
+        if self._pattern is None:
+            self.line_count += len(lines)
+            self._partial = ""
+            return
+
+        # 预筛选: 新增日志中不含任何未命中特征时直接跳过
+        chunk = self._partial + "".join(lines)
+        if self._pattern.search(chunk) is None:
+            self.line_count += len(lines)
+            self._partial = chunk[chunk.rfind("\n") + 1 :]
+            return
+
+        if_hit = False
+        for line in lines:
+            text = self._partial + line
+            self._partial = "" if line.endswith("\n") else text
+            if self._pattern.search(text) is not None:
+                for signature in self._pending:
+                    if signature not in self.first_hit and signature in text:
+                        self.first_hit[signature] = self.line_count
+                        if_hit = True
+            self.line_count += 1
+
+        if if_hit:
+            self._compile()
+
+    def __contains__(self, signature: str) -> bool:
+        """特征是否已出现在日志中, 查询未注册的特征时抛出 KeyError"""
+
+        if signature not in self.first_hit and signature not in self._pending:
+            raise KeyError(f"未注册的日志特征: {signature}")
+        return signature in self.first_hit
+
+    def hit_line(self, signature: str) -> Optional[int]:
+        """特征首次出现的行号, 从 0 开始, 未出现时返回 None"""
+
+        return self.first_hit.get(signature)
+
+    def _compile(self) -> None:
+        """由尚未命中的特征重新编译预筛选正则"""
+
+        self._pending = [_ for _ in self.signatures if _ not in self.first_hit]
+        self._pattern = (
+            re.compile("|".join(re.escape(_) for _ in self._pending))
+            if self._pending
+            else None
+        )
@@ -19,35 +19,140 @@
 #   Contact: DLmaster_361@163.com
 
 
+import os
+import re
 import asyncio
 import aiofiles
 from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime, timedelta, date
 from copy import copy
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Literal, Awaitable
-
-from .constants import TIME_FIELDS, ANSI_ESCAPE_RE
+from typing import BinaryIO, Callable, Literal, Awaitable
+
+from .constants import (
+    TIME_FIELDS,
+    TIME_PATTERNS,
+    ANSI_ESCAPE_RE,
+    LOG_POLL_MIN_INTERVAL,
+    LOG_CALLBACK_INTERVAL,
+)
+from .FileWatcher import create_file_watcher, open_shared
 from .logger import get_logger
-from .tools import decode_bytes
+from .tools import StreamDecoder
 
 logger = get_logger("日志监控器")
 
 
+class TimeParser:
+    """
+    预编译的时间戳解析器
+
+    仅含 `TIME_PATTERNS` 中字段的格式会被编译为正则表达式, 匹配后直接转换整数构造时间;
+    含其他字段的格式回退至 `datetime.strptime`。格式中缺失的字段取自默认时间。
+    """
+
+    def __init__(self, format: str):
+
+        self.format = format
+        self.fields: list[str] = []
+        self.pattern: re.Pattern | None = None
+
+        parts: list[str] = []
+        i = 0
+        while i < len(format):
+            char = format[i]
+            if char != "%":
+                # 与 datetime.strptime 一致, 连续空白匹配任意数量的空白
+                if not char.isspace():
+                    parts.append(re.escape(char))
+                elif not parts or parts[-1] != r"\s+":
+                    parts.append(r"\s+")
+                i += 1
+                continue
+            directive = format[i : i + 2]
+            i += 2
+            if directive == "%%":
+                parts.append("%")
+            elif (
+                directive in TIME_PATTERNS and TIME_FIELDS[directive] not in self.fields
+            ):
+                self.fields.append(TIME_FIELDS[directive])
+                parts.append(f"({TIME_PATTERNS[directive]})")
+            else:
+                return
+
+        self.pattern = re.compile("".join(parts), re.IGNORECASE)
+        # 按 datetime 参数顺序记录各字段对应的匹配组序号, 缺失的字段为 None
+        self.layout = [
+            (
+                field_name,
+                self.fields.index(field_name) if field_name in self.fields else None,
+            )
+            for field_name in TIME_FIELDS.values()
+        ]
+
+    def parse(self, date_string: str, default_date: datetime) -> datetime:
+        """根据格式解析日期字符串, 格式中缺失的字段取自 default_date"""
+
+        if self.pattern is None:
+            return self.fallback(date_string, default_date)
+
+        match = self.pattern.fullmatch(date_string)
+        if match is None:
+            raise ValueError(
+                f"time data {date_string!r} does not match format {self.format!r}"
+            )
+
+        values = match.groups()
+        datetime_args = []
+        for field_name, index in self.layout:
+            if index is None:
+                datetime_args.append(getattr(default_date, field_name))
+            elif field_name == "microsecond":
+                datetime_args.append(int(values[index].ljust(6, "0")))
+            else:
+                datetime_args.append(int(values[index]))
+
+        return datetime(*datetime_args)
+
+    def fallback(self, date_string: str, default_date: datetime) -> datetime:
+
+        date = datetime.strptime(date_string, self.format)
+
+        # 构建参数字典
+        datetime_kwargs = {}
+        for format_code, field_name in TIME_FIELDS.items():
+            if format_code in self.format:
+                datetime_kwargs[field_name] = getattr(date, field_name)
+            else:
+                datetime_kwargs[field_name] = getattr(default_date, field_name)
+
+        return datetime(**datetime_kwargs)
+
+
+@lru_cache(maxsize=64)
+def compile_time_format(format: str) -> TimeParser:
+    """获取时间格式对应的预编译解析器"""
+
+    return TimeParser(format)
+
+
 def strptime(date_string: str, format: str, default_date: datetime) -> datetime:
     """根据指定格式解析日期字符串"""
 
-    date = datetime.strptime(date_string, format)
+    return compile_time_format(format).parse(date_string, default_date)
 
-    # 构建参数字典
-    datetime_kwargs = {}
-    for format_code, field_name in TIME_FIELDS.items():
-        if format_code in format:
-            datetime_kwargs[field_name] = getattr(date, field_name)
-        else:
-            datetime_kwargs[field_name] = getattr(default_date, field_name)
 
-    return datetime(**datetime_kwargs)
+@dataclass
+class LogUpdate:
+    """日志监控器的增量回调数据"""
+
+    lines: list[str]  # 自上次回调以来新增的日志
+    contents: list[str]  # 本次监控累计的全部日志, 监控期间持续追加, 使用方不应修改
+    reset: bool  # 累计日志已重新开始 (开始监控或日志轮转), 使用方应丢弃此前的增量状态
+    latest_time: datetime  # 最新日志的时间戳
 
 
 class LogMonitor:
@@ -55,20 +160,45 @@ class LogMonitor:
         self,
         time_stamp_range: tuple[int, int],
         time_format: str,
-        callback: Callable[[list[str], datetime], Awaitable[None]],
+        callback: (
+            Callable[[list[str], datetime], Awaitable[None]]
+            | Callable[[LogUpdate], Awaitable[None]]
+        ),
         except_logs: list[str] | None = None,
         parse_log: Callable[[list[str]], list[str]] | None = None,
+        delta: bool = False,
     ):
+        """
+        Args:
+            time_stamp_range (tuple[int, int]): 日志行中时间戳的切片范围
+            time_format (str): 时间戳格式
+            callback: 日志回调函数, `delta` 为 False 时以 (全部日志副本, 最新时间戳) 调用,
+                为 True 时以 `LogUpdate` 调用, 仅传递新增日志
+            except_logs (list[str] | None): 不用于更新最新时间戳的日志
+            parse_log (Callable[[list[str]], list[str]] | None): 全部日志的预处理函数, 仅全量回调时可用
+            delta (bool): 是否使用增量回调
+        """
+
+        if delta and parse_log is not None:
+            raise ValueError("增量回调模式不支持 parse_log")
+
         self.time_start = time_stamp_range[0]
         self.time_end = time_stamp_range[1]
         self.time_format = time_format
+        self.time_parser = compile_time_format(time_format)
         self.callback = callback
         self.except_logs = except_logs or []
         self.parse_log = parse_log
+        self.delta = delta
         self.last_callback_time: datetime = datetime.now()
         self.log_contents: list[str] = []
         self.latest_time = datetime.now()
         self.task: asyncio.Task | None = None
+        # 上次回调时的累计日志与已回调的行数, 用于计算增量
+        self.delivered_contents: list[str] | None = None
+        self.delivered_count = 0
+        # 全量回调模式下传递给回调函数的日志副本, 仅在日志变化时重新复制
+        self.snapshot: list[str] = []
 
     async def monitor_file(
         self,
@@ -84,102 +214,139 @@ class LogMonitor:
 
         if_mtime_checked = False
         warned_mtime_date: date | None = None
-        if_log_start = False
+        self.if_log_start = False
+        self.log_contents = []
+        log_file: BinaryIO | None = None  # 跨轮次持续打开的日志文件
+        log_ino = 0
         offset = 0
-        log_contents = []
+        remainder = b""  # 尚未以换行结尾的日志片段
+        decoder = StreamDecoder()
+        interval = LOG_POLL_MIN_INTERVAL
+        watcher = create_file_watcher(log_file_path)
 
-        while True:
-
-            # 检查文件是否仍然存在
-            if not log_file_path.exists():
-                logger.warning(f"日志文件不存在: {log_file_path}")
-                await self.do_callback()
-                await asyncio.sleep(1)
-                continue
+        try:
+            while True:
 
-            if not if_mtime_checked:
-                file_mtime_date = date.fromtimestamp(log_file_path.stat().st_mtime)
-                if file_mtime_date == date.today():
-                    log_stat = log_file_path.stat()
-                    if_mtime_checked = True
-                else:
-                    if warned_mtime_date != file_mtime_date:
-                        logger.warning(f"日志文件今天未被修改: {file_mtime_date}")
-                        warned_mtime_date = file_mtime_date
+                # 检查文件是否仍然存在
+                try:
+                    path_stat = log_file_path.stat()
+                except FileNotFoundError:
+                    logger.warning(f"日志文件不存在: {log_file_path}")
                     await self.do_callback()
-                    await asyncio.sleep(1)
+                    await watcher.wait(1)
                     continue
 
-            # 尝试读取文件
-            try:
+                if not if_mtime_checked:
+                    file_mtime_date = date.fromtimestamp(path_stat.st_mtime)
+                    if file_mtime_date == date.today():
+                        if_mtime_checked = True
+                    else:
+                        if warned_mtime_date != file_mtime_date:
+                            logger.warning(f"日志文件今天未被修改: {file_mtime_date}")
+                            warned_mtime_date = file_mtime_date
+                        await self.do_callback()
+                        await watcher.wait(1)
+                        continue
+
+                # 尝试读取文件
+                try:
+
+                    # 发生日志轮转或文件被替换，重置监控状态并加载被轮换的旧日志
+                    if log_file is not None and (
+                        path_stat.st_ino != log_ino or path_stat.st_size < offset
+                    ):
+                        log_file.close()
+                        log_file = None
+                        remainder = b""
+                        self.log_contents = []
+                        self.if_log_start = False
+                        if bak_log_path is not None and bak_log_path.exists():
+                            bak_decoder = StreamDecoder()
+                            async with aiofiles.open(bak_log_path, "rb") as f:
+                                async for bline in f:
+                                    await self.append_line(
+                                        bak_decoder.decode(bline), log_start_time, False
+                                    )
+
+                    if log_file is None:
+                        log_file = await asyncio.to_thread(open_shared, log_file_path)
+                        log_ino = os.fstat(log_file.fileno()).st_ino
+                        offset = 0
+                        decoder = StreamDecoder()
+
+                    data = (
+                        await asyncio.to_thread(log_file.read)
+                        if path_stat.st_size != offset
+                        else b""
+                    )
+
+                except (FileNotFoundError, PermissionError) as e:
+                    logger.warning(f"文件访问错误: {e}")
+                    if log_file is not None:
+                        log_file.close()
+                        log_file = None
+                    await asyncio.sleep(5)
+                    continue
 
-                # 发生日志轮转或文件被替换，重置监控状态并加载被轮换的旧日志
-                if (
-                    log_stat.st_ino != log_file_path.stat().st_ino
-                    or log_stat.st_size > log_file_path.stat().st_size
-                ):
-                    offset = 0
-                    log_contents = []
-                    if_log_start = False
-                    if bak_log_path is not None and bak_log_path.exists():
-                        async with aiofiles.open(bak_log_path, "rb") as f:
-                            async for bline in f:
-                                line = decode_bytes(bline)
-                                if not if_log_start:
-                                    with suppress(IndexError, ValueError):
-                                        entry_time = strptime(
-                                            line[self.time_start : self.time_end],
-                                            self.time_format,
-                                            self.last_callback_time,
-                                        )
-                                        if entry_time > log_start_time:
-                                            if_log_start = True
-                                            log_contents.append(line)
-                                else:
-                                    log_contents.append(line)
-
-                log_stat = log_file_path.stat()
-
-                if log_stat.st_size <= offset:
+                if data:
+                    offset += len(data)
+                    *blines, remainder = (remainder + data).split(b"\n")
+                    for bline in blines:
+                        await self.append_line(
+                            decoder.decode(bline + b"\n"), log_start_time, True
+                        )
+                    interval = LOG_POLL_MIN_INTERVAL
+                else:
+                    # 日志空闲时输出未以换行结尾的残留片段
+                    if remainder:
+                        await self.append_line(
+                            decoder.decode(remainder), log_start_time, True
+                        )
+                        remainder = b""
+                    interval = min(interval * 2, watcher.max_interval)
 
                     # 日志无变化超时调用回调
                     if datetime.now() - self.last_callback_time > timedelta(minutes=1):
                         await self.do_callback()
 
-                    await asyncio.sleep(1)
-                    continue
+                # 日志变化调用回调, 日志持续输出时限制回调频率
+                if (
+                    self.log_contents is not self.delivered_contents
+                    or len(self.log_contents) != self.delivered_count
+                ):
+                    since_callback = (
+                        datetime.now() - self.last_callback_time
+                    ).total_seconds()
+                    if since_callback >= LOG_CALLBACK_INTERVAL:
+                        await self.do_callback()
+                    else:
+                        interval = min(interval, LOG_CALLBACK_INTERVAL - since_callback)
 
-                async with aiofiles.open(log_file_path, "rb") as f:
-                    await f.seek(offset)
-                    async for bline in f:
-                        offset = await f.tell()
-                        line = decode_bytes(bline)
-                        if not if_log_start:
-                            with suppress(IndexError, ValueError):
-                                entry_time = strptime(
-                                    line[self.time_start : self.time_end],
-                                    self.time_format,
-                                    self.last_callback_time,
-                                )
-                                if entry_time > log_start_time:
-                                    if_log_start = True
-                                    log_contents.append(line)
-                                    await self.update_latest_timestamp(line)
-                        else:
-                            log_contents.append(line)
-                            await self.update_latest_timestamp(line)
-
-            except (FileNotFoundError, PermissionError) as e:
-                logger.warning(f"文件访问错误: {e}")
-                await asyncio.sleep(5)
-                continue
+                await watcher.wait(interval)
 
-            # 日志变化调用回调
-            if len(log_contents) != len(self.log_contents):
-                self.log_contents = copy(log_contents)
-                await self.do_callback()
+        finally:
+            if log_file is not None:
+                log_file.close()
+            watcher.close()
 
-            await asyncio.sleep(1)
+    async def append_line(
+        self, line: str, log_start_time: datetime, if_update_time: bool
+    ) -> None:
+        """记录一行日志, 跳过监控开始前的日志"""
+
+        if not self.if_log_start:
+            with suppress(IndexError, ValueError):
+                entry_time = self.time_parser.parse(
+                    line[self.time_start : self.time_end], self.last_callback_time
+                )
+                if entry_time > log_start_time:
+                    self.if_log_start = True
+            if not self.if_log_start:
+                return
+
+        self.log_contents.append(line)
+        if if_update_time:
+            await self.update_latest_timestamp(line)
 
     async def monitor_process(
         self, process: asyncio.subprocess.Process, stream: Literal["stdout", "stderr"]
@@ -198,6 +365,7 @@ class LogMonitor:
             raise ValueError(f"无效的流类型: {stream}")
 
         self.log_contents = []
+        decoder = StreamDecoder()
 
         while True:
 
@@ -208,7 +376,9 @@ class LogMonitor:
                 await self.do_callback()
                 continue
 
-            line = ANSI_ESCAPE_RE.sub("", decode_bytes(bline))
+            line = ANSI_ESCAPE_RE.sub(
+                "", decoder.decode(bline, final=process_stream.at_eof())
+            )
 
             self.log_contents.append(line)
             await self.update_latest_timestamp(line)
@@ -224,13 +394,29 @@ class LogMonitor:
     async def do_callback(self):
         """安全调用回调函数"""
         self.last_callback_time = datetime.now()
+
+        contents = self.log_contents
+        reset = contents is not self.delivered_contents
+        lines = contents if reset else contents[self.delivered_count :]
+        self.delivered_contents = contents
+        self.delivered_count = len(contents)
+
         try:
+            if self.delta:
+                await self.callback(
+                    LogUpdate(list(lines), contents, reset, self.latest_time)
+                )
+                return
+
+            # 兼容全量回调, 日志变化时才复制全部日志
+            if reset or lines:
+                self.snapshot = copy(contents)
             if self.parse_log is None:
-                await self.callback(self.log_contents, self.latest_time)
+                await self.callback(self.snapshot, self.latest_time)
             else:
                 await self.callback(
                     await asyncio.get_running_loop().run_in_executor(
-                        None, self.parse_log, self.log_contents
+                        None, self.parse_log, self.snapshot
                     ),
                     self.latest_time,
                 )
@@ -250,10 +436,8 @@ class LogMonitor:
         with suppress(IndexError, ValueError):
             log_text = log[: self.time_start] + log[self.time_end :]
             if log_text != self.last_log:
-                self.latest_time = strptime(
-                    log[self.time_start : self.time_end],
-                    self.time_format,
-                    self.last_callback_time,
+                self.latest_time = self.time_parser.parse(
+                    log[self.time_start : self.time_end], self.last_callback_time
                 )
                 self.last_log = log_text
 
@@ -0,0 +1,188 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2024-2025 DLmaster361
+#   Copyright © 2025 MoeSnowyFox
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+#   Contact: DLmaster_361@163.com
+
+
+import re
+from typing import Any, Dict, Iterable, Optional
+
+# 当前理智值：理智: 5/180
+SANITY_RE = re.compile(r"理智:\s*(\d+)/\d+")
+# 理智回满时间：理智将在 2025-09-26 18:57 回满。(17h 29m 后)
+SANITY_FULL_RE = re.compile(
+    r"(理智将在\s*\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}\s*回满。\(\d+h\s+\d+m\s+后\))"
+)
+RECRUIT_STAR_RE = re.compile(r"(\d+)\s*★ Tags")
+DROP_STAGE_RE = re.compile(r"([\u4e00-\u9fffA-Za-z0-9\-]+) 掉落统计:")
+DROP_ITEM_RE = re.compile(
+    r"^(?!\[)(\S+?)\s*:\s*([\d,]+[kK]?)(?:\s*\(\+[\d,]+[kK]?\))?", re.M
+)
+DROP_ITEM_BLACKLIST = frozenset(
+    ("当前次数", "理智", "最快截图耗时", "专精等级", "剩余时间")
+)
+
+
+class MaaLogParser:
+    """
+    MAA 日志统计解析器
+
+    逐行解析 MAA 日志, 单次遍历即可得到公招统计、掉落统计与理智信息, 可随日志产生增量调用。
+
+    掉落统计以 Fight 任务为单位, 仅统计正常完成的任务中每个关卡最后一次的掉落统计;
+    公招统计仅统计已确认招募的公招。
+    """
+
+    def __init__(self):
+        self.recruit_statistics: Dict[str, int] = {}
+        self.drop_statistics: Dict[str, Dict[str, int]] = {}
+        self.sanity = 0
+        self.sanity_full_at = ""
+        self.if_six_star = False
+
+        # 公招识别状态
+        self._waiting_tags = False
+        self._confirmed_recruit = False
+        self._current_star_level: Optional[str] = None
+
+        # 当前 Fight 任务状态, 任务未开始时 _in_fight 为 False
+        self._in_fight = False
+        self._current_stage: Optional[str] = None
+        self._last_drop_stats: Dict[str, int] = {}
+
+    def feed(self, lines: Iterable[str]) -> None:
+        """
+        解析新产生的日志
+
+        Args:
+            lines (Iterable[str]): 按顺序排列的日志行
+        """
+
+        for line in lines:
+            self._parse_sanity(line)
+            self._parse_recruit(line)
+            self._parse_fight(line)
+
+    @property
+    def statistics(self) -> Dict[str, Any]:
+        """当前的统计数据, 格式与历史记录统计文件一致"""
+
+        return {
+            "recruit_statistics": dict(self.recruit_statistics),
+            "drop_statistics": {
+                stage: dict(drops) for stage, drops in self.drop_statistics.items()
+            },
+            "sanity": self.sanity,
+            "sanity_full_at": self.sanity_full_at,
+        }
+
+    def _parse_sanity(self, line: str) -> None:
+
+        if "理智" not in line:
+            return
+
+        sanity_match = SANITY_RE.search(line)
+        if sanity_match:
+            self.sanity = int(sanity_match.group(1))
+
+        sanity_full_match = SANITY_FULL_RE.search(line)
+        if sanity_full_match:
+            self.sanity_full_at = sanity_full_match.group(1)
+
+    def _parse_recruit(self, line: str) -> None:
+
+        if self._waiting_tags:
+            # 读取所有公招标签, 直至星级行
+            if "Tags" not in line:
+                return
+            self._waiting_tags = False
+            star_match = RECRUIT_STAR_RE.search(line)
+            if star_match:
+                self._current_star_level = f"{star_match.group(1)}★"
+                if self._current_star_level == "6★":
+                    self.if_six_star = True
+
+        elif "公招识别结果:" in line:
+            # 每次识别公招时清空之前的星级
+            self._current_star_level = None
+            self._waiting_tags = True
+            return
+
+        # 只有确认招募后才统计
+        if "已确认招募" in line:
+            self._confirmed_recruit = True
+
+        if self._confirmed_recruit and self._current_star_level:
+            self.recruit_statistics[self._current_star_level] = (
+                self.recruit_statistics.get(self._current_star_level, 0) + 1
+            )
+            self._confirmed_recruit = False
+            self._current_star_level = None
+
+    def _parse_fight(self, line: str) -> None:
+
+        if_start = "开始任务: Fight" in line or "开始任务: 理智作战" in line
+
+        if self._in_fight:
+            self._parse_drop(line)
+            if "完成任务: Fight" in line or "完成任务: 理智作战" in line:
+                self._finish_fight()
+            elif if_start:
+                # 遇到新的 Fight 任务开始, 当前任务没有正常结束, 丢弃其掉落统计
+                self._in_fight = False
+
+        if if_start:
+            self._in_fight = True
+            self._current_stage = None
+            self._last_drop_stats = {}
+            self._parse_drop(line)
+
+    def _parse_drop(self, line: str) -> None:
+
+        if "掉落统计:" in line:
+            drop_match = DROP_STAGE_RE.search(line)
+            if drop_match:
+                # 发现新的掉落统计, 重置当前关卡的掉落数据
+                self._current_stage = drop_match.group(1)
+                self._last_drop_stats = {}
+                return
+
+        if self._current_stage is None or ":" not in line:
+            return
+
+        for item, total in DROP_ITEM_RE.findall(line):
+            if item in DROP_ITEM_BLACKLIST:
+                continue
+            total = total.replace(",", "")
+            if total.lower().endswith("k"):
+                self._last_drop_stats[item] = int(total[:-1]) * 1000
+            else:
+                self._last_drop_stats[item] = int(total)
+
+    def _finish_fight(self) -> None:
+        """任务正常结束, 将最后一次掉落统计累加至总统计"""
+
+        self._in_fight = False
+        if self._current_stage is None or not self._last_drop_stats:
+            return
+
+        stage_drops = self.drop_statistics.setdefault(self._current_stage, {})
+        for item, count in self._last_drop_stats.items():
+            stage_drops[item] = stage_drops.get(item, 0) + count
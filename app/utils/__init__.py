@@ -24,11 +24,23 @@
 from .constants import *
 from .logger import get_logger
 from .ImageUtils import ImageUtils
-from .LogMonitor import LogMonitor, strptime
+from .LogMonitor import LogMonitor, LogUpdate, strptime
+from .LogMatcher import LogMatcher
+from .MaaLogParser import MaaLogParser
 from .ProcessManager import ProcessManager, ProcessRunner, ProcessInfo, ProcessResult
-from .security import dpapi_encrypt, dpapi_decrypt, sanitize_log_message
+from .security import (
+    CryptoBackend,
+    DPAPIBackend,
+    SoftwareBackend,
+    set_crypto_backend,
+    encrypt_secret,
+    decrypt_secret,
+    dpapi_encrypt,
+    dpapi_decrypt,
+    sanitize_log_message,
+)
 from .emulator import MumuManager, LDManager, search_all_emulators, EMULATOR_TYPE_BOOK
-from .tools import decode_bytes, busy_wait
+from .tools import decode_bytes, StreamDecoder, busy_wait, atomic_write_text
 from .websocket import WebSocketClient, create_ws_client
 
 __all__ = [
@@ -36,10 +48,19 @@ __all__ = [
     "get_logger",
     "ImageUtils",
     "LogMonitor",
+    "LogUpdate",
+    "LogMatcher",
+    "MaaLogParser",
     "ProcessManager",
     "ProcessRunner",
     "ProcessInfo",
     "ProcessResult",
+    "CryptoBackend",
+    "DPAPIBackend",
+    "SoftwareBackend",
+    "set_crypto_backend",
+    "encrypt_secret",
+    "decrypt_secret",
     "dpapi_encrypt",
     "dpapi_decrypt",
     "sanitize_log_message",
@@ -49,7 +70,9 @@ __all__ = [
     "search_all_emulators",
     "EMULATOR_TYPE_BOOK",
     "decode_bytes",
+    "StreamDecoder",
     "busy_wait",
+    "atomic_write_text",
     "WebSocketClient",
     "create_ws_client",
 ]
@@ -61,6 +61,31 @@ MAA_TASKS_ZH = [
 ]
 """MAA任务列表"""
 
+MAA_LOG_SIGNS = [
+    "未选择任务",
+    "任务出错: 开始唤醒",
+    "任务已全部完成！",
+    *[f"完成任务: {_}" for _ in MAA_TASKS_ZH],
+    "完成任务: 剿灭作战",
+    "任务出错: 剩余理智",
+    "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣",
+    "未检测到任何模拟器",
+    "已停止",
+    "MaaAssistantArknights GUI exited",
+]
+"""MAA自动代理日志特征"""
+
+MAA_REVIEW_LOG_SIGNS = [
+    "未选择任务",
+    "完成任务: StartUp",
+    "完成任务: 开始唤醒",
+    "请 ｢检查连接设置｣ → ｢尝试重启模拟器与 ADB｣ → ｢重启电脑｣",
+    "未检测到任何模拟器",
+    "已停止",
+    "MaaAssistantArknights GUI exited",
+]
+"""MAA人工排查日志特征"""
+
 MAA_STAGE_KEY = [
     "MedicineNumb",
     "SeriesNumb",
@@ -208,6 +233,16 @@ MAAEND_KILLPROC_TASK = {
 }
 """MAAEnd任务完成后退出任务配置"""
 
+MAAEND_LOG_SIGNS = [
+    "资源加载失败",
+    "快捷键开始任务：失败",
+    "任务完成: 停止任务",
+    "任务完成: ⛔ 结束进程",
+    "任务完成: __MXU_KILLPROC__",
+    "任务完成: StopTask",
+]
+"""MAAEnd日志特征"""
+
 EMULATOR_PATH_BOOK = {
     "mumu": {
         "name": "MuMu模拟器",
@@ -493,6 +528,15 @@ STARRAIL_PACKAGE_NAME = {
 }
 """崩坏·星穹铁道包名映射表"""
 
+SRC_LOG_SIGNS = [
+    "Request human takeover",
+    "Close game during wait",
+    "[src] exited",
+    "Please switch to a supported page before starting SRC",
+    "CRITICAL",
+]
+"""SRC日志特征"""
+
 STARRAIL_STAGE_BOOK = {
     "-": "禁用",
     "Calyx_Golden_Memories_Planarcadia": "材料：角色经验（回忆之蕾 二相乐园）",
@@ -605,6 +649,17 @@ TIME_FIELDS = {
 }
 """时间字段映射表"""
 
+TIME_PATTERNS = {
+    "%Y": r"\d\d\d\d",
+    "%m": r"1[0-2]|0[1-9]|[1-9]",
+    "%d": r"3[01]|[12]\d|0[1-9]|[1-9]| [1-9]",
+    "%H": r"2[0-3]|[0-1]\d|\d",
+    "%M": r"[0-5]\d|\d",
+    "%S": r"6[0-1]|[0-5]\d|\d",
+    "%f": r"[0-9]{1,6}",
+}
+"""时间字段的匹配规则, 与 datetime.strptime 保持一致"""
+
 POWER_SIGN_MAP = {
     "NoAction": "无动作",
     "Shutdown": "关机",
@@ -855,6 +910,15 @@ CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
 ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
 """匹配ANSI控制字符的正则表达式"""
 
+LOG_POLL_MIN_INTERVAL = 0.2
+"""日志文件持续输出时的最短轮询间隔（秒）, 空闲时逐步加倍至监视器的最长间隔"""
+
+LOG_CALLBACK_INTERVAL = 0.5
+"""日志文件持续输出时两次回调的最短间隔（秒）"""
+
+TASK_LOG_SYNC_INTERVAL = 10
+"""增量推送任务日志时, 两次推送完整日志的最长间隔（秒）"""
+
 TASK_MODE_ZH = {
     "AutoProxy": "自动代理",
     "ManualReview": "人工排查",
@@ -22,7 +22,9 @@
 
 import re
 import base64
-import win32crypt
+from abc import ABC, abstractmethod
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
 
 
 def sanitize_log_message(message: str) -> str:
@@ -52,6 +54,104 @@ def sanitize_log_message(message: str) -> str:
     return sanitized_message
 
 
+class CryptoBackend(ABC):
+    """敏感配置加解密后端"""
+
+    @abstractmethod
+    def encrypt(self, note: str) -> str:
+        """加密明文, 返回可存储的字符串"""
+        pass
+
+    @abstractmethod
+    def decrypt(self, note: str) -> str:
+        """解密由 `encrypt` 生成的字符串, 数据非法时抛出异常"""
+        pass
+
+
+class DPAPIBackend(CryptoBackend):
+    """Windows DPAPI 加解密后端, 密文与当前 Windows 用户绑定"""
+
+    def encrypt(self, note: str) -> str:
+        return dpapi_encrypt(note)
+
+    def decrypt(self, note: str) -> str:
+        return dpapi_decrypt(note)
+
+
+class SoftwareBackend(CryptoBackend):
+    """基于 AES-GCM 的纯软件加解密后端, 不依赖 Windows, 用于测试与基准测试"""
+
+    def __init__(self, key: bytes | None = None):
+        """
+        :param key: 32 字节密钥, 为 None 时随机生成, 仅在当前进程内有效
+        :type key: bytes | None
+        """
+
+        if key is not None and len(key) != 32:
+            raise ValueError("密钥长度必须为 32 字节")
+
+        self.key = key or get_random_bytes(32)
+
+    def encrypt(self, note: str) -> str:
+
+        if note == "":
+            return ""
+
+        cipher = AES.new(self.key, AES.MODE_GCM)
+        encrypted, tag = cipher.encrypt_and_digest(note.encode("utf-8"))
+        return base64.b64encode(cipher.nonce + tag + encrypted).decode("utf-8")
+
+    def decrypt(self, note: str) -> str:
+
+        if note == "":
+            return ""
+
+        raw = base64.b64decode(note)
+        cipher = AES.new(self.key, AES.MODE_GCM, nonce=raw[:16])
+        return cipher.decrypt_and_verify(raw[32:], raw[16:32]).decode("utf-8")
+
+
+_crypto_backend: CryptoBackend = DPAPIBackend()
+
+
+def set_crypto_backend(backend: CryptoBackend) -> None:
+    """
+    设置敏感配置使用的加解密后端, 默认为 Windows DPAPI
+
+    :param backend: 加解密后端
+    :type backend: CryptoBackend
+    """
+
+    global _crypto_backend
+    _crypto_backend = backend
+
+
+def encrypt_secret(note: str) -> str:
+    """
+    使用当前加解密后端加密数据
+
+    :param note: 数据明文
+    :type note: str
+    :return: 加密后的数据
+    :rtype: str
+    """
+
+    return _crypto_backend.encrypt(note)
+
+
+def decrypt_secret(note: str) -> str:
+    """
+    使用当前加解密后端解密数据
+
+    :param note: 数据密文
+    :type note: str
+    :return: 解密后的明文
+    :rtype: str
+    """
+
+    return _crypto_backend.decrypt(note)
+
+
 def dpapi_encrypt(
     note: str, description: None | str = None, entropy: None | bytes = None
 ) -> str:
@@ -71,6 +171,8 @@ def dpapi_encrypt(
     if note == "":
         return ""
 
+    import win32crypt
+
     encrypted = win32crypt.CryptProtectData(
         note.encode("utf-8"), description, entropy, None, None, 0
     )
@@ -92,6 +194,8 @@ def dpapi_decrypt(note: str, entropy: None | bytes = None) -> str:
     if note == "":
         return ""
 
+    import win32crypt
+
     decrypted = win32crypt.CryptUnprotectData(
         base64.b64decode(note), entropy, None, None, 0
     )
@@ -20,7 +20,10 @@
 #   Contact: DLmaster_361@163.com
 
 
+import os
 import time
+import codecs
+from pathlib import Path
 
 
 from .constants import ENCODINGS
@@ -48,6 +51,65 @@ def decode_bytes(data: bytes) -> str:
         return data.decode("latin1", errors="replace")
 
 
+class StreamDecoder:
+    """
+    日志流解码器
+
+    首次解码时按 `ENCODINGS` 的顺序检测编码, 此后沿用该编码的增量解码器,
+    跨读取边界被截断的多字节字符会保留至下次解码。已选编码解码失败时,
+    从失败的数据重新检测编码; 全部编码均失败时, 该段数据以替换模式解码。
+    """
+
+    def __init__(self):
+        self.encoding: str | None = None
+        self.decoder: codecs.IncrementalDecoder | None = None
+        # 上一段数据是否未以换行结尾, 此时增量解码器中可能残留被截断的字符
+        self.partial = False
+
+    def decode(self, data: bytes, final: bool = False) -> str:
+        """
+        解码流中的下一段数据
+
+        Args:
+            data (bytes): 新读取的字节串
+            final (bool): 是否为流的最后一段数据
+
+        Returns:
+            str: 解码后的字符串, 不含尚未完整读取的多字节字符
+        """
+
+        if self.decoder is not None:
+            pending = b""
+            try:
+                # 完整的行无需经过增量解码器
+                if not self.partial and data.endswith(b"\n"):
+                    return data.decode(self.encoding)
+                pending = self.decoder.getstate()[0]
+                text = self.decoder.decode(data, final)
+                self.partial = not data.endswith(b"\n")
+                return text
+            except UnicodeDecodeError:
+                data = pending + data
+                self.decoder = None
+
+        if not data:
+            return ""
+
+        for encoding in ENCODINGS:
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)("strict")
+                text = decoder.decode(data, final)
+            except (UnicodeDecodeError, LookupError):
+                continue
+            self.encoding = encoding
+            self.decoder = decoder
+            self.partial = not data.endswith(b"\n")
+            return text
+
+        self.partial = False
+        return codecs.decode(data, self.encoding or "latin1", errors="replace")
+
+
 def busy_wait(ms: float) -> None:
     """
     高精度忙等待, 高 CPU 占用, 目标精度 ±0.1ms
@@ -59,3 +121,24 @@ def busy_wait(ms: float) -> None:
     end = time.perf_counter() + ms / 1000.0
     while time.perf_counter() < end:
         pass
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """
+    以临时文件 + 原子重命名的方式写入文本, 避免写入中断导致文件损坏
+
+    Args:
+        path(Path): 目标文件路径
+        text(str): 要写入的文本
+        encoding(str): 文本编码
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+
+    with temp_path.open("w", encoding=encoding) as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temp_path, path)
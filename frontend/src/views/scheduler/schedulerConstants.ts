@@ -83,6 +83,8 @@ export interface SchedulerTab {
   logs: LogEntry[]
   isLogAtBottom: boolean
   lastLogContent: string
+  // 已显示日志在后端的字符数，用于衔接增量日志
+  lastLogLength?: number
   // 新增：任务总览快照（用于路由返回时快速恢复显示）
   overviewData?: Script[]
   // 新增：消息去重相关字段
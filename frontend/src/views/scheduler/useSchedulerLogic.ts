@@ -348,6 +348,7 @@ export function useSchedulerLogic() {
         tab.logs.splice(0)
         tab.isLogAtBottom = true
         tab.lastLogContent = ''
+        tab.lastLogLength = undefined
         tab.logMode = 'follow' // 任务开始时设置日志为保持最新模式
 
         subscribeToTask(tab)
@@ -483,6 +484,15 @@ export function useSchedulerLogic() {
   }
 
   const handleUpdateMessage = (tab: SchedulerTab, data: any) => {
+    // 处理增量日志 - 仅在与已显示的日志衔接时追加，否则等待后端下次推送完整日志
+    if (typeof data.log_append === 'string') {
+      if (tab.lastLogLength === data.log_offset) {
+        tab.lastLogContent += data.log_append
+        tab.lastLogLength = data.log_length
+      }
+      return
+    }
+
     // 添加消息去重机制
     const messageKey = `${tab.key}_${JSON.stringify(data.task_info || {})}`
     const currentTime = Date.now()
@@ -559,6 +569,12 @@ export function useSchedulerLogic() {
     }
 
     // 处理日志 - 直接显示完整日志内容，覆盖上次显示的内容
+    if (typeof data.log === 'string') {
+      tab.lastLogLength = typeof data.log_length === 'number' ? data.log_length : undefined
+      if (!data.log) tab.lastLogContent = ''
+    } else if (data.log) {
+      tab.lastLogLength = undefined
+    }
     if (data.log) {
       if (typeof data.log === 'string') {
         const newContent = data.log
@@ -675,6 +691,7 @@ export function useSchedulerLogic() {
       const resultText = data.Accomplish
       if (resultText && typeof resultText === 'string') {
         tab.lastLogContent = resultText
+        tab.lastLogLength = undefined
         logger.info('已清空日志并显示任务结果')
       }
 
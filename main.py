@@ -80,7 +80,6 @@ def main():
 
             await Config.init_config()
             await Config.get_stage()
-            await Config.clean_old_history()
             await ArknightWin32Toolkit.init()
             await MainTimer.start()
 
@@ -111,6 +110,17 @@ def main():
 
             await Matomo.close()
 
+            from app.models import ConfigSaver
+
+            try:
+                await ConfigSaver.flush()
+            except RuntimeError as e:
+                logger.error(f"退出前写入配置失败, 未写入的修改将丢失: {e}")
+
+            # 关闭数据库连接, 以便将 WAL 日志合并回数据库文件
+            await asyncio.to_thread(Config.config_database.close)
+            await asyncio.to_thread(Config.history_database.close)
+
             logger.info("AUTO-MAS 后端程序关闭")
 
         from fastapi.middleware.cors import CORSMiddleware
@@ -0,0 +1,87 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+"""
+配置构造与加载基准测试
+
+测量 1000 个 MAA 用户配置的构造、`load` 与 `MultipleConfig.load` 整体耗时。
+在仓库根目录下运行:
+
+    python tests/benchmarks/bench_config_load.py [仓库路径]
+
+指定仓库路径时从该路径导入 `app`, 可用于对比其他版本, 例如:
+
+    git worktree add ../AUTO-MAS-base <提交>
+    python tests/benchmarks/bench_config_load.py ../AUTO-MAS-base
+"""
+
+import gc
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+ROOT = Path(sys.argv[1] if len(sys.argv) > 1 else Path(__file__).parents[2])
+sys.path.insert(0, str(ROOT.resolve()))
+
+from app.models.ConfigBase import MultipleConfig
+from app.models.config import MaaConfig, MaaUserConfig
+
+USERS = 1000
+REPEAT = 5
+
+
+async def main():
+
+    script_config = MultipleConfig([MaaConfig])
+    _, script = await script_config.add(MaaConfig)
+    for _ in range(USERS):
+        await script.UserData.add(MaaUserConfig)
+    data = await script.UserData.toDict()
+    user_data = [data[str(uid)] for uid in script.UserData.order]
+
+    construct_time = load_time = total_time = float("inf")
+    for _ in range(REPEAT):
+        gc.disable()
+        start = time.perf_counter()
+        users = [MaaUserConfig() for _ in range(USERS)]
+        construct_time = min(construct_time, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for user, values in zip(users, user_data):
+            await user.load(values)
+        load_time = min(load_time, time.perf_counter() - start)
+        gc.enable()
+
+        config = MultipleConfig([MaaUserConfig])
+        start = time.perf_counter()
+        await config.load(data)
+        total_time = min(total_time, time.perf_counter() - start)
+
+    print(f"{ROOT.resolve()}")
+    print(f"构造 {USERS} 个用户配置: {construct_time:.3f}s")
+    print(f"load {USERS} 个用户配置: {load_time:.3f}s")
+    print(f"MultipleConfig.load 整体: {total_time:.3f}s (best of {REPEAT})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+"""
+MAA 日志统计解析基准测试
+
+以模拟的长时间刷图日志比较旧版多次遍历解析与 `MaaLogParser` 单次遍历解析的耗时,
+并确认两者的统计结果一致。在仓库根目录下运行:
+
+    python tests/benchmarks/bench_maa_log_parser.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.utils.MaaLogParser import MaaLogParser
+from tests.legacy import legacy_parse_maa_log
+
+
+def farming_log(runs: int) -> list[str]:
+    """生成包含指定次数 Fight 任务的日志, 每次任务作战 30 次"""
+
+    logs = []
+    for _ in range(runs):
+        logs.append("[10:00:00][INF] 开始任务: Fight\n")
+        for k in range(30):
+            logs += [
+                f"[10:00:{k:02d}][INF] 当前次数: {k}\n",
+                "[10:00:00][INF] 理智: 100/180\n",
+                "1-7 掉落统计:\n",
+                f"固源岩 : {k * 3} (+3)\n",
+                f"龙门币 : {k * 12} (+12)\n",
+                "[10:00:00][INF] 开始战斗\n",
+            ]
+            logs += ["[10:00:00][TRC] 识别中 ...\n"] * 4
+        logs.append("[10:30:00][INF] 完成任务: Fight\n")
+        logs += ["公招识别结果:\n", "标签A\n", "4 ★ Tags\n", "已确认招募\n"]
+    return logs
+
+
+def unterminated_log() -> list[str]:
+    """生成大量未正常结束的 Fight 任务, 旧版解析需对每个任务向后查找结束位置"""
+
+    return ["开始任务: Fight\n", "[INF] x\n"] * 20000 + ["[INF] line\n"] * 100000
+
+
+def measure(name: str, logs: list[str]) -> None:
+
+    start = time.perf_counter()
+    expected, _ = legacy_parse_maa_log(logs)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parser = MaaLogParser()
+    parser.feed(logs)
+    parser_time = time.perf_counter() - start
+
+    assert parser.statistics == expected
+    print(
+        f"{name:<12} {len(logs):>8} 行  旧版 {legacy_time:.3f}s  "
+        f"MaaLogParser {parser_time:.3f}s  ({legacy_time / parser_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+
+    measure("刷图 500 次", farming_log(500))
+    measure("刷图 2000 次", farming_log(2000))
+    measure("未结束任务", unterminated_log())
@@ -0,0 +1,71 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+"""
+日志时间戳解析基准测试
+
+比较旧版逐次调用 `datetime.strptime` 的解析与预编译 `TimeParser` 的单行解析耗时。
+在仓库根目录下运行:
+
+    python tests/benchmarks/bench_time_parser.py
+"""
+
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.utils.LogMonitor import compile_time_format, strptime
+from tests.legacy import legacy_strptime
+
+NUMBER = 200000
+DEFAULT_DATE = datetime(2025, 3, 31, 7, 8, 9, 123)
+CASES = [
+    ("%Y-%m-%d %H:%M:%S", "2025-09-26 10:00:00"),
+    ("%H:%M:%S.%f", "10:00:00.123"),
+    ("%Y%m%d%H%M%S", "20250926100000"),
+]
+
+
+def per_call(function, *args) -> float:
+    """单次调用的平均耗时 (微秒)"""
+
+    return timeit.timeit(lambda: function(*args), number=NUMBER) / NUMBER * 1e6
+
+
+if __name__ == "__main__":
+
+    for format, date_string in CASES:
+        parser = compile_time_format(format)
+        assert parser.parse(date_string, DEFAULT_DATE) == legacy_strptime(
+            date_string, format, DEFAULT_DATE
+        )
+
+        legacy_time = per_call(legacy_strptime, date_string, format, DEFAULT_DATE)
+        parser_time = per_call(parser.parse, date_string, DEFAULT_DATE)
+        strptime_time = per_call(strptime, date_string, format, DEFAULT_DATE)
+        print(
+            f"{format:<20} 旧版 {legacy_time:.2f}us  TimeParser {parser_time:.2f}us  "
+            f"strptime() {strptime_time:.2f}us  ({legacy_time / parser_time:.1f}x)"
+        )
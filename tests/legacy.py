@@ -0,0 +1,195 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+"""
+已被替换的旧实现
+
+保留原有逻辑作为等价性测试与基准测试的参照, 不在程序中使用。
+"""
+
+import re
+from datetime import datetime
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from app.utils.constants import TIME_FIELDS
+
+
+def legacy_parse_maa_log(logs: List[str]) -> tuple[Dict[str, Any], bool]:
+    """
+    旧版 `AppConfig.save_maa_log` 中的统计逻辑, 多次遍历日志并逐行调用未编译的正则
+
+    Args:
+        logs (List[str]): 日志行
+
+    Returns:
+        tuple[Dict[str, Any], bool]: 统计数据与是否存在六星公招
+    """
+
+    data = {
+        "recruit_statistics": defaultdict(int),
+        "drop_statistics": defaultdict(dict),
+        "sanity": 0,
+        "sanity_full_at": "",
+    }
+
+    if_six_star = False
+
+    # 提取理智相关信息
+    for log_line in logs:
+        # 提取当前理智值：理智: 5/180
+        sanity_match = re.search(r"理智:\s*(\d+)/\d+", log_line)
+        if sanity_match:
+            data["sanity"] = int(sanity_match.group(1))
+
+        # 提取理智回满时间：理智将在 2025-09-26 18:57 回满。(17h 29m 后)
+        sanity_full_match = re.search(
+            r"(理智将在\s*\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}\s*回满。\(\d+h\s+\d+m\s+后\))",
+            log_line,
+        )
+        if sanity_full_match:
+            data["sanity_full_at"] = sanity_full_match.group(1)
+
+    # 公招统计（仅统计招募到的）
+    confirmed_recruit = False
+    current_star_level = None
+    i = 0
+    while i < len(logs):
+        if "公招识别结果:" in logs[i]:
+            current_star_level = None  # 每次识别公招时清空之前的星级
+            i += 1
+            while i < len(logs) and "Tags" not in logs[i]:  # 读取所有公招标签
+                i += 1
+
+            if i < len(logs) and "Tags" in logs[i]:  # 识别星级
+                star_match = re.search(r"(\d+)\s*★ Tags", logs[i])
+                if star_match:
+                    current_star_level = f"{star_match.group(1)}★"
+                    if current_star_level == "6★":
+                        if_six_star = True
+
+        if "已确认招募" in logs[i]:  # 只有确认招募后才统计
+            confirmed_recruit = True
+
+        if confirmed_recruit and current_star_level:
+            data["recruit_statistics"][current_star_level] += 1
+            confirmed_recruit = False  # 重置, 等待下一次公招
+            current_star_level = None  # 清空已处理的星级
+
+        i += 1
+
+    # 掉落统计
+    # 存储所有关卡的掉落统计
+    all_stage_drops = {}
+
+    # 查找所有Fight任务的开始和结束位置
+    fight_tasks = []
+    for i, line in enumerate(logs):
+        if "开始任务: Fight" in line or "开始任务: 理智作战" in line:
+            # 查找对应的任务结束位置
+            end_index = -1
+            for j in range(i + 1, len(logs)):
+                if "完成任务: Fight" in logs[j] or "完成任务: 理智作战" in logs[j]:
+                    end_index = j
+                    break
+                # 如果遇到新的Fight任务开始, 则当前任务没有正常结束
+                if j < len(logs) and (
+                    "开始任务: Fight" in logs[j] or "开始任务: 理智作战" in logs[j]
+                ):
+                    break
+
+            # 如果找到了结束位置, 记录这个任务的范围
+            if end_index != -1:
+                fight_tasks.append((i, end_index))
+
+    # 处理每个Fight任务
+    for start_idx, end_idx in fight_tasks:
+        # 提取当前任务的日志
+        task_logs = logs[start_idx : end_idx + 1]
+
+        # 查找任务中的最后一次掉落统计
+        last_drop_stats = {}
+        current_stage = None
+
+        for line in task_logs:
+            # 匹配掉落统计行, 如"1-7 掉落统计:"
+            drop_match = re.search(r"([\u4e00-\u9fffA-Za-z0-9\-]+) 掉落统计:", line)
+            if drop_match:
+                # 发现新的掉落统计, 重置当前关卡的掉落数据
+                current_stage = drop_match.group(1)
+                last_drop_stats = {}
+                continue
+
+            # 如果已经找到了关卡, 处理掉落物
+            if current_stage:
+                item_match: List[str] = re.findall(
+                    r"^(?!\[)(\S+?)\s*:\s*([\d,]+[kK]?)(?:\s*\(\+[\d,]+[kK]?\))?",
+                    line,
+                    re.M,
+                )
+                for item, total in item_match:
+                    total = total.replace(",", "")
+                    if total.lower().endswith("k"):
+                        total = int(total[:-1]) * 1000
+                    else:
+                        total = int(total)
+
+                    # 黑名单
+                    if item not in [
+                        "当前次数",
+                        "理智",
+                        "最快截图耗时",
+                        "专精等级",
+                        "剩余时间",
+                    ]:
+                        last_drop_stats[item] = total
+
+        # 如果任务中有掉落统计, 更新总统计
+        if current_stage and last_drop_stats:
+            if current_stage not in all_stage_drops:
+                all_stage_drops[current_stage] = {}
+
+            # 累加掉落数据
+            for item, count in last_drop_stats.items():
+                all_stage_drops[current_stage].setdefault(item, 0)
+                all_stage_drops[current_stage][item] += count
+
+    # 将累加后的掉落数据保存到结果中
+    data["drop_statistics"] = all_stage_drops
+    data["recruit_statistics"] = dict(data["recruit_statistics"])
+    return data, if_six_star
+
+
+def legacy_strptime(date_string: str, format: str, default_date: datetime) -> datetime:
+    """旧版 `LogMonitor.strptime`, 每次调用 `datetime.strptime` 后逐字段重建时间"""
+
+    date = datetime.strptime(date_string, format)
+
+    # 构建参数字典
+    datetime_kwargs = {}
+    for format_code, field_name in TIME_FIELDS.items():
+        if format_code in format:
+            datetime_kwargs[field_name] = getattr(date, field_name)
+        else:
+            datetime_kwargs[field_name] = getattr(default_date, field_name)
+
+    return datetime(**datetime_kwargs)
@@ -0,0 +1,93 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+import pytest
+
+from app.models.history import HistoryLog, write_history_log
+
+LINES = [
+    f"[10:00:00] 第 {i} 行{' 任务出错' if i % 97 == 0 else ''}" for i in range(1000)
+]
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "gzip"])
+def log_path(request, tmp_path):
+
+    path = tmp_path / "history" / "2025-09-26" / "用户" / "10-00-00.log"
+    path.parent.mkdir(parents=True)
+    write_history_log(path, "\n".join(LINES) + "\n", request.param)
+    return path
+
+
+def test_read_windows_across_index_blocks(log_path):
+
+    log = HistoryLog(log_path, log_path.parents[2])
+
+    assert log.total == len(LINES)
+    for start in (0, 1, 255, 256, 257, 511, 512, 990, 999):
+        assert log.read(start, 20) == [
+            (i, LINES[i]) for i in range(start, min(start + 20, len(LINES)))
+        ]
+    assert log.read(len(LINES), 20) == []
+    assert log.read(-5, 2) == [(0, LINES[0]), (1, LINES[1])]
+
+
+def test_tail(log_path):
+
+    log = HistoryLog(log_path, log_path.parents[2])
+
+    assert log.tail(3) == [(i, LINES[i]) for i in range(997, 1000)]
+    assert log.tail(5000) == list(enumerate(LINES))
+
+
+def test_grep_pages_through_matches(log_path):
+
+    log = HistoryLog(log_path, log_path.parents[2])
+    expected = [(i, line) for i, line in enumerate(LINES) if "任务出错" in line]
+
+    matches, start = [], 0
+    while start is not None:
+        page, start = log.grep("任务出错", start, 3)
+        assert len(page) <= 3
+        matches += page
+    assert matches == expected
+    assert log.grep_tail("任务出错", 2) == expected[-2:]
+
+
+def test_index_is_cached_and_rebuilt_after_change(log_path):
+
+    HistoryLog(log_path, log_path.parents[2])
+    index_path = log_path.with_name(f"{log_path.name}.idx")
+    assert index_path.exists()
+
+    write_history_log(log_path, "新日志\n", False)
+    log = HistoryLog(log_path, log_path.parents[2])
+    assert log.total == 1
+    assert log.read(0, 5) == [(0, "新日志")]
+
+
+def test_index_not_written_outside_index_root(log_path, tmp_path):
+
+    log = HistoryLog(log_path, tmp_path / "other")
+
+    assert log.total == len(LINES)
+    assert not log_path.with_name(f"{log_path.name}.idx").exists()
@@ -0,0 +1,103 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+import random
+
+import pytest
+
+from app.utils.LogMatcher import LogMatcher
+
+
+def test_records_first_hit_line():
+
+    matcher = LogMatcher(["任务出错", "任务已完成"])
+    matcher.feed(["开始\n", "任务出错: 1\n"])
+    matcher.feed(["任务出错: 2\n", "任务已完成\n"])
+
+    assert "任务出错" in matcher
+    assert matcher.hit_line("任务出错") == 1
+    assert matcher.hit_line("任务已完成") == 3
+    assert matcher.line_count == 4
+
+
+def test_signature_split_across_feeds():
+
+    matcher = LogMatcher(["任务已完成"])
+    matcher.feed(["前缀 任务"])
+    assert "任务已完成" not in matcher
+    matcher.feed(["已完成\n"])
+
+    assert "任务已完成" in matcher
+    # 未以换行结尾的行与后续内容拼接后匹配, 命中行号为补全该行的序号
+    assert matcher.hit_line("任务已完成") == 1
+
+
+def test_empty_signature_always_hits():
+
+    matcher = LogMatcher([""])
+    assert "" in matcher
+    assert matcher.hit_line("") == 0
+
+
+def test_unknown_signature_raises_key_error():
+
+    with pytest.raises(KeyError):
+        "未注册" in LogMatcher(["任务出错"])
+
+
+def test_reset_clears_hits():
+
+    matcher = LogMatcher(["任务出错"])
+    matcher.feed(["任务出错\n"])
+    matcher.reset()
+
+    assert "任务出错" not in matcher
+    assert matcher.line_count == 0
+
+
+def test_matches_full_text_search():
+
+    rnd = random.Random(22)
+    signatures = ["错误", "完成", "ab"]
+    pieces = ["错", "误", "完", "成", "a", "b", "x"]
+    for _ in range(500):
+        lines = [
+            "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 6))) + "\n"
+            for _ in range(rnd.randint(0, 20))
+        ]
+        # 模拟读取边界: 部分行被截断为两段
+        for _ in range(rnd.randint(0, 3)):
+            if lines:
+                i = rnd.randrange(len(lines))
+                k = rnd.randint(0, len(lines[i]))
+                lines[i : i + 1] = [lines[i][:k], lines[i][k:]]
+
+        matcher = LogMatcher(signatures)
+        i = 0
+        while i < len(lines):
+            size = rnd.randint(1, 4)
+            matcher.feed(lines[i : i + size])
+            i += size
+
+        text = "".join(lines)
+        for signature in signatures:
+            assert (signature in matcher) == (signature in text), (signature, lines)
@@ -0,0 +1,145 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+import random
+
+from app.utils.MaaLogParser import MaaLogParser
+from tests.legacy import legacy_parse_maa_log
+
+LOG_POOL = [
+    "[2025-09-26 10:00:00][INF] 开始任务: Fight\n",
+    "[2025-09-26 10:00:00][INF] 开始任务: 理智作战\n",
+    "[2025-09-26 10:10:00][INF] 完成任务: Fight\n",
+    "[2025-09-26 10:10:00][INF] 完成任务: 理智作战\n",
+    "1-7 掉落统计:\n",
+    "CE-6 掉落统计:\n",
+    "[x] 活动关 掉落统计:\n",
+    "固源岩 : 120 (+6)\n",
+    "龙门币 : 1,234k\n",
+    "理智: 5/180\n",
+    "当前次数: 3\n",
+    "糖 : 12\n",
+    "[12:00] 噪声: 3\n",
+    "芯片 : 2K (+1)\n",
+    "公招识别结果:\n",
+    "高级资深干员\n",
+    "3 ★ Tags\n",
+    "4 ★ Tags\n",
+    "6 ★ Tags\n",
+    "Tags 未知\n",
+    "已确认招募\n",
+    "理智将在 2025-09-26 18:57 回满。(17h 29m 后)\n",
+    "[INF] 普通的日志行, 没有内容\n",
+    "开始任务: Fight 完成任务: Fight\n",
+]
+
+
+def parse(logs, chunk_sizes=None):
+    parser = MaaLogParser()
+    if chunk_sizes is None:
+        parser.feed(logs)
+    else:
+        i = 0
+        for size in chunk_sizes:
+            parser.feed(logs[i : i + size])
+            i += size
+        parser.feed(logs[i:])
+    return parser
+
+
+def test_drop_statistics_use_last_table_of_completed_fights():
+
+    logs = [
+        "[INF] 开始任务: Fight\n",
+        "1-7 掉落统计:\n",
+        "固源岩 : 3 (+3)\n",
+        "1-7 掉落统计:\n",
+        "固源岩 : 6 (+3)\n",
+        "龙门币 : 1,2k (+12)\n",
+        "当前次数: 2\n",
+        "[INF] 完成任务: Fight\n",
+        # 未正常结束的任务不计入统计
+        "[INF] 开始任务: Fight\n",
+        "1-7 掉落统计:\n",
+        "固源岩 : 99\n",
+        "[INF] 开始任务: 理智作战\n",
+        "CE-6 掉落统计:\n",
+        "龙门币 : 10k\n",
+        "[INF] 完成任务: 理智作战\n",
+    ]
+
+    parser = parse(logs)
+
+    assert parser.drop_statistics == {
+        "1-7": {"固源岩": 6, "龙门币": 12000},
+        "CE-6": {"龙门币": 10000},
+    }
+
+
+def test_recruit_statistics_count_confirmed_recruits_only():
+
+    logs = [
+        "公招识别结果:\n",
+        "标签A\n",
+        "4 ★ Tags\n",
+        "已确认招募\n",
+        "公招识别结果:\n",
+        "3 ★ Tags\n",
+        "公招识别结果:\n",
+        "6 ★ Tags\n",
+        "已确认招募\n",
+    ]
+
+    parser = parse(logs)
+
+    assert parser.recruit_statistics == {"4★": 1, "6★": 1}
+    assert parser.if_six_star
+
+
+def test_sanity():
+
+    parser = parse(
+        [
+            "理智: 100/180\n",
+            "理智: 5/180\n",
+            "理智将在 2025-09-26 18:57 回满。(17h 29m 后)\n",
+        ]
+    )
+
+    assert parser.sanity == 5
+    assert parser.sanity_full_at == "理智将在 2025-09-26 18:57 回满。(17h 29m 后)"
+
+
+def test_matches_legacy_parser():
+
+    rnd = random.Random(7)
+    for _ in range(2000):
+        logs = [rnd.choice(LOG_POOL) for _ in range(rnd.randint(0, 80))]
+        # 旧版解析在公招识别结果之后缺少星级行时会越界, 补全一行以便比较
+        logs.append("3 ★ Tags\n")
+
+        expected, if_six_star = legacy_parse_maa_log(logs)
+        chunk_sizes = [rnd.randint(1, 7) for _ in range(len(logs) // 4)]
+
+        for parser in (parse(logs), parse(logs, chunk_sizes)):
+            assert parser.statistics == expected, logs
+            assert parser.if_six_star == if_six_star, logs
@@ -0,0 +1,82 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+from app.models.history import plan_eviction
+
+MB = 1048576
+
+
+def run(date: str, user: str, time: str, size: int) -> tuple[str, str, int]:
+    return (f"{date}/{user}/{time}.json", user, size * MB)
+
+
+RUNS = [
+    run("2025-09-01", "甲", "08-00-00", 2),
+    run("2025-09-01", "乙", "09-00-00", 3),
+    run("2025-09-02", "甲", "08-00-00", 2),
+    run("2025-09-02", "乙", "09-00-00", 3),
+    run("2025-09-03", "甲", "08-00-00", 2),
+    run("2025-09-03", "乙", "09-00-00", 3),
+]
+
+
+def test_no_quota_keeps_everything():
+
+    assert plan_eviction(RUNS, 0, 0) == []
+    assert plan_eviction(RUNS, 15 * MB, 9 * MB) == []
+
+
+def test_user_quota_evicts_oldest_runs_of_that_user():
+
+    assert plan_eviction(RUNS, 0, 6 * MB) == [
+        "2025-09-01/乙/09-00-00.json",
+    ]
+    assert plan_eviction(RUNS, 0, 4 * MB) == [
+        "2025-09-01/甲/08-00-00.json",
+        "2025-09-01/乙/09-00-00.json",
+        "2025-09-02/乙/09-00-00.json",
+    ]
+
+
+def test_total_quota_evicts_globally_oldest_runs():
+
+    assert plan_eviction(RUNS, 10 * MB, 0) == [
+        "2025-09-01/甲/08-00-00.json",
+        "2025-09-01/乙/09-00-00.json",
+    ]
+
+
+def test_total_quota_applies_after_user_quota():
+
+    assert plan_eviction(RUNS, 7 * MB, 6 * MB) == [
+        "2025-09-01/甲/08-00-00.json",
+        "2025-09-01/乙/09-00-00.json",
+        "2025-09-02/甲/08-00-00.json",
+        "2025-09-02/乙/09-00-00.json",
+    ]
+
+
+def test_protected_dates_are_kept_but_counted():
+
+    evicted = plan_eviction(RUNS, 1 * MB, 1 * MB, ["2025-09-03"])
+
+    assert evicted == [key for key, _, _ in RUNS[:4]]
@@ -0,0 +1,85 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+import base64
+
+import pytest
+
+from app.utils import security
+from app.utils.security import (
+    SoftwareBackend,
+    set_crypto_backend,
+    encrypt_secret,
+    decrypt_secret,
+)
+
+
+@pytest.mark.parametrize("note", ["", "password", "中文密码 🔑", "x" * 4096])
+def test_round_trip(note):
+
+    backend = SoftwareBackend()
+
+    assert backend.decrypt(backend.encrypt(note)) == note
+
+
+def test_ciphertext_is_randomised():
+
+    backend = SoftwareBackend()
+
+    assert backend.encrypt("password") != backend.encrypt("password")
+
+
+def test_key_is_required_to_decrypt():
+
+    key = bytes(range(32))
+    encrypted = SoftwareBackend(key).encrypt("password")
+
+    assert SoftwareBackend(key).decrypt(encrypted) == "password"
+    with pytest.raises(ValueError):
+        SoftwareBackend().decrypt(encrypted)
+
+
+def test_tampered_ciphertext_is_rejected():
+
+    backend = SoftwareBackend()
+    raw = bytearray(base64.b64decode(backend.encrypt("password")))
+    raw[-1] ^= 1
+
+    with pytest.raises(ValueError):
+        backend.decrypt(base64.b64encode(raw).decode("utf-8"))
+
+
+def test_invalid_key_length():
+
+    with pytest.raises(ValueError):
+        SoftwareBackend(b"short")
+
+
+def test_module_functions_use_selected_backend(monkeypatch):
+
+    # 测试结束后恢复原有后端
+    monkeypatch.setattr(security, "_crypto_backend", security._crypto_backend)
+    backend = SoftwareBackend()
+    set_crypto_backend(backend)
+
+    assert backend.decrypt(encrypt_secret("password")) == "password"
+    assert decrypt_secret(backend.encrypt("password")) == "password"
@@ -0,0 +1,76 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+from app.utils.tools import StreamDecoder, decode_bytes
+
+
+def decode_chunks(chunks: list[bytes]) -> str:
+    decoder = StreamDecoder()
+    return "".join(decoder.decode(chunk) for chunk in chunks) + decoder.decode(
+        b"", final=True
+    )
+
+
+def test_split_multibyte_character_is_kept_until_complete():
+
+    data = "开始任务: Fight\n理智: 5/180\n".encode("utf-8")
+    # 在每个字节处切分, 被截断的字符保留至下次解码
+    for i in range(1, len(data)):
+        assert decode_chunks([data[:i], data[i:]]) == data.decode("utf-8")
+
+
+def test_encoding_is_sticky_after_detection():
+
+    decoder = StreamDecoder()
+    assert decoder.decode("第一行\n".encode("utf-8")) == "第一行\n"
+    encoding = decoder.encoding
+    assert decoder.decode("第二".encode("utf-8")) == "第二"
+    assert decoder.decode("行\n".encode("utf-8")) == "行\n"
+    assert decoder.encoding == encoding
+
+
+def test_gbk_stream_is_detected():
+
+    text = "开始任务: Fight\n完成任务: Fight\n"
+    data = text.encode("gbk")
+    assert decode_chunks([data[:5], data[5:11], data[11:]]) == text
+
+
+def test_redetects_when_selected_encoding_fails():
+
+    decoder = StreamDecoder()
+    assert decoder.decode(b"ascii only\n") == "ascii only\n"
+    # 之后出现无法以已选编码解码的数据时, 从该段数据重新检测编码
+    assert decoder.decode("中文日志\n".encode("gbk")) == "中文日志\n"
+
+
+def test_undecodable_data_does_not_raise():
+
+    decoder = StreamDecoder()
+    assert isinstance(decoder.decode(b"\xff\xfe\xfa\n", final=True), str)
+
+
+def test_decode_bytes():
+
+    assert decode_bytes(b"") == ""
+    assert decode_bytes("日志".encode("utf-8")) == "日志"
+    assert decode_bytes("日志".encode("gbk")) == "日志"
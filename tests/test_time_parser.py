@@ -0,0 +1,107 @@
+#   AUTO-MAS: A Multi-Script, Multi-Config Management and Automation Software
+#   Copyright © 2025-2026 AUTO-MAS Team
+
+#   This file is part of AUTO-MAS.
+
+#   AUTO-MAS is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as
+#   published by the Free Software Foundation, either version 3 of
+#   the License, or (at your option) any later version.
+
+#   AUTO-MAS is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty
+#   of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See
+#   the GNU Affero General Public License for more details.
+
+#   You should have received a copy of the GNU Affero General Public License
+#   along with AUTO-MAS. If not, see <https://www.gnu.org/licenses/>.
+
+
+#   Contact: DLmaster_361@163.com
+
+
+import random
+from datetime import datetime
+
+import pytest
+
+from app.utils.LogMonitor import compile_time_format, strptime
+from tests.legacy import legacy_strptime
+
+DEFAULT_DATE = datetime(2025, 3, 31, 7, 8, 9, 123)
+
+FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%H:%M:%S",
+    "%Y/%m/%d  %H:%M",
+    "%m-%d %H:%M:%S,%f",
+    "[%Y-%m-%d %H:%M:%S]",
+    "%Y%m%d%H%M%S",
+    "%d %b %Y %H:%M",
+    "%y-%m-%d %H:%M:%S",
+    "%%%H.%M",
+]
+
+
+def result(function, date_string, format):
+    try:
+        return function(date_string, format, DEFAULT_DATE)
+    except ValueError:
+        return ValueError
+
+
+def test_common_formats_are_compiled():
+
+    assert compile_time_format("%Y-%m-%d %H:%M:%S").pattern is not None
+    assert compile_time_format("%H:%M:%S.%f").pattern is not None
+    # 含未编译字段的格式回退至 datetime.strptime
+    assert compile_time_format("%d %b %Y %H:%M").pattern is None
+
+
+def test_missing_fields_use_default_date():
+
+    assert strptime("10:11:12", "%H:%M:%S", DEFAULT_DATE) == datetime(
+        2025, 3, 31, 10, 11, 12, 123
+    )
+    assert strptime("10:11:12.5", "%H:%M:%S.%f", DEFAULT_DATE) == datetime(
+        2025, 3, 31, 10, 11, 12, 500000
+    )
+
+
+def test_invalid_date_raises_value_error():
+
+    with pytest.raises(ValueError):
+        strptime("2025-02-30 10:00:00", "%Y-%m-%d %H:%M:%S", DEFAULT_DATE)
+    with pytest.raises(ValueError):
+        strptime("2025-01-01 10:00", "%Y-%m-%d %H:%M:%S", DEFAULT_DATE)
+
+
+# 不含年份的格式在 Python 3.13 起由 datetime.strptime 给出弃用警告
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.parametrize("format", FORMATS)
+def test_matches_legacy_strptime(format):
+
+    rnd = random.Random(format)
+    chars = "0123456789 -:/.,[]%_bMa"
+    for _ in range(3000):
+        date = datetime(
+            rnd.randint(1990, 2030),
+            rnd.randint(1, 12),
+            rnd.randint(1, 28),
+            rnd.randint(0, 23),
+            rnd.randint(0, 59),
+            rnd.randint(0, 59),
+            rnd.randint(0, 999999),
+        )
+        date_string = list(date.strftime(format))
+        # 随机破坏一半的样本, 解析失败时两者均应抛出 ValueError
+        if rnd.random() < 0.5:
+            for _ in range(rnd.randint(1, 3)):
+                i = rnd.randrange(len(date_string))
+                date_string[i] = rnd.choice(chars)
+        date_string = "".join(date_string)
+
+        assert result(strptime, date_string, format) == result(
+            legacy_strptime, date_string, format
+        ), date_string